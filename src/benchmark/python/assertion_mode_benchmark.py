@@ -0,0 +1,68 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Microbenchmark measuring the cost of an assertion while assertions are enabled, sampled and disabled, compared to
+calling an empty function.
+
+  $ PYTHONPATH=src/main/python python src/benchmark/python/assertion_mode_benchmark.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from pyassert import assert_that, disable_assertions, enable_assertions, sample_assertions
+
+NUMBER = 200000
+REPEAT = 5
+
+
+def empty_function(actual):
+    return actual
+
+
+def no_assertion():
+    empty_function("spam and eggs")
+
+
+def assertion():
+    assert_that("spam and eggs").contains("and").and_ends_with("eggs")
+
+
+def best_time(function):
+    function()
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main():
+    baseline = best_time(no_assertion)
+
+    enable_assertions()
+    enabled = best_time(assertion)
+    sample_assertions(1000)
+    sampled = best_time(assertion)
+    disable_assertions()
+    disabled = best_time(assertion)
+    enable_assertions()
+
+    print("empty function:           %8.3f us" % (baseline * 1e6))
+    print("enabled:                  %8.3f us" % (enabled * 1e6))
+    print("sampled 1 in 1000:        %8.3f us" % (sampled * 1e6))
+    print("disabled:                 %8.3f us" % (disabled * 1e6))
+
+
+if __name__ == "__main__":
+    main()
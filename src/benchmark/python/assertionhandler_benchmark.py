@@ -0,0 +1,97 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Microbenchmark measuring the per chain link overhead of AssertionHandler compared to the original implementation
+that parsed the matcher name in __getattr__ and probed every registered matcher for each link.
+
+  $ PYTHONPATH=src/main/python python src/benchmark/python/assertionhandler_benchmark.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from pyassert import InvalidUsageException, MatcherRegistry, assert_that
+
+NUMBER = 100000
+REPEAT = 5
+
+
+class LegacyAssertionHandler(object):
+    """The AssertionHandler as it was before matcher attributes and dispatch caching."""
+
+    def __init__(self, actual):
+        self._actual = actual
+        self._matcher_name = None
+        self._matcher_classes = None
+        self._matches = 0
+
+    def __getattr__(self, attribute):
+        self._matcher_name = self._filter_matcher_name(attribute)
+        self._matcher_classes = MatcherRegistry.instance().resolve_matchers(self._matcher_name)
+        return self
+
+    def __call__(self, *arguments, **keywordArguments):
+        for matcher_factory in self._matcher_classes:
+            matcher = matcher_factory(*arguments, **keywordArguments)
+
+            if matcher.accepts(self._actual):
+                if not matcher.matches(self._actual):
+                    raise AssertionError("Assertion failed: %s" % matcher.describe(self._actual))
+                else:
+                    self._matches += 1
+                    return self
+        raise AssertionError("No matcher named '%s' is able to match actual value '%s' of type '%s'" %
+                             (self._matcher_name, self._actual, self._actual.__class__))
+
+    def _filter_matcher_name(self, name):
+        if name.startswith("and_"):
+            if not self._matches:
+                raise InvalidUsageException(name)
+            return name[4:]
+        return name
+
+
+def one_link(handler_factory):
+    handler_factory("spam and eggs").contains("and")
+
+
+def five_links(handler_factory):
+    handler_factory("spam and eggs").contains("and").and_ends_with("eggs").and_starts_with("spam") \
+        .and_contains("eggs").and_is_not_empty()
+
+
+def best_time(function, handler_factory):
+    return min(timeit.repeat(lambda: function(handler_factory), number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def measure_per_link_overhead(handler_factory):
+    one_link(handler_factory)
+    five_links(handler_factory)
+    return (best_time(five_links, handler_factory) - best_time(one_link, handler_factory)) / 4
+
+
+def main():
+    legacy = measure_per_link_overhead(LegacyAssertionHandler)
+    current = measure_per_link_overhead(assert_that)
+
+    print("per link overhead before: %8.3f us" % (legacy * 1e6))
+    print("per link overhead after:  %8.3f us" % (current * 1e6))
+    print("speedup:                  %8.2fx" % (legacy / current))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Benchmark suite measuring the throughput of matcher dispatch and the built in matchers. For every case the number of
+operations per second and the memory allocated per operation are reported. The memory is the peak of the memory
+traced by tracemalloc while running a single operation, as CPython does not count allocations.
+
+  $ PYTHONPATH=src/main/python python src/benchmark/python/pyassert_benchmark.py --save baseline.json
+  $ PYTHONPATH=src/main/python python src/benchmark/python/pyassert_benchmark.py --compare baseline.json
+
+When comparing, the suite exits with status 1 if the operations per second of any case dropped by more than the
+threshold given by --threshold (default 10%) compared to the baseline. Use --case to run selected cases only.
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from pyassert import all, any_of, assert_that, check_that
+
+REPEAT = 5
+ALLOCATION_RUNS = 10
+
+
+class FilesystemTree(object):
+    """Temporary directory containing a file and a sub directory used by the filesystem cases."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="pyassert_benchmark")
+        self.sub_directory = os.path.join(self.directory, "spam")
+        self.file_name = os.path.join(self.directory, "eggs.txt")
+        os.mkdir(self.sub_directory)
+        with open(self.file_name, "w") as eggs_file:
+            eggs_file.write("spam and eggs\n" * 64)
+
+    def remove(self):
+        shutil.rmtree(self.directory)
+
+
+def failing_assertion():
+    try:
+        assert_that("spam and eggs").contains("ham")
+    except AssertionError:
+        pass
+
+
+def stream_contains(file_name):
+    with io.open(file_name, "r") as stream:
+        assert_that(stream).contains("eggs\nspam")
+
+
+def create_cases(tree):
+    spam_list = ["spam", "and", "eggs"] * 10
+    large_list = list(range(100000))
+    expected_ids = all(*range(0, 100000, 100))
+    shuffled_list = large_list[1::2] + large_list[::2]
+    log_text = "INFO request handled in 12ms\n" * 20000
+    log_view = memoryview(log_text.encode("ascii"))
+    forbidden_tokens = any_of(*("token%03d" % number for number in range(300)))
+    file_content = "spam and eggs\n" * 64
+
+    return [
+        ("round_trip", lambda: assert_that("spam").is_not_none()),
+        ("round_trip_chain", lambda: assert_that("spam").is_not_none().and_is_equal_to("spam")),
+        ("contains_string", lambda: assert_that("spam and eggs").contains("eggs")),
+        ("contains_list", lambda: assert_that(spam_list).contains("eggs")),
+        ("contains_all_large_list", lambda: assert_that(large_list).contains(expected_ids)),
+        ("contains_exactly_large",
+         lambda: assert_that(large_list).contains_exactly_in_any_order(shuffled_list)),
+        ("does_not_contain_tokens", lambda: assert_that(log_text).does_not_contain(forbidden_tokens)),
+        ("matches_regex", lambda: assert_that("spam and eggs").matches(r"s\w+ and e\w+")),
+        ("contains_match_view", lambda: assert_that(log_view).contains_match(br"handled in \d+ms")),
+        ("binary_ends_with_view", lambda: assert_that(log_view).ends_with(b"12ms\n").and_does_not_start_with(b"ERROR")),
+        ("number_comparisons", lambda: assert_that(7).is_greater_than(2).and_is_less_than(8).and_le(7).and_ge(7)),
+        ("is_a_file", lambda: assert_that(tree.file_name).is_a_file()),
+        ("is_a_directory", lambda: assert_that(tree.sub_directory).is_a_directory()),
+        ("has_file_length_of", lambda: assert_that(tree.file_name).has_file_length_of(len(file_content))),
+        ("is_a_file_with_content", lambda: assert_that(tree.file_name).is_a_file_with_content(file_content)),
+        ("stream_contains", lambda: stream_contains(tree.file_name)),
+        ("failure_raised", failing_assertion),
+        ("failure_checked", lambda: check_that("spam and eggs").contains("ham")),
+        ("failure_described", lambda: check_that("spam and eggs").contains("ham").message),
+    ]
+
+
+def measure_operations_per_second(operation):
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange() if hasattr(timer, "autorange") else (10000, None)
+    return number / min(timer.repeat(number=number, repeat=REPEAT))
+
+
+def measure_bytes_per_operation(operation):
+    if tracemalloc is None:
+        return None
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_RUNS):
+            tracemalloc.clear_traces()
+            current, _ = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+    finally:
+        tracemalloc.stop()
+    return min(peaks)
+
+
+def run(selected_cases):
+    tree = FilesystemTree()
+    try:
+        results = {}
+        for name, operation in create_cases(tree):
+            if selected_cases and name not in selected_cases:
+                continue
+            operation()
+            results[name] = {
+                "ops_per_second": measure_operations_per_second(operation),
+                "bytes_per_op": measure_bytes_per_operation(operation),
+            }
+            print_result(name, results[name])
+        return results
+    finally:
+        tree.remove()
+
+
+def print_result(name, result):
+    bytes_per_op = "n/a" if result["bytes_per_op"] is None else "%d" % result["bytes_per_op"]
+    print("%-24s %14.0f ops/s %10s bytes/op" % (name, result["ops_per_second"], bytes_per_op))
+
+
+def compare(results, baseline, threshold):
+    """Prints the change of every case compared to the baseline and returns the names of the regressed cases."""
+    regressions = []
+    print()
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        change = results[name]["ops_per_second"] / baseline[name]["ops_per_second"] - 1
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(name)
+        print("%-24s %+8.1f%%%s" % (name, change * 100, "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Measures the throughput of pyassert.")
+    parser.add_argument("--save", metavar="FILE", help="save the results as JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fraction by which ops/s may drop before a case counts as regression (default: 0.1)")
+    parser.add_argument("--case", action="append", dest="cases", help="run the given case only; may be repeated")
+    options = parser.parse_args(arguments)
+
+    results = run(options.cases)
+
+    if options.save:
+        with open(options.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
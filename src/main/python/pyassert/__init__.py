@@ -19,18 +19,125 @@ built in and custom matchers:
 
   assert_that('spam').contains('pa').and_ends_with('am')
 
+The matcher modules are imported lazily when one of their matchers or exported names is used for the first time, so
+importing pyassert itself is cheap. "from pyassert import *" exports the assertion helpers but not the matcher classes,
+which are imported by name, e.g. "from pyassert import BaseMatcher".
 """
 
+import importlib
+import sys
+
+from . import assertionhandler, matcher_registry
 from .assertionhandler import *
 from .matcher_registry import *
 
-from .string_matchers import *
-from .object_matchers import *
-from .list_matchers import *
-from .number_matchers import *
-from .exception_matchers import *
-from .filesystem_matchers import *
-
 __author__ = "Alexander Metzner, Michael Gruber"
 
+_LAZY_EXPORTS = {
+    "BaseMatcher": "object_matchers",
+    "EqualsMatcher": "object_matchers",
+    "IsMatcher": "object_matchers",
+    "IsTypeMatcher": "object_matchers",
+    "DeeplyEqualsMatcher": "object_matchers",
+    "IsTrueMatcher": "object_matchers",
+    "IsFalseMatcher": "object_matchers",
+    "NoneMatcher": "object_matchers",
+    "InstanceOfMatcher": "object_matchers",
+    "StringMatcher": "string_matchers",
+    "StringMatcherWithArgument": "string_matchers",
+    "BinaryMatcher": "binary_matchers",
+    "BinaryContainsMatcher": "binary_matchers",
+    "BinaryStartsWithMatcher": "binary_matchers",
+    "BinaryEndsWithMatcher": "binary_matchers",
+    "BinaryIsEmptyMatcher": "binary_matchers",
+    "hex_dump": "binary_matchers",
+    "ListOrTupleMatcher": "list_matchers",
+    "AnyOfContainsMatcher": "list_matchers",
+    "AllContainsMatcher": "list_matchers",
+    "ContainsMatcher": "list_matchers",
+    "ContainsExactlyInAnyOrderMatcher": "list_matchers",
+    "IsEmptyMatcher": "list_matchers",
+    "any_of": "list_matchers",
+    "all": "list_matchers",
+    "StreamMatcher": "stream_matchers",
+    "StreamContainsMatcher": "stream_matchers",
+    "StreamMatchesMatcher": "stream_matchers",
+    "StreamStartsWithMatcher": "stream_matchers",
+    "StreamEndsWithMatcher": "stream_matchers",
+    "LineCountMatcher": "stream_matchers",
+    "IteratorMatcher": "iterator_matchers",
+    "IteratorContainsMatcher": "iterator_matchers",
+    "IteratorIsEmptyMatcher": "iterator_matchers",
+    "ElementCountMatcher": "iterator_matchers",
+    "MinimumElementCountMatcher": "iterator_matchers",
+    "MaximumElementCountMatcher": "iterator_matchers",
+    "ArrayMatcher": "array_matchers",
+    "ArrayLessThanMatcher": "array_matchers",
+    "ArrayLessThanEqualMatcher": "array_matchers",
+    "ArrayGreaterThanMatcher": "array_matchers",
+    "ArrayGreaterThanEqualMatcher": "array_matchers",
+    "ArrayEqualsMatcher": "array_matchers",
+    "ArrayIsCloseToMatcher": "array_matchers",
+    "BaseNumberMatcher": "number_matchers",
+    "LessThanMatcher": "number_matchers",
+    "LessThanEqualMatcher": "number_matchers",
+    "GreaterThanMatcher": "number_matchers",
+    "GreaterThanEqualMatcher": "number_matchers",
+    "IsCloseToMatcher": "number_matchers",
+    "RaisesMatcher": "exception_matchers",
+    "DirectoryExistsMatcher": "filesystem_matchers",
+    "FileExistsMatcher": "filesystem_matchers",
+    "FileLengthMatcher": "filesystem_matchers",
+    "EmptyFileMatcher": "filesystem_matchers",
+    "FileContentMatcher": "filesystem_matchers",
+    "EachAssertionError": "each",
+    "assert_each": "each",
+    "Expectation": "expectation",
+    "expect": "expectation",
+    "SoftAssertionError": "soft",
+    "soft_assertions": "soft",
+    "format_value": "formatting",
+    "get_format_limits": "formatting",
+    "set_format_limits": "formatting",
+    "clear_pattern_cache": "string_matchers",
+    "compile_pattern": "string_matchers",
+    "get_pattern_cache_stats": "string_matchers",
+    "add_evaluation_hook": "hooks",
+    "remove_evaluation_hook": "hooks",
+    "disable_metrics": "metrics",
+    "enable_metrics": "metrics",
+    "get_metrics": "metrics",
+    "get_metrics_json": "metrics",
+    "reset_metrics": "metrics",
+}
+
+# Lazily exported names also exported by "from pyassert import *": the helpers used within assertions. Matcher classes
+# and configuration functions are left out, so a star import loads only the modules of these helpers.
+_STAR_EXPORTS = [
+    "EachAssertionError",
+    "SoftAssertionError",
+    "all",
+    "any_of",
+    "assert_each",
+    "expect",
+    "soft_assertions"
+]
+
+__all__ = assertionhandler.__all__ + matcher_registry.__all__ + _STAR_EXPORTS
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported, so all exported names are imported eagerly.
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
+
 __version__ = "${version}"
@@ -0,0 +1,181 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides matcher implementations comparing NumPy arrays element wise in a single vectorized operation:
+
+  assert_that(temperatures).is_less_than(100.0)
+  assert_that(result).is_close_to(expected, rel_tol=1e-6)
+
+The expected value is a number or an array that can be broadcast to the shape of the actual array. NumPy is an
+optional dependency: it is never imported by pyassert and the matchers only accept arrays once NumPy has been
+imported by the code under test.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "ArrayMatcher",
+    "ArrayLessThanMatcher",
+    "ArrayLessThanEqualMatcher",
+    "ArrayGreaterThanMatcher",
+    "ArrayGreaterThanEqualMatcher",
+    "ArrayEqualsMatcher",
+    "ArrayIsCloseToMatcher"
+]
+
+import sys
+
+from .formatting import format_value
+from .matcher_registry import Matcher, OptionalTypes, register_matcher
+
+# Number of indices of violating elements shown in failure messages.
+MAX_REPORTED_INDICES = 10
+
+
+class ArrayMatcher(Matcher):
+    """
+    Base class for matchers comparing every element of the actual array with the expected value. Subclasses name the
+    numpy comparison function elements have to satisfy in comparison, e.g. "less", or override violations.
+    """
+
+    accepted_types = OptionalTypes("numpy", ("ndarray",))
+    expectation = None
+    comparison = None
+
+    def __init__(self, expected):
+        self._expected = expected
+
+    def matches(self, actual):
+        try:
+            return not _numpy().any(self.violations(actual))
+        except ValueError:
+            return False
+
+    def violations(self, actual):
+        """Returns a boolean array marking the elements of the actual array not matching."""
+        return ~getattr(_numpy(), self.comparison)(actual, self._expected)
+
+    def describe(self, actual):
+        numpy = _numpy()
+        description = "Actual array of shape %s is not %s %s" % (actual.shape, self.expectation,
+                                                                 _describe_array_or_value(self._expected))
+        try:
+            violations = numpy.broadcast_to(self.violations(actual), actual.shape)
+        except ValueError:
+            return "%s: shape %s cannot be broadcast to the actual shape" % (description,
+                                                                             numpy.shape(self._expected))
+
+        indices = numpy.flatnonzero(violations)
+        first_indices = [_index(numpy.unravel_index(index, actual.shape)) for index in indices[:MAX_REPORTED_INDICES]]
+
+        deviations = numpy.where(violations, self._deviations(actual), -numpy.inf)
+        worst = numpy.unravel_index(numpy.argmax(deviations), actual.shape)
+        expected = numpy.broadcast_to(self._expected, actual.shape)
+
+        return "%s: %d of %d elements violate, first at %s, worst at %s: %s (expected %s)" % (
+            description, len(indices), actual.size, format_value(first_indices), format_value(_index(worst)),
+            format_value(actual[worst]), format_value(expected[worst]))
+
+    def _deviations(self, actual):
+        """Returns the amount by which each element deviates from the expectation, used to find the worst offender."""
+        return _numpy().abs(_numpy().subtract(actual, self._expected, dtype=float))
+
+
+@register_matcher("is_less_than")
+@register_matcher("lt")
+class ArrayLessThanMatcher(ArrayMatcher):
+    expectation = "less than"
+    comparison = "less"
+
+
+@register_matcher("is_less_or_equal_than")
+@register_matcher("le")
+class ArrayLessThanEqualMatcher(ArrayMatcher):
+    expectation = "less than or equal to"
+    comparison = "less_equal"
+
+
+@register_matcher("is_greater_than")
+@register_matcher("gt")
+class ArrayGreaterThanMatcher(ArrayMatcher):
+    expectation = "greater than"
+    comparison = "greater"
+
+
+@register_matcher("is_greater_or_equal_than")
+@register_matcher("ge")
+class ArrayGreaterThanEqualMatcher(ArrayMatcher):
+    expectation = "greater than or equal to"
+    comparison = "greater_equal"
+
+
+@register_matcher("equals")
+@register_matcher("is_equal_to")
+@register_matcher("is_not_equal_to", negated=True)
+class ArrayEqualsMatcher(ArrayMatcher):
+    expectation = "equal to"
+    comparison = "equal"
+
+    def describe_negated(self, actual):
+        return "Actual array of shape %s is equal to %s" % (actual.shape, _describe_array_or_value(self._expected))
+
+    def _deviations(self, actual):
+        try:
+            return ArrayMatcher._deviations(self, actual)
+        except TypeError:
+            return _numpy().zeros(actual.shape)
+
+
+@register_matcher("is_close_to")
+@register_matcher("is_not_close_to", negated=True)
+class ArrayIsCloseToMatcher(ArrayMatcher):
+    """
+    Matcher that tests whether every element of the actual array is close to the expected value, using the same
+    tolerances as math.isclose: abs(actual - expected) <= max(rel_tol * max(abs(actual), abs(expected)), abs_tol)
+    """
+
+    def __init__(self, expected, rel_tol=1e-9, abs_tol=0.0):
+        ArrayMatcher.__init__(self, expected)
+        self._rel_tol = rel_tol
+        self._abs_tol = abs_tol
+
+    @property
+    def expectation(self):
+        return "close to (rel_tol=%s, abs_tol=%s)" % (self._rel_tol, self._abs_tol)
+
+    def violations(self, actual):
+        numpy = _numpy()
+        magnitude = numpy.maximum(numpy.abs(actual), numpy.abs(self._expected))
+        tolerance = numpy.maximum(self._rel_tol * magnitude, self._abs_tol)
+        return ~(self._deviations(actual) <= tolerance)
+
+    def describe_negated(self, actual):
+        return "Actual array of shape %s is %s %s" % (actual.shape, self.expectation,
+                                                      _describe_array_or_value(self._expected))
+
+
+def _numpy():
+    return sys.modules["numpy"]
+
+
+def _index(index):
+    return int(index[0]) if len(index) == 1 else tuple(int(position) for position in index)
+
+
+def _describe_array_or_value(value):
+    if isinstance(value, _numpy().ndarray):
+        return "expected array of shape %s" % (value.shape,)
+    return "'%s'" % format_value(value)
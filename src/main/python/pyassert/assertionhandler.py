@@ -17,11 +17,31 @@ __author__ = "Alexander Metzner"
 
 __all__ = [
     "AssertionHandler",
+    "AssertionFailure",
+    "CheckHandler",
+    "NoOpAssertionHandler",
+    "UnacceptedActualFailure",
     "assert_that",
+    "check_that",
+    "disable_assertions",
+    "enable_assertions",
+    "sample_assertions",
     "InvalidUsageException"
 ]
 
-from .matcher_registry import MatcherRegistry
+import threading
+import time
+
+from .matcher_registry import MatcherRegistry, context_variable, _ACTIVE_REGISTRY
+
+_SOFT_ASSERTIONS = context_variable("pyassert_soft_assertions")
+_OBSERVERS = ()
+_OBSERVERS_LOCK = threading.Lock()
+_timer = getattr(time, "perf_counter", time.time)
+
+PASSED = "passed"
+FAILED = "failed"
+REJECTED = "rejected"
 
 
 class InvalidUsageException(Exception):
@@ -32,38 +52,284 @@ class InvalidUsageException(Exception):
         return self._message
 
 
+class AssertionFailure(object):
+    """
+    A matcher that did not match an actual value. The message is built from the matcher's description on first
+    access only.
+    """
+    __slots__ = ("matcher", "actual")
+
+    def __init__(self, matcher, actual):
+        self.matcher = matcher
+        self.actual = actual
+
+    @property
+    def message(self):
+        return "Assertion failed: %s" % self.matcher.describe(self.actual)
+
+
+class ObservedAssertionFailure(AssertionFailure):
+    """AssertionFailure of an observed chain link, reporting the time spent describing the failure to the observers."""
+    __slots__ = ("matcher_name", "observers")
+
+    def __init__(self, matcher, actual, matcher_name, observers):
+        AssertionFailure.__init__(self, matcher, actual)
+        self.matcher_name = matcher_name
+        self.observers = observers
+
+    @property
+    def message(self):
+        start = _timer()
+        description = self.matcher.describe(self.actual)
+        elapsed = _timer() - start
+        for observer in self.observers:
+            observer.described(self.matcher_name, self.matcher, self.actual, elapsed)
+        return "Assertion failed: %s" % description
+
+
+class UnacceptedActualFailure(object):
+    """An actual value that is not accepted by any of the matchers registered for a name."""
+    __slots__ = ("matcher_name", "actual")
+
+    def __init__(self, matcher_name, actual):
+        self.matcher_name = matcher_name
+        self.actual = actual
+
+    @property
+    def message(self):
+        from .formatting import format_value
+        return "No matcher named '%s' is able to match actual value '%s' of type '%s'" % (
+            self.matcher_name, format_value(self.actual), self.actual.__class__)
+
+
+class MatcherAttribute(object):
+    """
+    Descriptor installed on AssertionHandler for every matcher name that has been used. Accessing the attribute
+    selects the matcher name on the handler and returns the handler, so the name is parsed only once and later
+    chain links neither go through __getattr__ nor allocate.
+    """
+    __slots__ = ("attribute", "matcher_name", "chained")
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.chained = attribute.startswith("and_")
+        self.matcher_name = attribute[4:] if self.chained else attribute
+
+    def __get__(self, handler, owner):
+        if handler is None:
+            return self
+        if self.chained and not handler._links:
+            raise InvalidUsageException(self.attribute)
+        handler._matcher_name = self.matcher_name
+        return handler
+
+
 class AssertionHandler(object):
+    __slots__ = ("_actual", "_matcher_name", "_links")
+
     def __init__(self, actual):
         self._actual = actual
         self._matcher_name = None
-        self._matcher_classes = None
-        self._matches = 0
+        self._links = 0
 
     def __getattr__(self, attribute):
-        self._matcher_name = self._filter_matcher_name(attribute)
-        self._matcher_classes = MatcherRegistry.instance().resolve_matchers(self._matcher_name)
+        matcher_attribute = MatcherAttribute(attribute)
+        matcher_attribute.__get__(self, AssertionHandler)
+        registry = _ACTIVE_REGISTRY.get() or MatcherRegistry.instance()
+        registry.resolve_matchers(matcher_attribute.matcher_name)
+        setattr(AssertionHandler, attribute, matcher_attribute)
         return self
 
-    def __call__(self, *arguments, **keywordArguments):
-        for matcher_factory in self._matcher_classes:
-            matcher = matcher_factory(*arguments, **keywordArguments)
+    def __call__(self, *arguments, **keyword_arguments):
+        if _OBSERVERS:
+            return self._observed_call(_OBSERVERS, arguments, keyword_arguments)
+        actual = self._actual
+        registry = _ACTIVE_REGISTRY.get() or MatcherRegistry.instance()
+        dispatch = registry.resolve_dispatch(self._matcher_name, type(actual))
+        for matcher_factory, needs_probe in dispatch:
+            matcher = matcher_factory(*arguments, **keyword_arguments)
 
-            if matcher.accepts(self._actual):
-                if not matcher.matches(self._actual):
-                    raise AssertionError("Assertion failed: %s" % matcher.describe(self._actual))
+            if not needs_probe or matcher.accepts(actual):
+                if not matcher.matches(actual):
+                    return self._fail(AssertionFailure(matcher, actual))
                 else:
-                    self._matches += 1
+                    self._links += 1
                     return self
-        raise AssertionError("No matcher named '%s' is able to match actual value '%s' of type '%s'" %
-                             (self._matcher_name, self._actual, self._actual.__class__))
+        return self._fail(UnacceptedActualFailure(self._matcher_name, actual))
+
+    def _observed_call(self, observers, arguments, keyword_arguments):
+        actual = self._actual
+        matcher_name = self._matcher_name
+        registry = _ACTIVE_REGISTRY.get() or MatcherRegistry.instance()
+        dispatch = registry.resolve_dispatch(matcher_name, type(actual))
+        for matcher_factory, needs_probe in dispatch:
+            matcher = matcher_factory(*arguments, **keyword_arguments)
+            for observer in observers:
+                observer.before(matcher_name, matcher_factory, matcher, actual)
+
+            start = _timer()
+            if needs_probe and not matcher.accepts(actual):
+                outcome = REJECTED
+            else:
+                outcome = PASSED if matcher.matches(actual) else FAILED
+            elapsed = _timer() - start
+            for observer in observers:
+                observer.after(matcher_name, matcher_factory, matcher, actual, outcome, elapsed)
+
+            if outcome is FAILED:
+                return self._fail(ObservedAssertionFailure(matcher, actual, matcher_name, observers))
+            if outcome is PASSED:
+                self._links += 1
+                return self
+        return self._fail(UnacceptedActualFailure(matcher_name, actual))
+
+    def _fail(self, failure):
+        collector = _SOFT_ASSERTIONS.get()
+        if collector is None:
+            raise AssertionError(failure.message)
+        collector.record(failure)
+        self._links += 1
+        return self
+
+
+class CheckHandler(AssertionHandler):
+    """
+    AssertionHandler that records the first failure instead of raising an AssertionError. The handler is truthy
+    as long as all matchers matched. Once a matcher failed, the remaining links of the chain are skipped. The
+    failure message is only built when message is accessed.
+    """
+    __slots__ = ("failure",)
+
+    def __init__(self, actual):
+        AssertionHandler.__init__(self, actual)
+        self.failure = None
+
+    def __call__(self, *arguments, **keyword_arguments):
+        if self.failure is not None:
+            return self
+        return AssertionHandler.__call__(self, *arguments, **keyword_arguments)
 
-    def _filter_matcher_name(self, name):
-        if name.startswith("and_"):
-            if not self._matches:
-                raise InvalidUsageException(name)
-            return name[4:]
-        return name
+    def __bool__(self):
+        return self.failure is None
+
+    __nonzero__ = __bool__
+
+    @property
+    def message(self):
+        """The message describing the failure or None, if all matchers matched."""
+        if self.failure is None:
+            return None
+        return self.failure.message
+
+    def _fail(self, failure):
+        self.failure = failure
+        self._links += 1
+        return self
+
+
+def add_observer(observer):
+    """
+    Adds an observer that is notified about every matcher evaluated by an AssertionHandler. Observers implement
+
+      before(matcher_name, matcher_factory, matcher, actual) - the matcher is about to be evaluated
+      after(matcher_name, matcher_factory, matcher, actual, outcome, elapsed) - the matcher has been evaluated within
+          elapsed seconds (including accepts if the matcher had to be probed); outcome is PASSED, FAILED or REJECTED
+      described(matcher_name, matcher, actual, elapsed) - the matcher described its failure within elapsed seconds
+
+    As long as no observer is added, AssertionHandler does not take any timings.
+    """
+    global _OBSERVERS
+    with _OBSERVERS_LOCK:
+        if observer not in _OBSERVERS:
+            _OBSERVERS = _OBSERVERS + (observer,)
+
+
+def remove_observer(observer):
+    """Removes an observer added with add_observer. Does nothing if the observer has not been added."""
+    global _OBSERVERS
+    with _OBSERVERS_LOCK:
+        _OBSERVERS = tuple(added for added in _OBSERVERS if added is not observer)
+
+
+class NoOpAssertionHandler(object):
+    """
+    Handler returned by assert_that while assertions are disabled or not sampled. Every matcher attribute and call
+    returns the handler itself, so chains neither resolve matchers nor create them. There is a single shared
+    instance; it is stored as class attribute for every matcher name used, so later lookups of the name do not go
+    through __getattr__.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        setattr(NoOpAssertionHandler, attribute, self)
+        return self
+
+    def __call__(self, *arguments, **keyword_arguments):
+        return self
+
+
+class _AssertionSampler(threading.local):
+    """Per thread counter selecting every n-th assertion for evaluation, starting with the first one."""
+
+    def __init__(self, every):
+        self.every = every
+        self.countdown = 1
+
+    def sample(self):
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = self.every
+        return True
+
+
+_NO_OP_HANDLER = NoOpAssertionHandler()
+_DISABLED = object()
+_SAMPLER = None
+
+
+def enable_assertions():
+    """Evaluates every assertion started with assert_that. This is the default."""
+    global _SAMPLER
+    _SAMPLER = None
+
+
+def disable_assertions():
+    """Turns assert_that into a no-op for the whole process until assertions are enabled again."""
+    global _SAMPLER
+    _SAMPLER = _DISABLED
+
+
+def sample_assertions(every):
+    """
+    Evaluates only every n-th assertion started with assert_that in each thread, beginning with the first one. All
+    other calls return a no-op handler.
+    """
+    global _SAMPLER
+    if every < 1:
+        raise ValueError("every must be positive: %s" % every)
+    _SAMPLER = _AssertionSampler(every) if every > 1 else None
 
 
 def assert_that(actual):
-    return AssertionHandler(actual)
+    sampler = _SAMPLER
+    if sampler is None:
+        return AssertionHandler(actual)
+    if sampler is not _DISABLED and sampler.sample():
+        return AssertionHandler(actual)
+    return _NO_OP_HANDLER
+
+
+def check_that(actual):
+    """
+    Starts a check of the given actual value. Works like assert_that but returns a CheckHandler which evaluates to
+    False instead of raising an AssertionError when a matcher does not match:
+
+      if not check_that(value).contains('spam').and_ends_with('eggs'):
+          ...
+
+    Checks are always evaluated, even if assertions are disabled or sampled.
+    """
+    return CheckHandler(actual)
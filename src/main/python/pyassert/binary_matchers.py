@@ -0,0 +1,281 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides matcher implementations for binary data such as network frames or serialized blobs given as bytes,
+bytearray, memoryview or mmap objects:
+
+  assert_that(frame).starts_with(b'\\x89PNG')
+  assert_that(memoryview(payload)[header_length:]).contains(b'\\r\\n\\r\\n')
+
+The actual data is never copied as a whole: bytes and bytearrays are searched and compared in place and memoryviews
+and mmaps are compared in blocks of BLOCK_SIZE bytes. Failure messages show a hex and ASCII dump of the bytes around
+the first difference.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "BinaryMatcher",
+    "BinaryContainsMatcher",
+    "BinaryStartsWithMatcher",
+    "BinaryEndsWithMatcher",
+    "BinaryIsEmptyMatcher",
+    "hex_dump"
+]
+
+import mmap
+
+import six
+
+from .formatting import format_value, format_values
+from .matcher_registry import Matcher, register_matcher, register_negated_matcher
+from .string_matchers import _expected_needles
+
+# Number of bytes of a memoryview or mmap copied at a time when comparing or searching it.
+BLOCK_SIZE = 64 * 1024
+# Number of bytes shown per line and before and after the first difference by hex_dump.
+HEX_DUMP_WIDTH = 16
+HEX_DUMP_CONTEXT = 32
+
+
+def hex_dump(data, start, end):
+    """
+    Returns lines rendering data[start:end] as offset, hex bytes and printable ASCII characters, extended to full
+    lines of HEX_DUMP_WIDTH bytes. Only the bytes shown are read from data.
+    """
+    start = max(start // HEX_DUMP_WIDTH * HEX_DUMP_WIDTH, 0)
+    end = min(end, _length(data))
+    lines = []
+    for line_start in range(start, end, HEX_DUMP_WIDTH):
+        line = bytearray(_window(data, line_start, min(line_start + HEX_DUMP_WIDTH, end)))
+        lines.append("%08x  %-*s  |%s|" % (line_start, 3 * HEX_DUMP_WIDTH - 1, " ".join("%02x" % byte for byte in line),
+                                           "".join(chr(byte) if 32 <= byte < 127 else "." for byte in line)))
+    return lines
+
+
+def _length(data):
+    return data.nbytes if isinstance(data, memoryview) else len(data)
+
+
+def _window(data, start, end):
+    """Returns data[start:end] as bytes, copying only these bytes."""
+    if isinstance(data, memoryview):
+        return data[start:end].tobytes()
+    return bytes(data[start:end])
+
+
+def _byte_view(view):
+    """Returns the given memoryview as a flat view of unsigned bytes, copying it only if it is not contiguous."""
+    if view.format == "B" and view.ndim == 1:
+        return view
+    if view.c_contiguous and hasattr(view, "cast"):
+        return view.cast("B")
+    return memoryview(view.tobytes())
+
+
+def _first_difference(data, offset, expected):
+    """
+    Returns the index of the first byte of expected differing from data[offset:] or None, if data contains expected
+    at offset. Returns the length of the data left if it ends before expected.
+    """
+    length = min(len(expected), _length(data) - offset)
+    for block_start in range(0, length, BLOCK_SIZE):
+        actual_block = _window(data, offset + block_start, offset + min(block_start + BLOCK_SIZE, length))
+        expected_block = bytes(expected[block_start:block_start + len(actual_block)])
+        if actual_block != expected_block:
+            for index, (actual_byte, expected_byte) in enumerate(zip(bytearray(actual_block),
+                                                                     bytearray(expected_block))):
+                if actual_byte != expected_byte:
+                    return block_start + index
+    return None if length == len(expected) else length
+
+
+def _as_bytes(expected):
+    if isinstance(expected, int):
+        return bytes(bytearray((expected,)))
+    if isinstance(expected, memoryview):
+        return expected.tobytes()
+    return expected
+
+
+def _first_text(expected_values):
+    """Returns the first of the expected values that is text or None."""
+    for expected in expected_values:
+        if isinstance(expected, six.text_type):
+            return expected
+    return None
+
+
+class BinaryMatcher(Matcher):
+    """
+    Base class for matchers accepting bytes, bytearray, memoryview and mmap values. Binary data never equals text, so
+    matchers given an expected text fail in both plain and negated contexts, describing the type mismatch. The text is
+    not rejected by the constructor, as expectations create the matchers of all types for their expected values.
+    """
+
+    accepted_types = (bytes, bytearray, memoryview, mmap.mmap)
+    _text = None
+
+    def matches_negated(self, actual):
+        return self._text is None and not self.matches(actual)
+
+    def _describe_text(self):
+        return "Expected '%s' is text but binary data can only be compared to bytes, encode the expected text first" % (
+            format_value(self._text))
+
+    def _data(self, actual):
+        return _byte_view(actual) if isinstance(actual, memoryview) else actual
+
+    def _describe_actual(self, actual):
+        return "%s of %d bytes" % (type(actual).__name__, _length(self._data(actual)))
+
+    def _dump(self, data, offset):
+        lines = hex_dump(data, offset - HEX_DUMP_CONTEXT, offset + HEX_DUMP_CONTEXT)
+        return "\n".join("  " + line for line in lines) if lines else "  (no bytes)"
+
+    def _find(self, data, needle, start=0):
+        """Returns the offset of the first occurrence of needle in data at or after start or -1."""
+        if not isinstance(data, memoryview):
+            return data.find(needle, start)
+
+        # consecutive windows overlap by len(needle) - 1 bytes, so occurrences spanning two windows are found
+        length = data.nbytes
+        overlap = max(len(needle) - 1, 0)
+        for window_start in range(start, max(length - overlap, start + 1), BLOCK_SIZE):
+            index = _window(data, window_start, window_start + BLOCK_SIZE + overlap).find(needle)
+            if index >= 0:
+                return window_start + index
+        return -1
+
+
+@register_matcher("contains")
+@register_matcher("does_not_contain", negated=True)
+class BinaryContainsMatcher(BinaryMatcher):
+    """Tests whether the actual data contains the expected bytes or a single byte value, any_of or all of them."""
+
+    def __init__(self, expected):
+        self._expected = expected
+        needles, self._requires_all = _expected_needles(expected)
+        self._needles = tuple(_as_bytes(needle) for needle in (needles if needles is not None else (expected,)))
+        self._text = _first_text(self._needles)
+
+    def matches(self, actual):
+        if self._text is not None:
+            return False
+        data = self._data(actual)
+        found = (self._find(data, needle) >= 0 for needle in self._needles)
+        return all(found) if self._requires_all else any(found)
+
+    def describe(self, actual):
+        if self._text is not None:
+            return self._describe_text()
+        data = self._data(actual)
+        missing = [needle for needle in self._needles if self._find(data, needle) < 0]
+        return "Actual %s does not contain %s%s:\n%s" % (
+            self._describe_actual(actual), self._describe_expected(), format_values(missing),
+            self._dump(data, HEX_DUMP_CONTEXT))
+
+    def describe_negated(self, actual):
+        if self._text is not None:
+            return self._describe_text()
+        data = self._data(actual)
+        found = [(offset, needle) for offset, needle in
+                 ((self._find(data, needle), needle) for needle in self._needles) if offset >= 0]
+        offset, needle = min(found, key=lambda hit: hit[0])
+        return "Actual %s contains %s at offset %d:\n%s" % (
+            self._describe_actual(actual), format_value(needle), offset, self._dump(data, offset))
+
+    def _describe_expected(self):
+        if len(self._needles) == 1:
+            return ""
+        return "any of " if not self._requires_all else "all expected bytes, missing "
+
+
+@register_matcher("starts_with")
+@register_matcher("does_not_start_with", negated=True)
+class BinaryStartsWithMatcher(BinaryMatcher):
+    """Tests whether the actual data starts with the expected bytes."""
+
+    def __init__(self, expected):
+        self._expected = _as_bytes(expected)
+        self._text = _first_text((self._expected,))
+
+    def _offset(self, data):
+        return 0
+
+    def matches(self, actual):
+        if self._text is not None:
+            return False
+        data = self._data(actual)
+        if isinstance(data, (bytes, bytearray)):
+            return data.startswith(self._expected)
+        return _first_difference(data, self._offset(data), self._expected) is None
+
+    def describe(self, actual):
+        if self._text is not None:
+            return self._describe_text()
+        data = self._data(actual)
+        offset = self._offset(data)
+        index = _first_difference(data, offset, self._expected) if offset >= 0 else 0
+        if offset < 0 or offset + index >= _length(data):
+            return "Actual %s is shorter than the expected %d bytes:\n%s" % (
+                self._describe_actual(actual), len(self._expected), self._dump(data, _length(data)))
+        return "Actual %s differs from the expected %d bytes at offset %d:\nactual\n%s\nexpected\n%s" % (
+            self._describe_actual(actual), len(self._expected), offset + index, self._dump(data, offset + index),
+            self._dump(self._expected, index))
+
+    def describe_negated(self, actual):
+        if self._text is not None:
+            return self._describe_text()
+        return "Actual %s starts with %s" % (self._describe_actual(actual), format_value(self._expected))
+
+
+@register_matcher("ends_with")
+@register_matcher("does_not_end_with", negated=True)
+class BinaryEndsWithMatcher(BinaryStartsWithMatcher):
+    """Tests whether the actual data ends with the expected bytes."""
+
+    def _offset(self, data):
+        return _length(data) - len(self._expected)
+
+    def matches(self, actual):
+        if self._text is not None:
+            return False
+        data = self._data(actual)
+        if isinstance(data, (bytes, bytearray)):
+            return data.endswith(self._expected)
+        offset = self._offset(data)
+        return offset >= 0 and _first_difference(data, offset, self._expected) is None
+
+    def describe_negated(self, actual):
+        if self._text is not None:
+            return self._describe_text()
+        return "Actual %s ends with %s" % (self._describe_actual(actual), format_value(self._expected))
+
+
+@register_matcher("is_empty")
+@register_negated_matcher("is_not_empty")
+class BinaryIsEmptyMatcher(BinaryMatcher):
+    """Tests whether the actual data is empty, dumping its first bytes otherwise."""
+
+    def matches(self, actual):
+        return _length(self._data(actual)) == 0
+
+    def describe(self, actual):
+        return "Actual %s is not empty:\n%s" % (self._describe_actual(actual), self._dump(self._data(actual), 0))
+
+    def describe_negated(self, actual):
+        return "Actual %s is empty" % self._describe_actual(actual)
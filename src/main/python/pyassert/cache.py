@@ -0,0 +1,89 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides a bounded, thread safe cache used by matchers to keep compiled expected values such as regular expressions
+that are expensive to build and likely to be used again.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "LRUCache"
+]
+
+import threading
+from collections import OrderedDict
+
+if not hasattr(OrderedDict, "move_to_end"):
+    class OrderedDict(OrderedDict):
+        def move_to_end(self, key):
+            self[key] = self.pop(key)
+
+
+class LRUCache(object):
+    """
+    Cache keeping at most max_size values. When full, the least recently used value is evicted. Values are computed
+    outside of the lock, so two threads missing the same key at the same time may both compute the value. Counts the
+    lookups that found a cached value (hits) and those that had to compute it (misses); hits are counted without
+    locking and may be undercounted when threads race.
+    """
+
+    def __init__(self, max_size):
+        if max_size < 1:
+            raise ValueError("max_size must be positive: %s" % max_size)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, compute):
+        """Returns the value cached for the given key or computes it by calling compute(key) and caches it."""
+        # hits do not take the lock: reading and reordering an OrderedDict are atomic operations
+        try:
+            value = self._values[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            try:
+                self._values.move_to_end(key)
+            except KeyError:
+                pass
+            return value
+
+        value = compute(key)
+        with self._lock:
+            self.misses += 1
+            self._values[key] = value
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Returns a dict holding the number of hits and misses, the number of cached values and max_size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._values), "max_size": self.max_size}
+
+    def clear(self):
+        """Discards all cached values and resets the hit and miss counts."""
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,308 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides bounded diffs of strings and sequences for failure messages. The common prefix and suffix are skipped first;
+the remaining middle is compared using the linear space variant of Myers' O(ND) difference algorithm. The search
+stops once its work or time budget is used up and reports the rest of the middle as a single change, so even huge
+inputs are described in bounded time. The rendered diff is limited to a fixed number of lines.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "describe_difference",
+    "diff_opcodes"
+]
+
+import math
+import time
+
+from .formatting import format_value
+
+try:
+    _TEXT_TYPES = (str, unicode)
+except NameError:
+    _TEXT_TYPES = (str,)
+
+_clock = getattr(time, "monotonic", time.time)
+
+# Texts or sequences shorter than this are described by the values alone, unless a text spans multiple lines.
+DIFF_MIN_LENGTH = 50
+# Maximum number of diagonal steps and seconds spent searching for the shortest edit script.
+DIFF_MAX_COST = 1000000
+DIFF_TIME_BUDGET = 0.25
+# Maximum number of lines of a rendered diff.
+DIFF_MAX_LINES = 40
+# Maximum number of elements compared at a time when skipping the common prefix and suffix.
+DIFF_MAX_BLOCK_SIZE = 64 * 1024
+# Number of unchanged lines or elements shown around a change, and characters for single line texts.
+DIFF_CONTEXT = 2
+DIFF_CHARACTER_CONTEXT = 20
+
+
+class _Budget(object):
+    """Work and time left for the search. Once exhausted, regions not yet compared are reported as replaced."""
+    __slots__ = ("remaining_cost", "deadline", "exhausted")
+
+    def __init__(self, max_cost, time_budget):
+        self.remaining_cost = max_cost
+        self.deadline = _clock() + time_budget
+        self.exhausted = False
+
+    def spend(self, cost):
+        self.remaining_cost -= cost
+        if self.remaining_cost < 0 or _clock() > self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
+def diff_opcodes(a, b, max_cost=DIFF_MAX_COST, time_budget=DIFF_TIME_BUDGET):
+    """
+    Compares the sequences a and b and returns a list of (tag, a_start, a_end, b_start, b_end) tuples describing how
+    to turn a into b like difflib.SequenceMatcher.get_opcodes: tag is one of 'equal', 'delete', 'insert' and
+    'replace'. Elements are compared using ==. The second return value tells whether the budget was exhausted, in
+    which case the opcodes are correct but not necessarily minimal.
+    """
+    budget = _Budget(max_cost, time_budget)
+    operations = []
+    pending = [(0, len(a), 0, len(b))]
+    while pending:
+        task = pending.pop()
+        if task[0] == "equal":
+            _append(operations, task)
+            continue
+
+        a_start, a_end, b_start, b_end = task
+        prefix_length = _common_length(a, a_start, a_end, b, b_start, b_end)
+        a_start += prefix_length
+        b_start += prefix_length
+        if a_start > task[0]:
+            _append(operations, ("equal", task[0], a_start, task[2], b_start))
+        suffix_end = a_end
+        suffix_length = _common_length(a, a_start, a_end, b, b_start, b_end, from_end=True)
+        a_end -= suffix_length
+        b_end -= suffix_length
+        if a_end < suffix_end:
+            pending.append(("equal", a_end, suffix_end, b_end, b_end + suffix_end - a_end))
+
+        if a_start == a_end or b_start == b_end or budget.exhausted:
+            _append(operations, ("change", a_start, a_end, b_start, b_end))
+            continue
+
+        snake = _middle_snake(a, a_start, a_end, b, b_start, b_end, budget)
+        if snake is None:
+            _append(operations, ("change", a_start, a_end, b_start, b_end))
+            continue
+        x, y, u, v = snake
+        pending.append((u, a_end, v, b_end))
+        if u > x:
+            pending.append(("equal", x, u, y, v))
+        pending.append((a_start, x, b_start, y))
+
+    return [_tag(operation) for operation in operations], budget.exhausted
+
+
+def _common_length(a, a_start, a_end, b, b_start, b_end, from_end=False):
+    """
+    Returns the length of the common prefix, or suffix if from_end is True, of a[a_start:a_end] and b[b_start:b_end].
+    Slices of doubling size, up to DIFF_MAX_BLOCK_SIZE, are compared until one differs, which is then bisected, so
+    equal regions are compared by the sequence types in native code rather than element by element.
+    """
+    length = min(a_end - a_start, b_end - b_start)
+    matched, size, narrowing = 0, 1, False
+    while matched < length:
+        size = min(size, length - matched)
+        if from_end:
+            equal = a[a_end - matched - size:a_end - matched] == b[b_end - matched - size:b_end - matched]
+        else:
+            equal = a[a_start + matched:a_start + matched + size] == b[b_start + matched:b_start + matched + size]
+        if equal:
+            matched += size
+            size = max(size // 2, 1) if narrowing else min(size * 2, DIFF_MAX_BLOCK_SIZE)
+        elif size == 1:
+            break
+        else:
+            narrowing = True
+            size //= 2
+    return matched
+
+
+def _append(operations, operation):
+    """Appends the given operation, merging it with the previous one if both are equal or both are changes."""
+    tag, a_start, a_end, b_start, b_end = operation
+    if a_start == a_end and b_start == b_end:
+        return
+    if operations and operations[-1][0] == tag:
+        previous = operations[-1]
+        operations[-1] = (tag, previous[1], a_end, previous[3], b_end)
+    else:
+        operations.append(operation)
+
+
+def _tag(operation):
+    tag, a_start, a_end, b_start, b_end = operation
+    if tag == "change":
+        tag = "replace" if a_start < a_end and b_start < b_end else "delete" if a_start < a_end else "insert"
+    return tag, a_start, a_end, b_start, b_end
+
+
+def _middle_snake(a, a_start, a_end, b, b_start, b_end, budget):
+    """
+    Returns the start and end (x, y, u, v) of the middle snake of the shortest edit script turning
+    a[a_start:a_end] into b[b_start:b_end], as absolute indices, or None if the budget has been exhausted.
+    """
+    n = a_end - a_start
+    m = b_end - b_start
+    delta = n - m
+    odd = delta % 2 != 0
+    max_d = (n + m + 1) // 2
+    # step d costs 2 * d + 1, so the budget is exhausted before d exceeds the square root of the remaining cost and
+    # the diagonals are stored for these d only
+    offset = min(max_d, int(math.sqrt(max(budget.remaining_cost, 0)))) + 2
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+
+    for d in range(max_d + 1):
+        if not budget.spend(2 * d + 1):
+            return None
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x_snake, y_snake = x, y
+            while x < n and y < m and a[a_start + x] == b[b_start + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[offset + delta - k] >= n:
+                return a_start + x_snake, b_start + y_snake, a_start + x, b_start + y
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            x_snake, y_snake = x, y
+            while x < n and y < m and a[a_end - 1 - x] == b[b_end - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return a_end - x, b_end - y, a_end - x_snake, b_end - y_snake
+    return None
+
+
+def describe_difference(actual, expected):
+    """
+    Returns a bounded diff of expected and actual texts, lists or tuples for use in failure messages or None if the
+    values are too short, of other types or hold equal elements so they would not benefit from a diff. Texts spanning
+    multiple lines are compared line by line, single line texts character by character.
+    """
+    if isinstance(actual, _TEXT_TYPES) and isinstance(expected, _TEXT_TYPES):
+        if "\n" in actual or "\n" in expected:
+            return _LineRenderer().describe(expected.split("\n"), actual.split("\n"))
+        if max(len(actual), len(expected)) >= DIFF_MIN_LENGTH:
+            return _CharacterRenderer().describe(expected, actual)
+        return None
+    if isinstance(actual, (list, tuple)) and isinstance(expected, (list, tuple)):
+        if max(len(actual), len(expected)) >= DIFF_MIN_LENGTH:
+            return _ElementRenderer().describe(expected, actual)
+    return None
+
+
+class _Renderer(object):
+    """Renders the opcodes of a diff of expected and actual as a bounded number of lines."""
+
+    unit = "index"
+    context = DIFF_CONTEXT
+
+    def describe(self, expected, actual):
+        opcodes, exhausted = diff_opcodes(expected, actual)
+        changes = [opcode for opcode in opcodes if opcode[0] != "equal"]
+        if not changes:
+            # values of different types such as a list and a tuple may hold equal elements
+            return None
+        first = changes[0]
+        lines = ["First difference at %s %d; diff (- expected, + actual):" % (self.unit, self.position(first[1]))]
+
+        shown_until = 0
+        for index, (tag, e_start, e_end, a_start, a_end) in enumerate(changes):
+            context_end = changes[index + 1][1] if index + 1 < len(changes) else len(expected)
+            hunk = ["@@ expected %s %d, actual %s %d @@" % (self.unit, self.position(e_start),
+                                                            self.unit, self.position(a_start))]
+            hunk.extend(self.hunk(expected, max(e_start - self.context, shown_until), e_start, e_end,
+                                  min(e_end + self.context, context_end), actual, a_start, a_end,
+                                  DIFF_MAX_LINES - len(lines) - 1))
+            if index and len(lines) + len(hunk) > DIFF_MAX_LINES:
+                lines.append("... and %d more differences" % (len(changes) - index))
+                break
+            lines.extend(hunk)
+            shown_until = min(e_end + self.context, context_end)
+
+        if exhausted:
+            lines.append("(diff budget exhausted, the remaining differences are reported as a single change)")
+        return "\n".join(lines)
+
+    def position(self, index):
+        return index
+
+    def hunk(self, expected, context_start, e_start, e_end, context_end, actual, a_start, a_end, max_lines):
+        """Renders a change preceded by expected[context_start:e_start] and followed by expected[e_end:context_end]."""
+        lines = []
+        for index in range(context_start, e_start):
+            lines.append("  " + self.render(expected[index]))
+        # the removed and the added elements share the lines left
+        max_changed = max((max_lines - len(lines) - (context_end - e_end)) // 2, 1)
+        for prefix, values, start, end in (("- ", expected, e_start, e_end), ("+ ", actual, a_start, a_end)):
+            for index in range(start, end):
+                if index - start >= max_changed - 1 and end - index > 1:
+                    lines.append("%s... (%d more)" % (prefix, end - index))
+                    break
+                lines.append(prefix + self.render(values[index]))
+        for index in range(e_end, context_end):
+            lines.append("  " + self.render(expected[index]))
+        return lines
+
+    def render(self, element):
+        return format_value(element)
+
+
+class _LineRenderer(_Renderer):
+    unit = "line"
+
+    def position(self, index):
+        return index + 1
+
+
+class _ElementRenderer(_Renderer):
+    def render(self, element):
+        return "'%s'" % format_value(element)
+
+
+class _CharacterRenderer(_Renderer):
+    def hunk(self, expected, context_start, e_start, e_end, context_end, actual, a_start, a_end, max_lines):
+        return ["- '%s'" % self.window(expected, e_start, e_end),
+                "+ '%s'" % self.window(actual, a_start, a_end)]
+
+    def window(self, text, start, end):
+        context_start = max(start - DIFF_CHARACTER_CONTEXT, 0)
+        return "%s%s%s%s%s" % ("..." if context_start else "", text[context_start:start],
+                               format_value(text[start:end]), text[end:end + DIFF_CHARACTER_CONTEXT],
+                               "..." if end + DIFF_CHARACTER_CONTEXT < len(text) else "")
@@ -0,0 +1,173 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides element wise assertions applying an expectation to every element of a possibly huge iterable:
+
+  assert_each(records, expect.matches(r'^[A-Z]{3}\\d+$').and_is_not_empty())
+
+The iterable is consumed in chunks. Chunks can be checked in parallel by passing a concurrent.futures executor,
+e.g. a ProcessPoolExecutor to use all cores; the expectation is then pickled for every chunk.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "EachAssertionError",
+    "assert_each"
+]
+
+import itertools
+import os
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_MAX_FAILURES = 100
+
+
+class EachAssertionError(AssertionError):
+    """
+    Raised by assert_each when elements did not match the expectation. failures holds (index, message) pairs of the
+    first failing elements ordered by index, count the number of failing elements found and checked the number of
+    elements checked before the remaining work was cancelled.
+    """
+
+    def __init__(self, failures, count, checked):
+        AssertionError.__init__(self, failures, count, checked)
+        self.failures = failures
+        self.count = count
+        self.checked = checked
+
+    def __str__(self):
+        lines = ["%d of %d checked elements failed:" % (self.count, self.checked)]
+        for index, message in self.failures:
+            lines.append("  [%d] %s" % (index, message))
+        if self.count > len(self.failures):
+            lines.append("  ... and %d more" % (self.count - len(self.failures)))
+        return "\n".join(lines)
+
+
+def assert_each(iterable, expectation, chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                max_failures=DEFAULT_MAX_FAILURES, fail_fast=True, max_pending_chunks=None):
+    """
+    Checks every element of the given iterable against the given Expectation built using expect and raises an
+    EachAssertionError listing the failing elements with their indices.
+
+    chunk_size - number of elements checked as one unit of work
+    executor - optional concurrent.futures executor checking chunks in parallel
+    max_failures - maximum number of failures kept; further failures are only counted
+    fail_fast - when True, no further chunks are checked once a chunk contained a failure
+    max_pending_chunks - maximum number of chunks submitted to the executor at a time; defaults to twice the number
+                         of CPUs. Bounds the number of elements held in memory.
+
+    Every chunk submitted to the executor is checked using a copy of the expectation with matchers of its own, so
+    matchers recording state while matching can be used with a thread pool as well.
+    """
+    chunks = _chunks(iterable, chunk_size)
+    if executor is None:
+        results = _check_sequentially(expectation, chunks, max_failures, fail_fast)
+    else:
+        if max_pending_chunks is None:
+            max_pending_chunks = 2 * _cpu_count()
+        results = _check_in_parallel(expectation, chunks, executor, max_failures, fail_fast, max_pending_chunks)
+
+    failures = []
+    count = checked = 0
+    for chunk_failures, chunk_count, chunk_checked in results:
+        failures.extend(chunk_failures)
+        count += chunk_count
+        checked += chunk_checked
+
+    if count:
+        failures.sort(key=lambda failure: failure[0])
+        raise EachAssertionError(failures[:max_failures], count, checked)
+
+
+def _cpu_count():
+    try:
+        return os.cpu_count() or 1
+    except AttributeError:
+        import multiprocessing
+        return multiprocessing.cpu_count()
+
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _check_chunk(expectation, start, elements, max_failures):
+    """Checks a chunk of elements and returns the (index, message) pairs of failures, their count and checked."""
+    failures = []
+    count = 0
+    for offset, element in enumerate(elements):
+        failure = expectation.check(element)
+        if failure is not None:
+            count += 1
+            if len(failures) < max_failures:
+                failures.append((start + offset, failure.message))
+    return failures, count, len(elements)
+
+
+def _check_sequentially(expectation, chunks, max_failures, fail_fast):
+    results = []
+    for start, elements in chunks:
+        result = _check_chunk(expectation, start, elements, max_failures)
+        results.append(result)
+        if result[1] and fail_fast:
+            break
+    return results
+
+
+def _check_in_parallel(expectation, chunks, executor, max_failures, fail_fast, max_pending_chunks):
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    results = []
+    pending = set()
+    failed = False
+    try:
+        for start, elements in chunks:
+            if len(pending) >= max_pending_chunks:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                failed = _collect(done, results, fail_fast)
+                if failed:
+                    break
+            pending.add(executor.submit(_check_chunk, expectation.copy(), start, elements, max_failures))
+
+        if not failed:
+            while pending and not failed:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                failed = _collect(done, results, fail_fast)
+    finally:
+        for future in pending:
+            future.cancel()
+
+    _collect([future for future in wait(pending)[0] if not future.cancelled()], results, fail_fast)
+    return results
+
+
+def _collect(futures, results, fail_fast):
+    """Appends the results of the given done futures and returns True if work should stop due to a failure."""
+    failed = False
+    for future in futures:
+        result = future.result()
+        results.append(result)
+        failed = failed or (fail_fast and result[1] > 0)
+    return failed
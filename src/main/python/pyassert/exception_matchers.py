@@ -17,6 +17,7 @@ __author__ = "Alexander Metzner"
 
 import sys
 
+from .formatting import format_value
 from .matcher_registry import Matcher, register_matcher
 
 
@@ -39,8 +40,8 @@ class RaisesMatcher(Matcher):
 
     def describe(self, actual):
         return "Expected '{0}' to raise exception of type {1} but instead caught {2}".format(
-            actual, self._expected_exception_type.__name__, self._actual_exception_type.__name__)
+            format_value(actual), self._expected_exception_type.__name__, self._actual_exception_type.__name__)
 
     def describe_negated(self, actual):
-        return "Expected '{0}' not to raise exception of type {1}".format(actual,
+        return "Expected '{0}' not to raise exception of type {1}".format(format_value(actual),
                                                                           self._expected_exception_type.__name__)
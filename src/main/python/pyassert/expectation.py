@@ -0,0 +1,148 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides reusable, precompiled expectations. An expectation is built once using the same matcher chain syntax as
+assert_that and can then be applied to any number of actual values:
+
+  has_id = expect.contains('id').and_is_not_empty()
+
+  for record in records:
+      has_id(record)
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "Expectation",
+    "expect"
+]
+
+from .assertionhandler import AssertionFailure, InvalidUsageException, UnacceptedActualFailure
+from .matcher_registry import MatcherRegistry, dispatch_entries
+
+
+class Expectation(object):
+    """
+    Immutable plan of matcher chain links. Matcher names are resolved and matchers are instantiated when the plan is
+    built; calling the expectation with an actual value only selects the matcher accepting the value's type and
+    matches it. A matcher that fails raises an AssertionError just like assert_that does.
+
+    Matcher instances are shared by all evaluations of a plan, so plans using matchers that record state while
+    matching (such as raises or the stream matchers) must not be evaluated concurrently; use copy to get a plan with
+    matcher instances of its own for every thread. A matcher that fails is
+    handed over to the returned failure and replaced by a new instance, so its description is built from the state
+    of the failed evaluation even if the plan is evaluated again before the message is read.
+    """
+    __slots__ = ("_steps",)
+
+    def __init__(self, steps=()):
+        self._steps = steps
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+
+        chained = attribute.startswith("and_")
+        if chained and not self._steps:
+            raise InvalidUsageException(attribute)
+        matcher_name = attribute[4:] if chained else attribute
+
+        return _PendingStep(self._steps, matcher_name, MatcherRegistry.current().resolve_matchers(matcher_name))
+
+    def __call__(self, actual):
+        failure = self.check(actual)
+        if failure is not None:
+            raise AssertionError(failure.message)
+
+    def copy(self):
+        """Returns a plan of the same steps with new matcher instances."""
+        return Expectation(tuple(step.copy() for step in self._steps))
+
+    def check(self, actual):
+        """
+        Returns the failure of the first matcher not matching the given actual value or None, if all matchers match.
+        """
+        for step in self._steps:
+            matcher = step.select_matcher(actual)
+            if matcher is None:
+                return UnacceptedActualFailure(step.matcher_name, actual)
+            if not matcher.matches(actual):
+                step.replace_matcher(matcher)
+                return AssertionFailure(matcher, actual)
+        return None
+
+
+class ExpectationStep(object):
+    """A single link of an Expectation holding one matcher instance for every factory registered for the name."""
+    __slots__ = ("matcher_name", "_matcher_factories", "_arguments", "_keyword_arguments", "_matchers", "_dispatch")
+
+    def __init__(self, matcher_name, matcher_factories, arguments, keyword_arguments):
+        self.matcher_name = matcher_name
+        self._matcher_factories = matcher_factories
+        self._arguments = arguments
+        self._keyword_arguments = keyword_arguments
+        self._matchers = tuple(matcher_factory(*arguments, **keyword_arguments)
+                               for matcher_factory in matcher_factories)
+        self._dispatch = {}
+
+    def copy(self):
+        """Returns a step of the same matchers with new matcher instances."""
+        return ExpectationStep(self.matcher_name, self._matcher_factories, self._arguments, self._keyword_arguments)
+
+    def replace_matcher(self, matcher):
+        """Replaces the given matcher of this step by a new instance created by the same factory."""
+        matchers = list(self._matchers)
+        for index, candidate in enumerate(matchers):
+            if candidate is matcher:
+                matchers[index] = self._matcher_factories[index](*self._arguments, **self._keyword_arguments)
+        self._matchers = tuple(matchers)
+        self._dispatch = {}
+
+    def select_matcher(self, actual):
+        """Returns the matcher accepting the given actual value or None, if no matcher accepts it."""
+        actual_type = type(actual)
+        try:
+            entries = self._dispatch[actual_type]
+        except KeyError:
+            entries = self._dispatch_entries(actual_type)
+            self._dispatch[actual_type] = entries
+
+        for matcher, needs_probe in entries:
+            if not needs_probe or matcher.accepts(actual):
+                return matcher
+        return None
+
+    def _dispatch_entries(self, actual_type):
+        matchers_by_factory = dict(zip(self._matcher_factories, self._matchers))
+        return tuple((matchers_by_factory[matcher_factory], needs_probe)
+                     for matcher_factory, needs_probe in dispatch_entries(self._matcher_factories, actual_type))
+
+
+class _PendingStep(object):
+    """Callable returned by Expectation attribute access, collecting the arguments of the matchers."""
+    __slots__ = ("_steps", "_matcher_name", "_matcher_factories")
+
+    def __init__(self, steps, matcher_name, matcher_factories):
+        self._steps = steps
+        self._matcher_name = matcher_name
+        self._matcher_factories = matcher_factories
+
+    def __call__(self, *arguments, **keyword_arguments):
+        step = ExpectationStep(self._matcher_name, self._matcher_factories, arguments, keyword_arguments)
+        return Expectation(self._steps + (step,))
+
+
+expect = Expectation()
@@ -15,42 +15,51 @@
 
 __author__ = "Alexander Metzner"
 
+import io
+import locale
+import mmap
 import os
 import six
 
+from .binary_matchers import _first_difference
+from .formatting import format_value
 from .matcher_registry import Matcher, register_matcher
 
+# Number of bytes or characters shown before and after the first difference when describing a file with unexpected
+# content.
+FILE_CONTENT_CONTEXT = 40
+# Number of characters read at a time when comparing a file to text.
+FILE_CONTENT_CHUNK_SIZE = 64 * 1024
+
 
 @register_matcher("is_a_directory")
 @register_matcher("is_not_a_directory", negated=True)
 class DirectoryExistsMatcher(Matcher):
-    def accepts(self, actual):
-        return isinstance(actual, six.string_types)
+    accepted_types = six.string_types
 
     def matches(self, actual):
         return os.path.exists(actual) and os.path.isdir(actual)
 
     def describe(self, actual):
-        return "'{0}' is not an existing directory".format(actual)
+        return "'{0}' is not an existing directory".format(format_value(actual))
 
     def describe_negated(self, actual):
-        return "'{0}' is an existing directory".format(actual)
+        return "'{0}' is an existing directory".format(format_value(actual))
 
 
 @register_matcher("is_a_file")
 @register_matcher("is_not_a_file", negated=True)
 class FileExistsMatcher(Matcher):
-    def accepts(self, actual):
-        return isinstance(actual, six.string_types)
+    accepted_types = six.string_types
 
     def matches(self, actual):
         return os.path.exists(actual) and os.path.isfile(actual)
 
     def describe(self, actual):
-        return "'{0}' is not an existing file".format(actual)
+        return "'{0}' is not an existing file".format(format_value(actual))
 
     def describe_negated(self, actual):
-        return "'{0}' is an existing file".format(actual)
+        return "'{0}' is an existing file".format(format_value(actual))
 
 
 @register_matcher("has_file_length_of")
@@ -68,7 +77,7 @@ class FileLengthMatcher(FileExistsMatcher):
         return int(self._actual_size) == int(self._expected_size)
 
     def describe(self, actual):
-        return "Actual '{0}' has a length of {1:d} bytes but expected {2:d} bytes.".format(actual,
+        return "Actual '{0}' has a length of {1:d} bytes but expected {2:d} bytes.".format(format_value(actual),
                                                                                            self._actual_size,
                                                                                            self._expected_size)
 
@@ -82,27 +91,119 @@ class EmptyFileMatcher(FileLengthMatcher):
         self._expected_size = 0
 
     def describe(self, actual):
-        return "Actual file '{0}' is not empty.".format(actual)
+        return "Actual file '{0}' is not empty.".format(format_value(actual))
 
 
 @register_matcher("is_a_file_with_content")
 class FileContentMatcher(FileExistsMatcher):
-    """matches a given file for the expected file content"""
-    def __init__(self, expected_content):
-        self._actual_content = None
+    """
+    matches a given file for the expected file content. Text content is compared to the file read as text using the
+    given encoding, or the preferred encoding of the locale, translating newlines, in chunks of FILE_CONTENT_CHUNK_SIZE
+    characters; bytes that cannot be decoded never match. Byte content is compared to the file's bytes: the file
+    sizes are compared first and files of the expected size are mapped into memory and compared block by block.
+    Either way comparing stops at the first difference, so the file is never read into memory as a whole.
+    """
+    def __init__(self, expected_content, encoding=None):
         self._expected_content = expected_content
+        self._encoding = None
+        if not isinstance(expected_content, bytes):
+            self._encoding = encoding or locale.getpreferredencoding(False)
+        self._actual_file_name = None
+        self._actual_size = None
+        self._difference = None
 
     def matches(self, actual_file_name):
         """checks if the file with the given name has the expected content"""
+        self._actual_file_name = None
         if not FileExistsMatcher.matches(self, actual_file_name):
             return False
 
-        with open(actual_file_name, "r") as actual_file:
-            self._actual_content = actual_file.read()
-
-        return self._actual_content == self._expected_content
+        self._actual_file_name = actual_file_name
+        self._difference = None
+        if self._encoding is None:
+            self._actual_size = os.stat(actual_file_name).st_size
+            if self._actual_size != len(self._expected_content):
+                return False
+
+        self._difference = self._find_difference(actual_file_name)
+        return self._difference is None
+
+    def _find_difference(self, actual_file_name):
+        """Returns the offset of the first byte or character differing from the expected content or None."""
+        if self._encoding is not None:
+            return self._find_text_difference(actual_file_name)
+        if not self._expected_content or not self._actual_size:
+            return None if self._actual_size == len(self._expected_content) else 0
+        with open(actual_file_name, "rb") as actual_file:
+            mapped = mmap.mmap(actual_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                difference = _first_difference(mapped, 0, self._expected_content)
+            finally:
+                mapped.close()
+        if difference is None and self._actual_size != len(self._expected_content):
+            return len(self._expected_content)
+        return difference
+
+    def _find_text_difference(self, actual_file_name):
+        expected = self._expected_content
+        offset = 0
+        with io.open(actual_file_name, "r", encoding=self._encoding, errors="replace") as actual_file:
+            while True:
+                chunk = actual_file.read(FILE_CONTENT_CHUNK_SIZE)
+                expected_chunk = expected[offset:offset + len(chunk)]
+                if chunk != expected_chunk:
+                    for index, (actual_character, expected_character) in enumerate(zip(chunk, expected_chunk)):
+                        if actual_character != expected_character:
+                            return offset + index
+                    return offset + len(expected_chunk)
+                if not chunk:
+                    return None if offset == len(expected) else offset
+                offset += len(chunk)
 
     def describe(self, actual_file_name):
-        return "Actual file '{0}' has content '{1}' but expected '{2}'.".format(actual_file_name,
-                                                                                self._actual_content,
-                                                                                self._expected_content)
+        if self._actual_file_name is None:
+            return FileExistsMatcher.describe(self, actual_file_name)
+        # the first difference of files of another size is only looked for when describing the mismatch
+        if self._difference is None:
+            self._difference = self._find_difference(self._actual_file_name)
+
+        start = max(self._difference - FILE_CONTENT_CONTEXT, 0)
+        end = self._difference + FILE_CONTENT_CONTEXT
+        actual_window, actual_continues = self._read_window(start, end)
+        expected_window = self._expected_content[start:end]
+        expected_continues = end < len(self._expected_content)
+        if start == 0 and not actual_continues and not expected_continues:
+            return "Actual file '{0}' has content '{1}' but expected '{2}'.".format(
+                format_value(actual_file_name), format_value(actual_window), format_value(self._expected_content))
+
+        if self._encoding is None:
+            description = "Actual file '{0}' of {1:d} bytes differs from the expected {2:d} bytes".format(
+                format_value(actual_file_name), self._actual_size, len(self._expected_content))
+        else:
+            description = "Actual file '{0}' differs from the expected {1:d} characters".format(
+                format_value(actual_file_name), len(self._expected_content))
+        return "{0} at offset {1:d}: has {2} but expected {3}.".format(
+            description, self._difference, _render_window(actual_window, start, actual_continues),
+            _render_window(expected_window, start, expected_continues))
+
+    def _read_window(self, start, end):
+        """Returns the actual content from start to end and whether the file continues after end."""
+        if self._encoding is None:
+            with open(self._actual_file_name, "rb") as actual_file:
+                actual_file.seek(start)
+                window = actual_file.read(end - start + 1)
+        else:
+            with io.open(self._actual_file_name, "r", encoding=self._encoding, errors="replace") as actual_file:
+                skipped = 0
+                while skipped < start:
+                    chunk = actual_file.read(min(FILE_CONTENT_CHUNK_SIZE, start - skipped))
+                    if not chunk:
+                        break
+                    skipped += len(chunk)
+                window = actual_file.read(end - start + 1)
+        return window[:end - start], len(window) > end - start
+
+
+def _render_window(window, start, continues):
+    """Renders the window using repr, so line ends and other control characters are visible."""
+    return "{0}{1!r}{2}".format("..." if start else "", window, "..." if continues else "")
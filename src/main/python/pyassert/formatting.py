@@ -0,0 +1,265 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides bounded formatting of values for failure messages. Small values are rendered exactly like '%s' % value;
+huge strings and collections are cut off after a configurable size and summarized with their type and length. The
+rendering never walks more of a value than it is going to print.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "format_value",
+    "format_values",
+    "get_format_limits",
+    "set_format_limits"
+]
+
+import itertools
+
+try:
+    from collections.abc import Mapping, Sequence, Set
+except ImportError:
+    from collections import Mapping, Sequence, Set
+
+try:
+    _TEXT_TYPES = (str, unicode)
+except NameError:
+    _TEXT_TYPES = (str,)
+_BYTES_TYPES = (bytes, bytearray)
+
+_LIMITS = {
+    "max_length": 2000,
+    "max_items": 100,
+    "max_depth": 6,
+}
+
+_ELLIPSIS = "..."
+
+
+def get_format_limits():
+    """Returns a dict of the currently configured limits."""
+    return dict(_LIMITS)
+
+
+def set_format_limits(max_length=None, max_items=None, max_depth=None):
+    """
+    Configures the limits used by format_value for the whole process:
+
+    max_length - maximum number of characters rendered for a value
+    max_items - maximum number of elements rendered for a single collection
+    max_depth - maximum nesting depth of collections rendered
+    """
+    for name, limit in (("max_length", max_length), ("max_items", max_items), ("max_depth", max_depth)):
+        if limit is not None:
+            if limit < 1:
+                raise ValueError("%s must be positive: %s" % (name, limit))
+            _LIMITS[name] = limit
+
+
+def format_value(value):
+    """
+    Formats the given value for use in a failure message. Returns the same text as '%s' % value for values within
+    the configured limits and a shortened text followed by a summary of the value otherwise.
+    """
+    renderer = _BoundedRenderer(_LIMITS["max_length"], _LIMITS["max_items"], _LIMITS["max_depth"])
+    if isinstance(value, _TEXT_TYPES):
+        text = renderer.render_text(value, "%s")
+    elif isinstance(value, _BYTES_TYPES):
+        text = renderer.render_bytes(value)
+    elif type(value) in _COLLECTION_FORMATS:
+        text = renderer.render(value, 0)
+    elif _collection_format(value) is not None:
+        text = renderer.render(value, 0)
+        # subclasses and other collections have their own str, which is cheap for values within the limits
+        if not renderer.truncated:
+            text = str(value)
+    else:
+        text = renderer.render_text(str(value), "%s")
+
+    if renderer.truncated:
+        return "%s (%s)" % (text, _summarize(value))
+    return text
+
+
+def format_values(values):
+    """Formats the given values separated by commas, e.g. for lists of expected values."""
+    renderer = _BoundedRenderer(_LIMITS["max_length"], _LIMITS["max_items"], _LIMITS["max_depth"])
+    return renderer.join((value if value is _GAP else _Unquoted(value) for value in renderer.sample(values)), 0)
+
+
+class _Unquoted(object):
+    """Marks a value that is rendered using str instead of repr."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _DictItem(object):
+    __slots__ = ("key", "value")
+
+    def __init__(self, item):
+        self.key, self.value = item
+
+
+_GAP = object()
+
+
+class _BoundedRenderer(object):
+    """Renders values like repr while keeping track of the number of characters left to render."""
+    __slots__ = ("remaining", "max_items", "max_depth", "truncated")
+
+    def __init__(self, max_length, max_items, max_depth):
+        self.remaining = max_length
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.truncated = False
+
+    def render(self, value, depth):
+        if isinstance(value, _Unquoted):
+            value = value.value
+            if isinstance(value, _TEXT_TYPES):
+                return self.render_text(value, "%s")
+            if not isinstance(value, _BYTES_TYPES) and _collection_format(value) is None:
+                return self.render_text(str(value), "%s")
+        if isinstance(value, _TEXT_TYPES):
+            return self.render_text(value, "%r")
+        if isinstance(value, _BYTES_TYPES):
+            return self.render_bytes(value)
+
+        collection_format = _collection_format(value)
+        if collection_format is None:
+            return self.render_text(repr(value), "%s")
+
+        opening, closing, empty = collection_format
+        if not value:
+            self.remaining -= len(empty)
+            return empty
+        if depth >= self.max_depth:
+            self.truncated = True
+            return opening + _ELLIPSIS + closing
+
+        if isinstance(value, Mapping):
+            content = self.join((_DictItem(item) if item is not _GAP else item
+                                 for item in self.sample(value.items())), depth + 1)
+        else:
+            content = self.join(self.sample(value), depth + 1)
+        if isinstance(value, tuple) and len(value) == 1:
+            content += ","
+        return opening + content + closing
+
+    def render_text(self, text, text_format):
+        if len(text) > self.remaining:
+            self.truncated = True
+            half = max(self.remaining // 2, 1)
+            text = (text_format % text[:half]) + _ELLIPSIS + (text_format % text[-half:])
+        else:
+            text = text_format % text
+        self.remaining -= len(text)
+        return text
+
+    def render_bytes(self, value):
+        """Renders bytes or a bytearray like repr; only the head and tail of long values are converted."""
+        if len(value) > self.remaining:
+            self.truncated = True
+            # leaves room for the b'' of both halves and the ellipsis; escaped bytes take up to four characters each,
+            # so the rendered halves are cut to the room left as well
+            half = max((self.remaining - 2 * 3 - len(_ELLIPSIS)) // 2, 1)
+            text = repr(bytes(value[:half]))[:half + 3] + _ELLIPSIS + repr(bytes(value[-half:]))[-half - 3:]
+            self.remaining -= len(text)
+            return text
+        return self.render_text(repr(value), "%s")
+
+    def join(self, values, depth):
+        parts = []
+        for value in values:
+            if value is _GAP:
+                self.truncated = True
+                parts.append(_ELLIPSIS)
+                continue
+            if self.remaining <= 0:
+                self.truncated = True
+                parts.append(_ELLIPSIS)
+                break
+            if isinstance(value, _DictItem):
+                parts.append("%s: %s" % (self.render(value.key, depth), self.render(value.value, depth)))
+            else:
+                parts.append(self.render(value, depth))
+            self.remaining -= 2
+        return ", ".join(parts)
+
+    def sample(self, values):
+        """
+        Returns an iterable of at most max_items of the given values. _GAP marks where values have been left out:
+        in the middle of sequences and at the end of other collections.
+        """
+        try:
+            if len(values) <= self.max_items:
+                return values
+        except TypeError:
+            return itertools.chain(itertools.islice(values, self.max_items), (_GAP,))
+
+        if isinstance(values, (list, tuple)):
+            head = (self.max_items + 1) // 2
+            tail = self.max_items - head
+            return itertools.chain(values[:head], (_GAP,), values[len(values) - tail:] if tail else ())
+        return itertools.chain(itertools.islice(values, self.max_items), (_GAP,))
+
+
+_COLLECTION_FORMATS = {
+    list: ("[", "]", "[]"),
+    tuple: ("(", ")", "()"),
+    dict: ("{", "}", "{}"),
+    set: ("{", "}", "set()"),
+    frozenset: ("frozenset({", "})", "frozenset()"),
+}
+
+_ABSTRACT_COLLECTION_BRACKETS = (
+    (Mapping, "{", "}"),
+    (Set, "{", "}"),
+    (Sequence, "[", "]"),
+)
+
+
+def _collection_format(value):
+    """
+    Returns the opening, closing and empty rendering of a collection or None for other values. Subclasses of the
+    built in collections and other mappings, sets and sequences such as OrderedDict or deque are rendered with their
+    type name, e.g. deque([1, 2]).
+    """
+    collection_format = _COLLECTION_FORMATS.get(type(value))
+    if collection_format is not None or isinstance(value, _TEXT_TYPES + _BYTES_TYPES):
+        return collection_format
+    for abstract_type, opening, closing in _ABSTRACT_COLLECTION_BRACKETS:
+        if isinstance(value, abstract_type):
+            name = type(value).__name__
+            return "%s(%s" % (name, opening), "%s)" % closing, "%s()" % name
+    return None
+
+
+def _summarize(value):
+    try:
+        length = len(value)
+    except TypeError:
+        return type(value).__name__
+    if isinstance(value, _TEXT_TYPES):
+        unit = "characters"
+    elif isinstance(value, _BYTES_TYPES):
+        unit = "bytes"
+    else:
+        unit = "elements"
+    return "%s of %d %s" % (type(value).__name__, length, unit)
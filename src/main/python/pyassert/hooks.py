@@ -0,0 +1,86 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides hooks called around the evaluation of every matcher by assert_that and check_that, e.g. to feed a profiler
+or to find slow custom matchers:
+
+  def report_slow_matcher(matcher_name, matcher_factory, actual_type, outcome, elapsed):
+      if elapsed > 0.01:
+          log.warning("%s took %fs for %s", matcher_name, elapsed, actual_type)
+
+  hook = add_evaluation_hook(after=report_slow_matcher)
+  ...
+  remove_evaluation_hook(hook)
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "EvaluationHook",
+    "FAILED",
+    "PASSED",
+    "REJECTED",
+    "add_evaluation_hook",
+    "remove_evaluation_hook"
+]
+
+from .assertionhandler import FAILED, PASSED, REJECTED, add_observer, remove_observer
+
+
+def _ignore(*arguments):
+    pass
+
+
+class EvaluationHook(object):
+    """
+    A pair of callbacks called for every evaluated matcher:
+
+      before(matcher_name, matcher_factory, actual_type)
+      after(matcher_name, matcher_factory, actual_type, outcome, elapsed)
+
+    matcher_factory is the registered factory that has been picked for the actual value, outcome is one of PASSED,
+    FAILED and REJECTED (the matcher did not accept the actual value) and elapsed is the time in seconds spent in
+    accepts and matches.
+    """
+    __slots__ = ("_before", "_after")
+
+    def __init__(self, before=None, after=None):
+        self._before = before or _ignore
+        self._after = after or _ignore
+
+    def before(self, matcher_name, matcher_factory, matcher, actual):
+        self._before(matcher_name, matcher_factory, type(actual))
+
+    def after(self, matcher_name, matcher_factory, matcher, actual, outcome, elapsed):
+        self._after(matcher_name, matcher_factory, type(actual), outcome, elapsed)
+
+    def described(self, matcher_name, matcher, actual, elapsed):
+        pass
+
+
+def add_evaluation_hook(before=None, after=None):
+    """
+    Registers the given callbacks for all threads and returns the EvaluationHook to pass to remove_evaluation_hook.
+    As long as no hook is registered, evaluating a matcher does not pay for hooks at all.
+    """
+    hook = EvaluationHook(before, after)
+    add_observer(hook)
+    return hook
+
+
+def remove_evaluation_hook(hook):
+    """Unregisters a hook returned by add_evaluation_hook."""
+    remove_observer(hook)
@@ -0,0 +1,235 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides matcher implementations that consume iterators such as generators or database cursors. The matchers read
+the iterator lazily, keep only a bounded sample of the elements read and stop reading as soon as the result is known:
+
+  assert_that(line for line in log_file).contains(any_of('ERROR', 'FATAL'))
+  assert_that(cursor).has_at_least_elements(1)
+
+Note that matching consumes the elements read from the iterator.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "IteratorMatcher",
+    "IteratorContainsMatcher",
+    "IteratorIsEmptyMatcher",
+    "ElementCountMatcher",
+    "MinimumElementCountMatcher",
+    "MaximumElementCountMatcher"
+]
+
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
+
+from .formatting import format_value, format_values
+from .list_matchers import AllContainsMatcher, AnyOfContainsMatcher
+from .matcher_registry import Matcher, register_matcher, register_negated_matcher
+
+# Number of elements read from an iterator that are kept to be shown in failure messages.
+SAMPLE_SIZE = 10
+
+
+class IteratorMatcher(Matcher):
+    """
+    Base class for matchers accepting iterators. Keeps track of the elements read from the actual iterator since the
+    last call of _start, which matches calls first, as expectations and assert_each reuse matcher instances.
+    """
+
+    accepted_types = (Iterator,)
+
+    def __init__(self):
+        self._start()
+
+    def _start(self):
+        self._read_count = 0
+        self._sample = []
+
+    def _read(self, iterator):
+        for element in iterator:
+            self._read_count += 1
+            if len(self._sample) < SAMPLE_SIZE:
+                self._sample.append(element)
+            yield element
+
+    def _describe_read(self):
+        if not self._read_count:
+            return "no elements read"
+        if self._read_count > len(self._sample):
+            return "%d elements read, starting with %s" % (self._read_count, format_value(self._sample))
+        return "%d elements read: %s" % (self._read_count, format_value(self._sample))
+
+
+class _ExpectedElements(object):
+    """
+    Expected elements not yet read from an iterator. Hashable elements are kept in a set; unhashable ones are
+    compared one by one.
+    """
+
+    def __init__(self, expected):
+        self._hashable = set()
+        self._unhashable = []
+        for element in expected:
+            try:
+                self._hashable.add(element)
+            except TypeError:
+                self._unhashable.append(element)
+
+    def __len__(self):
+        return len(self._hashable) + len(self._unhashable)
+
+    def remove(self, element):
+        """Removes the given element and returns True, if it is expected. Returns False otherwise."""
+        try:
+            if element in self._hashable:
+                self._hashable.remove(element)
+                return True
+        except TypeError:
+            pass
+        for index, expected in enumerate(self._unhashable):
+            if expected is element or expected == element:
+                del self._unhashable[index]
+                return True
+        return False
+
+    def __contains__(self, element):
+        try:
+            return element in self._hashable
+        except TypeError:
+            return any(expected is element for expected in self._unhashable)
+
+
+@register_matcher("contains")
+@register_matcher("does_not_contain", negated=True)
+class IteratorContainsMatcher(IteratorMatcher):
+    """
+    Matcher that reads the actual iterator until the expected element has been read. Supports any_of and all as
+    expected value which read until one or all of their elements have been read.
+    """
+
+    def __init__(self, expected):
+        IteratorMatcher.__init__(self)
+        self.expected = expected
+        self._missing = None
+
+    def matches(self, actual):
+        self._start()
+        if isinstance(self.expected, AllContainsMatcher):
+            expected_elements, required = _ExpectedElements(self.expected.expected), None
+        elif isinstance(self.expected, AnyOfContainsMatcher):
+            expected_elements, required = _ExpectedElements(self.expected.expected), 1
+        else:
+            expected_elements, required = _ExpectedElements((self.expected,)), 1
+        required = len(expected_elements) if required is None else min(required, len(expected_elements))
+
+        found = 0
+        if required:
+            for element in self._read(actual):
+                if expected_elements.remove(element):
+                    found += 1
+                    if found == required:
+                        break
+        self._missing = expected_elements
+        return found == required
+
+    def describe(self, actual):
+        if isinstance(self.expected, AllContainsMatcher):
+            missing = [element for element in self.expected.expected if element in self._missing]
+            return "Actual iterator does not contain all elements of '%s', missing '%s' (%s)" % (
+                format_values(self.expected.expected), format_values(missing), self._describe_read())
+        if isinstance(self.expected, AnyOfContainsMatcher):
+            return "Actual iterator does not contain any of '%s' (%s)" % (format_values(self.expected.expected),
+                                                                          self._describe_read())
+        return "Actual iterator does not contain '%s' (%s)" % (format_value(self.expected), self._describe_read())
+
+    def describe_negated(self, actual):
+        expected = self.expected.expected if isinstance(self.expected, Matcher) else (self.expected,)
+        return "Actual iterator contains '%s' (%s)" % (format_values(expected), self._describe_read())
+
+
+@register_matcher("is_empty")
+@register_negated_matcher("is_not_empty")
+class IteratorIsEmptyMatcher(IteratorMatcher):
+    """Matcher that reads at most one element of the actual iterator."""
+
+    def matches(self, actual):
+        self._start()
+        for _ in self._read(actual):
+            return False
+        return True
+
+    def describe(self, actual):
+        return "Actual iterator is not empty (%s)" % self._describe_read()
+
+    def describe_negated(self, actual):
+        return "Actual iterator is empty"
+
+
+class _CountingMatcher(IteratorMatcher):
+    """Base class for matchers counting the elements of the actual iterator up to a limit."""
+
+    def __init__(self, expected_count):
+        IteratorMatcher.__init__(self)
+        self.expected_count = expected_count
+
+    def _count(self, actual, limit):
+        self._start()
+        if limit > 0:
+            for _ in self._read(actual):
+                if self._read_count >= limit:
+                    break
+        return self._read_count
+
+
+@register_matcher("has_element_count")
+class ElementCountMatcher(_CountingMatcher):
+    """Matcher that verifies the number of elements of the actual iterator, reading at most one more than expected."""
+
+    def matches(self, actual):
+        return self._count(actual, self.expected_count + 1) == self.expected_count
+
+    def describe(self, actual):
+        if self._read_count > self.expected_count:
+            return "Actual iterator has more than %d elements (%s)" % (self.expected_count, self._describe_read())
+        return "Actual iterator has %d elements but expected %d (%s)" % (self._read_count, self.expected_count,
+                                                                         self._describe_read())
+
+
+@register_matcher("has_at_least_elements")
+class MinimumElementCountMatcher(_CountingMatcher):
+    """Matcher that verifies that the actual iterator has at least the expected number of elements."""
+
+    def matches(self, actual):
+        return self._count(actual, self.expected_count) >= self.expected_count
+
+    def describe(self, actual):
+        return "Actual iterator has %d elements but expected at least %d (%s)" % (
+            self._read_count, self.expected_count, self._describe_read())
+
+
+@register_matcher("has_at_most_elements")
+class MaximumElementCountMatcher(_CountingMatcher):
+    """Matcher that verifies that the actual iterator has at most the expected number of elements."""
+
+    def matches(self, actual):
+        return self._count(actual, self.expected_count + 1) <= self.expected_count
+
+    def describe(self, actual):
+        return "Actual iterator has more than %d elements (%s)" % (self.expected_count, self._describe_read())
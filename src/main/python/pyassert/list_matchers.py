@@ -19,17 +19,54 @@ Provides matcher implementations that deal with lists or tuples.
 
 __author__ = 'Alexander Metzner'
 
-import collections
+from collections import Counter
 
+try:
+    from collections.abc import Container
+except ImportError:
+    from collections import Container
+
+from .formatting import format_value, format_values
 from .string_matchers import StringMatcher
 from .matcher_registry import Matcher, register_matcher, register_negated_matcher
 
 
+# Lists or tuples with fewer elements or lookups of fewer expected elements are always scanned linearly as building an
+# index does not pay off for them.
+INDEX_MIN_ELEMENTS = 64
+INDEX_MIN_EXPECTED = 4
+
+# Number of distinct missing or unexpected elements listed in failure messages.
+MAX_REPORTED_ELEMENTS = 10
+
+
 class ListOrTupleMatcher(Matcher):
     """ Base class for matchers accepting lists or tuples. """
 
-    def accepts(self, actual):
-        return isinstance(actual, collections.Container)
+    accepted_types = (Container,)
+
+
+def membership_test(actual, expected_count):
+    """
+    Returns a function telling whether a single element is contained in the actual collection. If actual is a list or
+    tuple of hashable elements and enough expected elements are looked up to amortize it, the function uses a set of
+    the actual elements built once; otherwise each lookup scans the collection.
+    """
+    if expected_count >= INDEX_MIN_EXPECTED and isinstance(actual, (list, tuple)) and \
+            len(actual) >= INDEX_MIN_ELEMENTS:
+        try:
+            index = frozenset(actual)
+        except TypeError:
+            return actual.__contains__
+
+        def indexed_contains(element):
+            try:
+                return element in index
+            except TypeError:
+                return element in actual
+
+        return indexed_contains
+    return actual.__contains__
 
 
 class AnyOfContainsMatcher(ListOrTupleMatcher):
@@ -42,14 +79,15 @@ class AnyOfContainsMatcher(ListOrTupleMatcher):
         self.expected = expected
 
     def matches(self, actual):
+        contains = membership_test(actual, len(self.expected))
         for element in self.expected:
-            if element in actual:
+            if contains(element):
                 return True
         return False
 
     def describe(self, actual):
-        return "Actual '%s' does not contain any of '%s'" % (actual,
-                                                             ", ".join(self.expected))
+        return "Actual '%s' does not contain any of '%s'" % (format_value(actual),
+                                                             format_values(self.expected))
 
 
 def any_of(*expected_values):
@@ -60,21 +98,31 @@ def any_of(*expected_values):
 class AllContainsMatcher(ListOrTupleMatcher):
     """
     Supplementary matcher that matches when all of the expected values
-    are contained in the actual collection.
+    are contained in the actual collection. describe reuses the membership test built by the last call of matches
+    for the same actual collection.
     """
 
     def __init__(self, expected):
         self.expected = expected
+        self._membership = None
 
     def matches(self, actual):
+        contains = membership_test(actual, len(self.expected))
+        self._membership = (actual, contains)
         for element in self.expected:
-            if element not in actual:
+            if not contains(element):
                 return False
         return True
 
     def describe(self, actual):
-        return "Actual '%s' does not contain all elements of '%s'" % (actual,
-                                                                      ", ".join(self.expected))
+        if self._membership is not None and self._membership[0] is actual:
+            contains = self._membership[1]
+        else:
+            contains = membership_test(actual, len(self.expected))
+        missing = [element for element in self.expected if not contains(element)]
+        return "Actual '%s' does not contain all elements of '%s', missing '%s'" % (format_value(actual),
+                                                                                    format_values(self.expected),
+                                                                                    format_values(missing))
 
 
 def all(*expected_values):
@@ -108,23 +156,117 @@ class ContainsMatcher(ListOrTupleMatcher):
     def describe(self, actual):
         if isinstance(self.expected, Matcher):
             return self.expected.describe(actual)
-        return "'%s' does not contain '%s'" % (actual, self.expected)
+        return "'%s' does not contain '%s'" % (format_value(actual), format_value(self.expected))
 
     def describe_negated(self, actual):
-        return "'%s' contains '%s'" % (actual, self.expected)
+        return "'%s' contains '%s'" % (format_value(actual), format_value(self.expected))
+
+
+def count_elements(elements):
+    """
+    Counts the given elements. Returns a Counter of the hashable elements and a list of (element, count) pairs of the
+    unhashable ones, which are compared using == one by one.
+    """
+    try:
+        return Counter(elements), []
+    except TypeError:
+        pass
+
+    hashable = Counter()
+    unhashable = []
+    for element in elements:
+        try:
+            hashable[element] += 1
+            continue
+        except TypeError:
+            pass
+        for index, (counted, count) in enumerate(unhashable):
+            if counted == element:
+                unhashable[index] = (counted, count + 1)
+                break
+        else:
+            unhashable.append((element, 1))
+    return hashable, unhashable
+
+
+def _subtract_unhashable(minuend, subtrahend):
+    difference = []
+    for element, count in minuend:
+        for other, other_count in subtrahend:
+            if other == element:
+                count -= other_count
+                break
+        if count > 0:
+            difference.append((element, count))
+    return difference
+
+
+def multiset_difference(actual, expected):
+    """
+    Returns the (element, count) pairs of the expected elements missing in actual and of the elements of actual that
+    are not expected, taking the number of occurrences into account.
+    """
+    actual_hashable, actual_unhashable = count_elements(actual)
+    expected_hashable, expected_unhashable = count_elements(expected)
+
+    missing = list((expected_hashable - actual_hashable).items())
+    missing.extend(_subtract_unhashable(expected_unhashable, actual_unhashable))
+    unexpected = list((actual_hashable - expected_hashable).items())
+    unexpected.extend(_subtract_unhashable(actual_unhashable, expected_unhashable))
+    return missing, unexpected
+
+
+def _describe_counted(counted_elements):
+    described = ["'%s'" % format_value(element) if count == 1 else "'%s' (%d times)" % (format_value(element), count)
+                 for element, count in counted_elements[:MAX_REPORTED_ELEMENTS]]
+    if len(counted_elements) > MAX_REPORTED_ELEMENTS:
+        described.append("and %d more" % (len(counted_elements) - MAX_REPORTED_ELEMENTS))
+    return ", ".join(described)
+
+
+@register_matcher("contains_exactly_in_any_order")
+class ContainsExactlyInAnyOrderMatcher(ListOrTupleMatcher):
+    """
+    Matcher that verifies that the actual list or tuple contains exactly the expected elements, each as often as
+    expected, in any order. Elements are counted in linear time; unhashable elements are compared using == one by one.
+
+    Examples:
+    assert_that(rows).contains_exactly_in_any_order(expected_rows)
+    """
+
+    accepted_types = (list, tuple)
+
+    def __init__(self, expected):
+        # the expected collection may be any iterable such as a generator, it is consumed exactly once
+        self.expected = expected if isinstance(expected, (list, tuple)) else tuple(expected)
+
+    def matches(self, actual):
+        if len(actual) != len(self.expected):
+            return False
+        missing, unexpected = multiset_difference(actual, self.expected)
+        return not missing and not unexpected
+
+    def describe(self, actual):
+        missing, unexpected = multiset_difference(actual, self.expected)
+        details = []
+        if missing:
+            details.append("missing %s" % _describe_counted(missing))
+        if unexpected:
+            details.append("unexpected %s" % _describe_counted(unexpected))
+        return "Actual '%s' does not contain exactly '%s' in any order: %s" % (
+            format_value(actual), format_value(self.expected), "; ".join(details))
 
 
 @register_matcher("is_empty")
 @register_negated_matcher("is_not_empty")
 class IsEmptyMatcher(ListOrTupleMatcher, StringMatcher):
-    def accepts(self, actual):
-        return ListOrTupleMatcher.accepts(self, actual) or StringMatcher.accepts(self, actual)
+    accepted_types = ListOrTupleMatcher.accepted_types + StringMatcher.accepted_types
 
     def matches(self, actual):
         return len(actual) == 0
 
     def describe(self, actual):
-        return "'%s' is not empty" % actual
+        return "'%s' is not empty" % format_value(actual)
 
     def describe_negated(self, actual):
-        return "'%s' is empty" % actual
+        return "'%s' is empty" % format_value(actual)
@@ -17,30 +17,145 @@ from __future__ import print_function
 
 __author__ = "Alexander Metzner"
 
+import importlib
+import sys
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
 __all__ = [
     "Matcher",
     "NegatedMatcherDecorator",
     "MatcherRegistry",
     "NoSuchMatcherException",
+    "OptionalTypes",
+    "load_builtin_matchers",
     "register_matcher",
-    "register_negated_matcher"
+    "register_negated_matcher",
+    "registry_scope",
+    "ScopedMatcherRegistry"
 ]
 
 
+BUILTIN_MATCHER_MODULES = (
+    ("string_matchers", ("contains", "does_not_contain", "matches", "does_not_match", "contains_match",
+                         "does_not_contain_match", "fully_matches", "does_not_fully_match", "has_n_matches",
+                         "starts_with", "does_not_start_with", "ends_with", "does_not_end_with")),
+    ("array_matchers", ("is_less_than", "lt", "is_less_or_equal_than", "le", "is_greater_than", "gt",
+                        "is_greater_or_equal_than", "ge", "equals", "is_equal_to", "is_not_equal_to", "is_close_to",
+                        "is_not_close_to")),
+    ("object_matchers", ("equals", "is_equal_to", "is_not_equal_to", "deeply_equals", "is_identical_to",
+                         "is_not_identical_to", "is_a", "is_true", "is_false", "is_none", "is_not_none",
+                         "is_instance_of", "is_an_instance_of", "is_not_an_instance_of")),
+    ("binary_matchers", ("contains", "does_not_contain", "starts_with", "does_not_start_with", "ends_with",
+                         "does_not_end_with", "is_empty", "is_not_empty")),
+    ("list_matchers", ("contains", "contains_exactly_in_any_order", "does_not_contain", "is_empty", "is_not_empty")),
+    ("stream_matchers", ("contains", "does_not_contain", "matches", "does_not_match", "starts_with",
+                         "does_not_start_with", "ends_with", "does_not_end_with", "has_line_count")),
+    ("iterator_matchers", ("contains", "does_not_contain", "is_empty", "is_not_empty", "has_element_count",
+                           "has_at_least_elements", "has_at_most_elements")),
+    ("number_matchers", ("is_less_than", "lt", "is_less_or_equal_than", "le", "is_greater_than", "gt",
+                         "is_greater_or_equal_than", "ge", "is_close_to", "is_not_close_to")),
+    ("exception_matchers", ("raises", "does_not_raise")),
+    ("filesystem_matchers", ("is_a_directory", "is_not_a_directory", "is_a_file", "is_not_a_file",
+                             "has_file_length_of", "is_a_empty_file", "is_a_file_with_content")),
+)
+"""
+Static manifest of the modules providing the built in matchers and the matcher names each module registers. The
+modules are imported when one of their matcher names is resolved for the first time. The order of the manifest is the
+order in which the built in matchers of the same name are tried, regardless of the order the modules are imported in:
+e.g. the binary matchers come before the list matchers, which accept bytes as containers as well.
+"""
+
+_BUILTIN_MATCHER_RANKS = dict(("%s.%s" % (__package__, module_name), rank)
+                              for rank, (module_name, _) in enumerate(BUILTIN_MATCHER_MODULES))
+
+
+def _index_matcher_modules(manifest):
+    modules_by_matcher_name = {}
+    for module_name, matcher_names in manifest:
+        for matcher_name in matcher_names:
+            modules_by_matcher_name.setdefault(matcher_name, []).append(module_name)
+    return dict((name, tuple(module_names)) for name, module_names in modules_by_matcher_name.items())
+
+
+_PENDING_MATCHER_MODULES = _index_matcher_modules(BUILTIN_MATCHER_MODULES)
+
+
+def _builtin_rank(matcher_factory):
+    """Returns the position of the module defining the given built in matcher in the manifest or None."""
+    matcher_class = getattr(matcher_factory, "matcher_class", matcher_factory)
+    return _BUILTIN_MATCHER_RANKS.get(getattr(matcher_class, "__module__", None))
+
+
+def _add_matcher(matcher_factories, matcher_factory):
+    """
+    Returns the given tuple of matcher factories with matcher_factory appended. A built in matcher is inserted before
+    the built in matchers of modules following its module in BUILTIN_MATCHER_MODULES instead.
+    """
+    rank = _builtin_rank(matcher_factory)
+    if rank is not None:
+        for index, registered_factory in enumerate(matcher_factories):
+            registered_rank = _builtin_rank(registered_factory)
+            if registered_rank is not None and registered_rank > rank:
+                return matcher_factories[:index] + (matcher_factory,) + matcher_factories[index:]
+    return matcher_factories + (matcher_factory,)
+
+
+def load_builtin_matchers(name=None):
+    """
+    Imports the built in matcher modules registering matchers for the given name or all built in matcher modules
+    when no name is given.
+    """
+    if name is None:
+        module_names = [module_name for module_name, _ in BUILTIN_MATCHER_MODULES]
+    else:
+        module_names = _PENDING_MATCHER_MODULES.get(name, ())
+
+    for module_name in module_names:
+        importlib.import_module("." + module_name, __package__)
+
+    if name is None:
+        _PENDING_MATCHER_MODULES.clear()
+    else:
+        _PENDING_MATCHER_MODULES.pop(name, None)
+
+
 class Matcher(object):
     """
     Interface class for matcher objects. Matcher objects are used to accept and match expected with actual values
     and in case of a difference to provide a description on the mismatch.
+
+    Matchers that accept values solely based on their type should declare these types using the accepted_types
+    class attribute instead of overriding accepts. This allows the registry to dispatch on the type of the actual
+    value without building and probing a matcher instance.
     """
 
+    accepted_types = None
+
     def accepts(self, actual):
         """Returns True if the given actual value is accepted by this matcher."""
-        return True
+        accepted_types = self.accepted_types
+        if accepted_types is None:
+            return True
+        if isinstance(accepted_types, OptionalTypes):
+            accepted_types = accepted_types.resolve()
+        return isinstance(actual, accepted_types)
 
     def matches(self, actual):
         """Returns True if the given actual value matches this matcher. Returns False otherwise"""
         return False
 
+    def matches_negated(self, actual):
+        """
+        Used to match the actual value when the matcher is used in a negated context. Returns the opposite of matches
+        unless overridden by matchers that have to fail in both contexts, e.g. for expected values of a wrong type.
+        """
+        return not self.matches(actual)
+
     def describe(self, actual):
         """Returns a description which is used in case the actual value did not match this matcher's expectation."""
         return "A matcher did not match the actual value."
@@ -52,6 +167,29 @@ class Matcher(object):
         return "NOT: %s" % self.describe(actual)
 
 
+class OptionalTypes(object):
+    """
+    Declares accepted_types that belong to an optional module, e.g. OptionalTypes("numpy", ("ndarray",)). The module
+    is never imported by pyassert; the types are looked up in sys.modules and are only accepted once the module has
+    been imported by someone else. Values of these types cannot exist before, so checking them never costs an import.
+    """
+    __slots__ = ("module_name", "type_names", "_types")
+
+    def __init__(self, module_name, type_names):
+        self.module_name = module_name
+        self.type_names = tuple(type_names)
+        self._types = None
+
+    def resolve(self):
+        """Returns the tuple of types or an empty tuple, if the module has not been imported yet."""
+        if self._types is None:
+            module = sys.modules.get(self.module_name)
+            if module is None:
+                return ()
+            self._types = tuple(getattr(module, type_name) for type_name in self.type_names)
+        return self._types
+
+
 class NegatedMatcherDecorator(Matcher):
     """
     Decorator used to decorate a given matcher for use in a negated context.
@@ -64,12 +202,30 @@ class NegatedMatcherDecorator(Matcher):
         return self._target_matcher.accepts(actual)
 
     def matches(self, actual):
-        return not self._target_matcher.matches(actual)
+        # matchers not derived from Matcher may lack matches_negated
+        matches_negated = getattr(self._target_matcher, "matches_negated", None)
+        if matches_negated is None:
+            return not self._target_matcher.matches(actual)
+        return matches_negated(actual)
 
     def describe(self, actual):
         return self._target_matcher.describe_negated(actual)
 
 
+class NegatedMatcherFactory(object):
+    """
+    Factory registered for negated matchers, creating matcher_class instances decorated by NegatedMatcherDecorator.
+    Unlike a closure, the factory can be pickled as long as matcher_class can.
+    """
+    __slots__ = ("matcher_class",)
+
+    def __init__(self, matcher_class):
+        self.matcher_class = matcher_class
+
+    def __call__(self, *arguments, **keyword_arguments):
+        return NegatedMatcherDecorator(self.matcher_class(*arguments, **keyword_arguments))
+
+
 class NoSuchMatcherException(Exception):
     """to be thrown when no matcher with a given name was found"""
 
@@ -86,42 +242,246 @@ class MatcherRegistry(object):
 
     The interaction with the singleton instance is wrapped using the register_matcher decorator and the
     AssertionHandler.
+
+    The registry is safe to use from multiple threads. Registrations publish a new immutable snapshot of all matchers
+    while holding a lock; lookups read the current snapshot without locking.
     """
     _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    @staticmethod
+    def current():
+        "Returns the registry of the innermost active registry_scope or the singleton instance outside of any scope"
+        return _ACTIVE_REGISTRY.get() or MatcherRegistry.instance()
 
     @staticmethod
     def instance():
         "Singleton retrieval method"
-        if MatcherRegistry._INSTANCE is None:
-            MatcherRegistry._INSTANCE = MatcherRegistry()
-        return MatcherRegistry._INSTANCE
+        instance = MatcherRegistry._INSTANCE
+        if instance is None:
+            with MatcherRegistry._INSTANCE_LOCK:
+                if MatcherRegistry._INSTANCE is None:
+                    MatcherRegistry._INSTANCE = MatcherRegistry()
+                instance = MatcherRegistry._INSTANCE
+        return instance
 
     def __init__(self):
-        self._matchers = {}
+        self._lock = threading.Lock()
+        self._snapshot = _RegistrySnapshot({})
 
     def register_matcher(self, name, matcher_factory):
         "Registers the given matcher_factory (class or function) for the given name"
-        if name not in self._matchers:
-            self._matchers[name] = []
-        self._matchers[name].append(matcher_factory)
+        with self._lock:
+            matchers = dict(self._snapshot.matchers)
+            matchers[name] = _add_matcher(matchers.get(name, ()), matcher_factory)
+            self._snapshot = _RegistrySnapshot(matchers)
 
     def resolve_matchers(self, name):
         """
-        Returns all matcher factories registered for the given name.
+        Returns a tuple of all matcher factories registered for the given name. Built in matchers are loaded on first
+        use.
         Throws a NoSuchMatcherException when no matchers are found.
         """
-        if name not in self._matchers:
+        if name in _PENDING_MATCHER_MODULES:
+            load_builtin_matchers(name)
+        return self._snapshot.resolve_matchers(name)
+
+    def resolve_dispatch(self, name, actual_type):
+        """
+        Returns the matcher factories registered for the given name that have to be tried for an actual value of the
+        given type as a tuple of (matcher_factory, needs_probe) pairs. Factories whose declared accepted_types
+        reject the type are skipped; the sequence ends with the first factory that accepts the type by declaration.
+        needs_probe is True for factories that do not declare their accepted types and thus have to be asked using
+        accepts.
+        Throws a NoSuchMatcherException when no matchers are found.
+        """
+        snapshot = self._snapshot
+        key = (name, actual_type)
+        try:
+            return snapshot.dispatch_cache[key]
+        except KeyError:
+            if name in _PENDING_MATCHER_MODULES:
+                load_builtin_matchers(name)
+                snapshot = self._snapshot
+            entries = dispatch_entries(snapshot.resolve_matchers(name), actual_type)
+            snapshot.dispatch_cache[key] = entries
+            return entries
+
+
+class ScopedMatcherRegistry(MatcherRegistry):
+    """
+    Registry overlaying a parent registry. Matchers registered with the scoped registry are only visible through it
+    and are tried before the matchers registered for the same name with the parent. Names that have not been
+    registered with the scoped registry are resolved by the parent.
+
+    Scoped registries are usually created and activated using registry_scope.
+    """
+
+    def __init__(self, parent):
+        MatcherRegistry.__init__(self)
+        self._parent = parent
+
+    def resolve_matchers(self, name):
+        matchers = self._snapshot.matchers.get(name)
+        if matchers is None:
+            return self._parent.resolve_matchers(name)
+        try:
+            return matchers + self._parent.resolve_matchers(name)
+        except NoSuchMatcherException:
+            return matchers
+
+    def resolve_dispatch(self, name, actual_type):
+        snapshot = self._snapshot
+        matchers = snapshot.matchers.get(name)
+        if matchers is None:
+            return self._parent.resolve_dispatch(name, actual_type)
+
+        key = (name, actual_type)
+        cached = snapshot.dispatch_cache.get(key)
+        if cached is not None:
+            own_entries, parent_entries, entries = cached
+            if parent_entries is None:
+                return entries
+            latest_parent_entries = self._resolve_parent_dispatch(name, actual_type)
+            if latest_parent_entries is parent_entries:
+                return entries
+        else:
+            own_entries = dispatch_entries(matchers, actual_type)
+            if own_entries and not own_entries[-1][1]:
+                # A scoped matcher accepts the type by declaration, so the parent's matchers are never tried.
+                snapshot.dispatch_cache[key] = (own_entries, None, own_entries)
+                return own_entries
+            latest_parent_entries = self._resolve_parent_dispatch(name, actual_type)
+
+        entries = own_entries + latest_parent_entries
+        snapshot.dispatch_cache[key] = (own_entries, latest_parent_entries, entries)
+        return entries
+
+    def _resolve_parent_dispatch(self, name, actual_type):
+        try:
+            return self._parent.resolve_dispatch(name, actual_type)
+        except NoSuchMatcherException:
+            return ()
+
+
+class registry_scope(object):
+    """
+    Context manager activating a new ScopedMatcherRegistry on top of the currently active registry for the current
+    thread or asyncio task. Assertions made within the scope resolve matchers through the scoped registry:
+
+      with registry_scope() as registry:
+          registry.register_matcher("is_spam", SpamMatcher)
+          assert_that(actual).is_spam()
+    """
+    __slots__ = ("registry", "_token")
+
+    def __init__(self):
+        self.registry = None
+        self._token = None
+
+    def __enter__(self):
+        self.registry = ScopedMatcherRegistry(MatcherRegistry.current())
+        self._token = _ACTIVE_REGISTRY.set(self.registry)
+        return self.registry
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        _ACTIVE_REGISTRY.reset(self._token)
+        self._token = None
+
+
+class _ThreadLocalContextVar(threading.local):
+    """Minimal stand-in for contextvars.ContextVar on Python versions without contextvars."""
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.value = default
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        token = self.value
+        self.value = value
+        return token
+
+    def reset(self, token):
+        self.value = token
+
+
+def context_variable(name):
+    """Creates a context variable defaulting to None, falling back to a thread local without contextvars."""
+    if ContextVar is not None:
+        return ContextVar(name, default=None)
+    return _ThreadLocalContextVar(name)
+
+
+_ACTIVE_REGISTRY = context_variable("pyassert_active_registry")
+
+
+class _RegistrySnapshot(object):
+    """
+    Immutable state of a MatcherRegistry: the matcher factory tuples by name and the dispatch cache computed from
+    them. The matchers dict is never modified once the snapshot has been published.
+    """
+    __slots__ = ("matchers", "dispatch_cache")
+
+    def __init__(self, matchers):
+        self.matchers = matchers
+        self.dispatch_cache = {}
+
+    def resolve_matchers(self, name):
+        try:
+            return self.matchers[name]
+        except KeyError:
             raise NoSuchMatcherException(name)
-        return self._matchers[name]
 
 
-def register_matcher(name, negated=False):
+def declared_accepted_types(matcher_factory):
+    """
+    Returns the types declared using accepted_types by the matcher class created by the given factory or None, if
+    the matcher has to be probed using accepts. Declarations are ignored when a subclass overrides accepts.
+    """
+    matcher_class = getattr(matcher_factory, "matcher_class", matcher_factory)
+    if not isinstance(matcher_class, type):
+        return None
+
+    for clazz in matcher_class.__mro__:
+        if "accepted_types" in clazz.__dict__:
+            accepted_types = clazz.__dict__["accepted_types"]
+            if isinstance(accepted_types, OptionalTypes):
+                return accepted_types.resolve()
+            return accepted_types
+        if "accepts" in clazz.__dict__:
+            return None
+    return None
+
+
+def dispatch_entries(matcher_factories, actual_type):
+    """
+    Computes the (matcher_factory, needs_probe) pairs to try for an actual value of the given type.
+    See MatcherRegistry.resolve_dispatch.
+    """
+    entries = []
+    for matcher_factory in matcher_factories:
+        accepted_types = declared_accepted_types(matcher_factory)
+        if accepted_types is None:
+            entries.append((matcher_factory, True))
+        elif issubclass(actual_type, accepted_types):
+            entries.append((matcher_factory, False))
+            break
+    return tuple(entries)
+
+
+def register_matcher(name, negated=False, registry=None):
     """
     Decorator used to register a class or a factory method as a matcher.
 
     The optional argument `negated` defines whether the matcher instances operate as normal matchers or negated which
     means that the result of a matching operation will be inverted (negated).
 
+    The optional argument `registry` defines the registry to register the matcher with, e.g. the registry of a
+    registry_scope. Matchers are registered with the singleton instance by default.
+
     Example given
 
       @register_matcher("is_no_spam")
@@ -129,20 +489,17 @@ def register_matcher(name, negated=False):
           ...
     """
     def do_register(clazz):
+        target_registry = registry if registry is not None else MatcherRegistry.instance()
         if negated:
-            def factory(*arguments, **keyword_arguments):
-                matcher = clazz(*arguments, **keyword_arguments)
-                return NegatedMatcherDecorator(matcher)
-
-            MatcherRegistry.instance().register_matcher(name, factory)
+            target_registry.register_matcher(name, NegatedMatcherFactory(clazz))
         else:
-            MatcherRegistry.instance().register_matcher(name, clazz)
+            target_registry.register_matcher(name, clazz)
         return clazz
 
     return do_register
 
 
-def register_negated_matcher(name):
+def register_negated_matcher(name, registry=None):
     """
     Convenience function used to decorate negated matchers:
 
@@ -152,4 +509,4 @@ def register_negated_matcher(name):
 
       @register_matcher(name, negated=True)
     """
-    return register_matcher(name, negated=True)
+    return register_matcher(name, negated=True, registry=registry)
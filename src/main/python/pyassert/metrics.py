@@ -0,0 +1,242 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides optional metrics about the matchers evaluated by assert_that and check_that. For every matcher name and
+matcher class the number of calls, passes, failures and accepts() rejections is counted and the time spent in
+matches() and describe() is recorded in latency histograms with fixed buckets.
+
+Every thread records into its own metrics, so recording never waits for a lock. The metrics of a thread are merged
+into a shared total when the thread exits, and the metrics of the running threads are added when a snapshot is taken:
+
+  enable_metrics()
+  ...
+  print(get_metrics_json(indent=2))
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "HISTOGRAM_BOUNDS",
+    "LatencyHistogram",
+    "disable_metrics",
+    "enable_metrics",
+    "get_metrics",
+    "get_metrics_json",
+    "reset_metrics"
+]
+
+import bisect
+import itertools
+import json
+import threading
+import weakref
+
+from .assertionhandler import PASSED, REJECTED, add_observer, remove_observer
+
+# Upper bounds in seconds of the histogram buckets. An additional bucket counts all longer timings.
+HISTOGRAM_BOUNDS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 1e-1)
+
+
+class LatencyHistogram(object):
+    """Histogram counting timings in the buckets given by HISTOGRAM_BOUNDS."""
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, elapsed):
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS, elapsed)] += 1
+        self.count += 1
+        self.total += elapsed
+
+    def merge(self, other):
+        for index, count in enumerate(other.buckets):
+            self.buckets[index] += count
+        self.count += other.count
+        self.total += other.total
+
+    def to_dict(self):
+        return {"buckets": list(self.buckets), "count": self.count, "total": self.total}
+
+
+class _MatcherMetrics(object):
+    __slots__ = ("calls", "passes", "failures", "rejections", "matches_histogram", "describe_histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.passes = 0
+        self.failures = 0
+        self.rejections = 0
+        self.matches_histogram = LatencyHistogram()
+        self.describe_histogram = LatencyHistogram()
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.passes += other.passes
+        self.failures += other.failures
+        self.rejections += other.rejections
+        self.matches_histogram.merge(other.matches_histogram)
+        self.describe_histogram.merge(other.describe_histogram)
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "passes": self.passes,
+            "failures": self.failures,
+            "rejections": self.rejections,
+            "matches_seconds": self.matches_histogram.to_dict(),
+            "describe_seconds": self.describe_histogram.to_dict(),
+        }
+
+
+def _merge_metrics(target, metrics):
+    """Adds the given metrics keyed by (matcher name, matcher class name) to target."""
+    for key, matcher_metrics in list(metrics.items()):
+        if key not in target:
+            target[key] = _MatcherMetrics()
+        target[key].merge(matcher_metrics)
+
+
+class _Generation(object):
+    """
+    Metrics recorded since the last reset: the metrics of the threads still running, keyed by a thread number, and
+    the merged metrics of the threads that have exited.
+    """
+    __slots__ = ("running", "exited")
+
+    def __init__(self):
+        self.running = {}
+        self.exited = {}
+
+    def register(self, owner, metrics):
+        """Adds the metrics of a thread and merges them into the exited metrics once owner has been collected."""
+        number = next(_THREAD_NUMBERS)
+
+        def exit_thread(reference):
+            with _METRICS_LOCK:
+                _, metrics = self.running.pop(number)
+                _merge_metrics(self.exited, metrics)
+
+        with _METRICS_LOCK:
+            self.running[number] = (weakref.ref(owner, exit_thread), metrics)
+
+
+class _Owner(object):
+    """Object referenced by the thread local metrics only, so it is collected when its thread exits."""
+    __slots__ = ("__weakref__",)
+
+
+class _ThreadMetrics(threading.local):
+    """Metrics of the current thread, keyed by (matcher name, matcher class name)."""
+
+    def __init__(self, generation):
+        self.metrics = {}
+        self.owner = _Owner()
+        generation.register(self.owner, self.metrics)
+
+
+_METRICS_LOCK = threading.RLock()
+_THREAD_NUMBERS = itertools.count()
+_GENERATION = _Generation()
+_LOCAL_METRICS = _ThreadMetrics(_GENERATION)
+
+
+def _matcher_metrics(matcher_name, matcher):
+    matcher = getattr(matcher, "_target_matcher", matcher)
+    key = (matcher_name, "%s.%s" % (matcher.__class__.__module__, matcher.__class__.__name__))
+    metrics = _LOCAL_METRICS.metrics
+    try:
+        return metrics[key]
+    except KeyError:
+        metrics[key] = _MatcherMetrics()
+        return metrics[key]
+
+
+class _MetricsObserver(object):
+    """Observer recording the evaluated matchers into the metrics of the current thread."""
+    __slots__ = ()
+
+    def before(self, matcher_name, matcher_factory, matcher, actual):
+        pass
+
+    def after(self, matcher_name, matcher_factory, matcher, actual, outcome, elapsed):
+        metrics = _matcher_metrics(matcher_name, matcher)
+        metrics.calls += 1
+        if outcome is REJECTED:
+            metrics.rejections += 1
+            return
+        if outcome is PASSED:
+            metrics.passes += 1
+        else:
+            metrics.failures += 1
+        metrics.matches_histogram.record(elapsed)
+
+    def described(self, matcher_name, matcher, actual, elapsed):
+        _matcher_metrics(matcher_name, matcher).describe_histogram.record(elapsed)
+
+
+_OBSERVER = _MetricsObserver()
+
+
+def enable_metrics():
+    """Starts recording metrics for every matcher evaluated by assert_that and check_that."""
+    add_observer(_OBSERVER)
+
+
+def disable_metrics():
+    """Stops recording metrics. The metrics recorded so far are kept."""
+    remove_observer(_OBSERVER)
+
+
+def reset_metrics():
+    """Discards the metrics recorded so far by all threads."""
+    global _GENERATION, _LOCAL_METRICS
+    with _METRICS_LOCK:
+        _GENERATION = _Generation()
+    _LOCAL_METRICS = _ThreadMetrics(_GENERATION)
+
+
+def get_metrics():
+    """
+    Returns a snapshot of the metrics of all threads as a dict:
+
+      {"bucket_bounds": [...],
+       "matchers": {matcher_name: {matcher_class: {"calls": ..., "passes": ..., "failures": ..., "rejections": ...,
+                                                   "matches_seconds": histogram, "describe_seconds": histogram}}}}
+
+    Calls count all evaluations of a matcher including rejections. Histograms are dicts holding the number of
+    timings per bucket, the number of timings and their total in seconds; the last bucket counts the timings
+    exceeding the last bound.
+    """
+    merged = {}
+    with _METRICS_LOCK:
+        _merge_metrics(merged, _GENERATION.exited)
+        thread_metrics = [metrics for _, metrics in _GENERATION.running.values()]
+
+    for metrics in thread_metrics:
+        _merge_metrics(merged, metrics)
+
+    matchers = {}
+    for (matcher_name, matcher_class), matcher_metrics in merged.items():
+        matchers.setdefault(matcher_name, {})[matcher_class] = matcher_metrics.to_dict()
+    return {"bucket_bounds": list(HISTOGRAM_BOUNDS), "matchers": matchers}
+
+
+def get_metrics_json(**keyword_arguments):
+    """Returns the snapshot returned by get_metrics as JSON. Keyword arguments are passed to json.dumps."""
+    return json.dumps(get_metrics(), **keyword_arguments)
@@ -19,12 +19,11 @@ from .matcher_registry import Matcher, register_matcher
 
 
 class BaseNumberMatcher(Matcher):
+    accepted_types = (int, float)
+
     def __init__(self, expected):
         self._expected = expected
 
-    def accepts(self, actual):
-        return isinstance(actual, (int, float))
-
 
 @register_matcher("is_less_than")
 @register_matcher("lt")
@@ -64,3 +63,29 @@ class GreaterThanEqualMatcher(BaseNumberMatcher):
 
     def matches(self, actual):
         return actual >= self._expected
+
+
+@register_matcher("is_close_to")
+@register_matcher("is_not_close_to", negated=True)
+class IsCloseToMatcher(BaseNumberMatcher):
+    """
+    Matcher that tests whether the actual number is close to the expected number, using the same tolerances as
+    math.isclose: abs(actual - expected) <= max(rel_tol * max(abs(actual), abs(expected)), abs_tol)
+    """
+
+    def __init__(self, expected, rel_tol=1e-9, abs_tol=0.0):
+        BaseNumberMatcher.__init__(self, expected)
+        self._rel_tol = rel_tol
+        self._abs_tol = abs_tol
+
+    def describe(self, actual):
+        return "Actual '%s' is not close to '%s' (rel_tol=%s, abs_tol=%s)" % (
+            actual, self._expected, self._rel_tol, self._abs_tol)
+
+    def describe_negated(self, actual):
+        return "Actual '%s' is close to '%s' (rel_tol=%s, abs_tol=%s)" % (
+            actual, self._expected, self._rel_tol, self._abs_tol)
+
+    def matches(self, actual):
+        tolerance = max(self._rel_tol * max(abs(actual), abs(self._expected)), self._abs_tol)
+        return abs(actual - self._expected) <= tolerance
@@ -13,6 +13,10 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import re
+
+from .diff import describe_difference
+from .formatting import format_value
 from .matcher_registry import Matcher, register_matcher
 
 __author__ = "Alexander Metzner"
@@ -29,14 +33,164 @@ class BaseMatcher(Matcher):
 @register_matcher("is_equal_to")
 @register_matcher("is_not_equal_to", negated=True)
 class EqualsMatcher(BaseMatcher):
-    """Matcher that tests whether two object are equal, i.e. actual == expected"""
+    """
+    Matcher that tests whether two object are equal, i.e. actual == expected. Failures comparing long or multi line
+    texts, lists or tuples include a bounded diff.
+    """
 
     def matches(self, actual):
         return self._expected == actual
 
     def describe(self, actual):
-        return "Actual '%s' does not equal expected '%s'" % (actual,
-                                                             self._expected)
+        description = self._describe_values(actual)
+        difference = describe_difference(actual, self._expected)
+        if difference is None:
+            return description
+        return "%s\n%s" % (description, difference)
+
+    def describe_negated(self, actual):
+        return "NOT: %s" % self._describe_values(actual)
+
+    def _describe_values(self, actual):
+        return "Actual '%s' does not equal expected '%s'" % (format_value(actual), format_value(self._expected))
+
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_MISSING = object()
+
+
+class _Length(int):
+    """Marks the lengths of sequences of different length in a Difference."""
+
+
+class _Index(int):
+    """Marks list and tuple indices in paths."""
+
+
+class Difference(object):
+    """A difference found by deep_differences at the given path. actual or expected is _MISSING for missing keys."""
+    __slots__ = ("path", "actual", "expected")
+
+    def __init__(self, path, actual, expected):
+        self.path = path
+        self.actual = actual
+        self.expected = expected
+
+    def describe(self):
+        path = format_value(_render_path(self.path))
+        if self.expected is _MISSING:
+            return "%s: unexpected key with value '%s'" % (path, format_value(self.actual))
+        if self.actual is _MISSING:
+            return "%s: missing key with expected value '%s'" % (path, format_value(self.expected))
+        if isinstance(self.actual, _Length):
+            return "%s: length %d differs from expected length %d" % (path, self.actual, self.expected)
+        return "%s: '%s' differs from expected '%s'" % (path, format_value(self.actual), format_value(self.expected))
+
+
+def deep_differences(actual, expected, max_differences=1):
+    """
+    Compares actual and expected structurally and returns a list of at most max_differences Differences. Dicts are
+    compared key by key and lists and tuples element by element; all other values are compared using ==.
+
+    The structures are walked iteratively, so deeply nested values do not exhaust the stack. Every pair of
+    containers is compared only once: shared substructures are not walked again and cycles terminate.
+    """
+    differences = []
+    compared = set()
+    pending = [(actual, expected, None)]
+    while pending:
+        actual, expected, path = pending.pop()
+        if actual is expected:
+            continue
+
+        if isinstance(actual, dict) and isinstance(expected, dict):
+            kind = dict
+        elif isinstance(actual, list) and isinstance(expected, list):
+            kind = list
+        elif isinstance(actual, tuple) and isinstance(expected, tuple):
+            kind = tuple
+        else:
+            if not actual == expected:
+                differences.append(Difference(path, actual, expected))
+            if len(differences) >= max_differences:
+                break
+            continue
+
+        pair = (id(actual), id(expected))
+        if pair in compared:
+            continue
+        compared.add(pair)
+
+        children = []
+        if kind is dict:
+            for key, value in expected.items():
+                if key in actual:
+                    children.append((actual[key], value, (path, key)))
+                else:
+                    differences.append(Difference((path, key), _MISSING, value))
+            for key, value in actual.items():
+                if key not in expected:
+                    differences.append(Difference((path, key), value, _MISSING))
+        else:
+            if len(actual) != len(expected):
+                differences.append(Difference(path, _Length(len(actual)), _Length(len(expected))))
+            for index in range(min(len(actual), len(expected))):
+                children.append((actual[index], expected[index], (path, _Index(index))))
+
+        if len(differences) >= max_differences:
+            break
+        children.reverse()
+        pending.extend(children)
+
+    return differences[:max_differences]
+
+
+def _render_path(path):
+    components = []
+    while path is not None:
+        path, component = path
+        components.append(component)
+    if not components:
+        return "<root>"
+
+    rendered = []
+    for component in reversed(components):
+        if isinstance(component, _Index):
+            rendered.append("[%d]" % component)
+        elif isinstance(component, str) and _IDENTIFIER.match(component):
+            rendered.append(".%s" % component if rendered else component)
+        else:
+            rendered.append("[%r]" % (component,))
+    return "".join(rendered)
+
+
+@register_matcher("deeply_equals")
+class DeeplyEqualsMatcher(BaseMatcher):
+    """
+    Matcher that compares nested dicts, lists and tuples structurally and reports the paths of the differences, e.g.
+    data.items[1042].price. Stops at the first difference unless max_differences allows collecting more.
+
+    Examples
+
+    assert_that(response).deeply_equals(expected_response)
+    assert_that(response).deeply_equals(expected_response, max_differences=10)
+    """
+
+    def __init__(self, expected, max_differences=1):
+        BaseMatcher.__init__(self, expected)
+        self._max_differences = max_differences
+        self._differences = None
+
+    def matches(self, actual):
+        self._differences = deep_differences(actual, self._expected, self._max_differences)
+        return not self._differences
+
+    def describe(self, actual):
+        if self._differences is None:
+            self.matches(actual)
+        return "Actual '%s' does not deeply equal expected '%s':\n%s" % (
+            format_value(actual), format_value(self._expected),
+            "\n".join("  " + difference.describe() for difference in self._differences))
 
 
 @register_matcher("is_identical_to")
@@ -48,7 +202,7 @@ class IsMatcher(BaseMatcher):
         return self._expected is actual
 
     def describe(self, actual):
-        return "Actual '%s' is not '%s'" % (actual, self._expected)
+        return "Actual '%s' is not '%s'" % (format_value(actual), format_value(self._expected))
 
 
 @register_matcher("is_a")
@@ -66,7 +220,7 @@ class IsTypeMatcher(BaseMatcher):
         return self._expected is actual.__class__
 
     def describe(self, actual):
-        return "'%s' of type %s is not of expected type %s" % (actual,
+        return "'%s' of type %s is not of expected type %s" % (format_value(actual),
                                                                actual.__class__,
                                                                self._expected)
 
@@ -77,7 +231,7 @@ class IsTrueMatcher(Matcher):
         return bool(actual)
 
     def describe(self, actual):
-        return "Actual '%s' is not True" % actual
+        return "Actual '%s' is not True" % format_value(actual)
 
 
 @register_matcher("is_false")
@@ -86,7 +240,7 @@ class IsFalseMatcher(Matcher):
         return not bool(actual)
 
     def describe(self, actual):
-        return "Actual '%s' is not False" % actual
+        return "Actual '%s' is not False" % format_value(actual)
 
 
 @register_matcher("is_none")
@@ -96,7 +250,7 @@ class NoneMatcher(Matcher):
         return actual is None
 
     def describe(self, actual):
-        return "Actual '%s' is not None" % actual
+        return "Actual '%s' is not None" % format_value(actual)
 
 
 @register_matcher("is_instance_of")
@@ -107,4 +261,4 @@ class InstanceOfMatcher(BaseMatcher):
         return isinstance(actual, self._expected)
 
     def describe(self, actual):
-        return "Actual '%s' is not an instance of %s" % (actual, self._expected.__name__)
+        return "Actual '%s' is not an instance of %s" % (format_value(actual), self._expected.__name__)
@@ -0,0 +1,96 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides soft assertions: within a soft_assertions block failing assertions are collected instead of raised and
+reported together when the block is left.
+
+  with soft_assertions():
+      assert_that(response.status).is_equal_to(200)
+      assert_that(response.body).contains('spam').and_ends_with('eggs')
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "SoftAssertionError",
+    "soft_assertions"
+]
+
+from .assertionhandler import _SOFT_ASSERTIONS
+
+
+class SoftAssertionCollector(object):
+    """
+    Buffer of the failures recorded within a soft_assertions block. When max_failures is given, only the first
+    max_failures failures are kept while all failures are counted.
+    """
+    __slots__ = ("failures", "count", "max_failures")
+
+    def __init__(self, max_failures=None):
+        self.failures = []
+        self.count = 0
+        self.max_failures = max_failures
+
+    def record(self, failure):
+        self.count += 1
+        if self.max_failures is None or len(self.failures) < self.max_failures:
+            self.failures.append(failure)
+
+
+class SoftAssertionError(AssertionError):
+    """Raised when leaving a soft_assertions block in which at least one assertion failed."""
+
+    def __init__(self, failures, count):
+        AssertionError.__init__(self, failures, count)
+        self.failures = failures
+        self.count = count
+        self._message = None
+
+    def __str__(self):
+        if self._message is None:
+            lines = ["%d assertion(s) failed:" % self.count]
+            for number, failure in enumerate(self.failures):
+                lines.append("  %d) %s" % (number + 1, failure.message))
+            if self.count > len(self.failures):
+                lines.append("  ... and %d more" % (self.count - len(self.failures)))
+            self._message = "\n".join(lines)
+        return self._message
+
+
+class soft_assertions(object):
+    """
+    Context manager collecting the failures of all assertions made in the current thread or asyncio task instead
+    of raising them. Chains continue after a failed link. When the block is left, a single SoftAssertionError
+    describing all failures is raised. Messages are only built when the error is reported.
+
+    The optional max_failures limits the number of failures kept to bound memory in long running blocks;
+    failures beyond the limit are only counted.
+    """
+    __slots__ = ("_collector", "_token")
+
+    def __init__(self, max_failures=None):
+        self._collector = SoftAssertionCollector(max_failures)
+        self._token = None
+
+    def __enter__(self):
+        self._token = _SOFT_ASSERTIONS.set(self._collector)
+        return self._collector
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        _SOFT_ASSERTIONS.reset(self._token)
+        self._token = None
+        if exception_type is None and self._collector.count:
+            raise SoftAssertionError(self._collector.failures, self._collector.count)
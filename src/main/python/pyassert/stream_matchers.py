@@ -0,0 +1,378 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Provides matcher implementations that scan open file objects or files given as path objects without reading them
+into memory at once:
+
+  assert_that(pathlib.Path('server.log')).contains('Server started')
+  assert_that(log_file).matches(r'ERROR \\d+')
+  assert_that(pathlib.Path('server.log')).has_line_count(1000)
+
+Files are read in chunks of CHUNK_SIZE and reading stops as soon as the result is known, so memory use does not
+depend on the size of the file. Paths are opened in binary mode when the expected value is bytes and in text mode
+using the given encoding otherwise. Open file objects are read from their current position and are not closed.
+"""
+
+__author__ = "Alexander Metzner"
+
+__all__ = [
+    "StreamMatcher",
+    "StreamContainsMatcher",
+    "StreamMatchesMatcher",
+    "StreamStartsWithMatcher",
+    "StreamEndsWithMatcher",
+    "LineCountMatcher"
+]
+
+import contextlib
+import io
+import locale
+import os
+import re
+
+from .formatting import format_value, format_values
+from .matcher_registry import Matcher, register_matcher
+from .string_matchers import compile_pattern, _expected_needles, _missing_needles, _needle_pattern
+
+try:
+    _PATH_TYPES = (os.PathLike,)
+except AttributeError:
+    try:
+        from pathlib import PurePath
+        _PATH_TYPES = (PurePath,)
+    except ImportError:
+        _PATH_TYPES = ()
+
+# Number of characters or bytes read from a file at a time.
+CHUNK_SIZE = 1024 * 1024
+# Number of characters or bytes of a line kept by the matches matcher; longer lines are matched by their start only.
+MAX_LINE_LENGTH = 16 * 1024 * 1024
+
+
+class StreamMatcher(Matcher):
+    """
+    Base class for matchers accepting open file objects and paths. Keeps track of the number of characters or bytes
+    read from the actual file since the last call of _start, which matches calls first, as expectations and
+    assert_each reuse matcher instances.
+    """
+
+    accepted_types = (io.IOBase,) + _PATH_TYPES
+
+    def __init__(self, expected, encoding=None):
+        self._expected = expected
+        self._encoding = encoding
+        self._start()
+
+    def _start(self):
+        self._read_count = 0
+
+    @contextlib.contextmanager
+    def _open(self, actual, binary=None):
+        """Yields the given open file or the file of the given path opened in binary or text mode."""
+        if isinstance(actual, io.IOBase):
+            yield actual
+            return
+        if binary is None:
+            binary = isinstance(self._expected, bytes)
+        if binary:
+            stream = io.open(_path(actual), "rb")
+        else:
+            stream = io.open(_path(actual), "r", encoding=self._encoding)
+        try:
+            yield stream
+        finally:
+            stream.close()
+
+    def _chunks(self, stream):
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            self._read_count += len(chunk)
+            yield chunk
+
+    def _describe_actual(self, actual):
+        if isinstance(actual, io.IOBase):
+            return "file '%s'" % format_value(getattr(actual, "name", actual))
+        return "file '%s'" % format_value(_path(actual))
+
+
+def _path(path):
+    return os.fspath(path) if hasattr(os, "fspath") else str(path)
+
+
+@register_matcher("contains")
+@register_matcher("does_not_contain", negated=True)
+class StreamContainsMatcher(StreamMatcher):
+    """
+    Tests whether the actual file contains the expected string, any_of or all of the expected strings. Occurrences
+    spanning two chunks are found by searching the end of the previous chunk, one character or byte shorter than the
+    longest expected string, together with the next one.
+    """
+
+    def _start(self):
+        StreamMatcher._start(self)
+        self._offset = None
+        self._found = None
+        self._missing = None
+        self._binary = False
+
+    def matches(self, actual):
+        self._start()
+        needles, requires_all = self._needles()
+        self._missing = list(needles)
+        if not needles:
+            return requires_all
+        overlap = max(len(needle) for needle in needles) - 1
+        self._binary = isinstance(needles[0], bytes)
+        tail = needles[0][:0]
+        with self._open(actual, binary=self._binary) as stream:
+            for chunk in self._chunks(stream):
+                window = tail + chunk
+                if self._search(window, self._read_count - len(window), requires_all):
+                    return True
+                tail = window[max(len(window) - overlap, 0):] if overlap else window[:0]
+        # an empty file still contains the empty string
+        return self._search(tail, self._read_count - len(tail), requires_all)
+
+    def _needles(self):
+        needles, requires_all = _expected_needles(self._expected)
+        return ((self._expected,) if needles is None else needles), requires_all
+
+    def _search(self, window, window_offset, requires_all):
+        if requires_all:
+            self._missing = _missing_needles(window, self._missing)
+            return not self._missing
+        match = _needle_pattern(self._missing).search(window)
+        if match is None:
+            return False
+        self._offset = window_offset + match.start()
+        self._found = match.group(0)
+        return True
+
+    def describe(self, actual):
+        needles, requires_all = _expected_needles(self._expected)
+        unit = "bytes" if self._binary else "characters"
+        if needles is None:
+            return "Actual %s does not contain '%s' (%d %s read)" % (
+                self._describe_actual(actual), format_value(self._expected), self._read_count, unit)
+        if not requires_all:
+            return "Actual %s does not contain any of '%s' (%d %s read)" % (
+                self._describe_actual(actual), format_values(needles), self._read_count, unit)
+        return "Actual %s does not contain all of '%s', missing '%s' (%d %s read)" % (
+            self._describe_actual(actual), format_values(needles), format_values(self._missing or ()),
+            self._read_count, unit)
+
+    def describe_negated(self, actual):
+        needles, requires_all = self._needles()
+        if requires_all:
+            return "Actual %s contains all of '%s'" % (self._describe_actual(actual), format_values(needles))
+        return "Actual %s contains '%s' at offset %d" % (self._describe_actual(actual),
+                                                         format_value(self._found), self._offset or 0)
+
+
+@register_matcher("matches")
+@register_matcher("does_not_match", negated=True)
+class StreamMatchesMatcher(StreamMatcher):
+    """
+    Tests whether the start of any line of the actual file matches the expected regular expression. The file is read
+    in chunks cut at line ends. Chunks are searched for the expression anywhere, in multi line mode, and only the
+    lines containing such a match are matched from their start. Lines longer than MAX_LINE_LENGTH are matched as if
+    they ended after their first MAX_LINE_LENGTH characters or bytes, so memory use stays bounded for files without
+    line ends.
+    """
+
+    def __init__(self, expected, flags=0, encoding=None):
+        self._pattern = compile_pattern(expected, flags)
+        StreamMatcher.__init__(self, expected, encoding)
+
+    def _start(self):
+        StreamMatcher._start(self)
+        self._line_count = 0
+        self._line = None
+
+    def matches(self, actual):
+        self._start()
+        pattern = self._pattern.pattern
+        binary = isinstance(pattern, bytes)
+        newline = b"\n" if binary else "\n"
+
+        candidates = compile_pattern(pattern, self._pattern.flags | re.MULTILINE)
+
+        rest = pattern[:0]
+        skipping = False
+        with self._open(actual, binary=binary) as stream:
+            for chunk in self._chunks(stream):
+                if skipping:
+                    # the rest of an overlong line has already been matched
+                    index = chunk.find(newline)
+                    if index < 0:
+                        continue
+                    chunk = chunk[index + 1:]
+                    skipping = False
+                lines = rest + chunk
+                end = lines.rfind(newline) + 1
+                rest = lines[end:]
+                if end and self._search(lines[:end], candidates, newline):
+                    return True
+                if len(rest) > MAX_LINE_LENGTH:
+                    if self._search(rest[:MAX_LINE_LENGTH], candidates, newline):
+                        return True
+                    rest = rest[:0]
+                    skipping = True
+        return bool(rest) and self._search(rest, candidates, newline)
+
+    def _search(self, lines, candidates, newline):
+        position = 0
+        while True:
+            candidate = candidates.search(lines, position)
+            if candidate is None:
+                self._line_count += lines.count(newline) + (not lines.endswith(newline))
+                return False
+            start = lines.rfind(newline, position, candidate.start()) + 1 or position
+            end = lines.find(newline, candidate.start()) + 1 or len(lines)
+            if self._pattern.match(lines[start:end]):
+                self._line_count += lines.count(newline, 0, start) + 1
+                self._line = lines[start:end]
+                return True
+            position = end
+
+    def describe(self, actual):
+        return "No line of actual %s matches '%s' (%d lines read)" % (
+            self._describe_actual(actual), format_value(self._pattern.pattern), self._line_count)
+
+    def describe_negated(self, actual):
+        return "Line %d of actual %s matches '%s': '%s'" % (self._line_count, self._describe_actual(actual),
+                                                            format_value(self._pattern.pattern),
+                                                            format_value(self._line))
+
+
+@register_matcher("starts_with")
+@register_matcher("does_not_start_with", negated=True)
+class StreamStartsWithMatcher(StreamMatcher):
+    """Tests whether the actual file starts with the expected string, reading no more than its length."""
+
+    def _start(self):
+        StreamMatcher._start(self)
+        self._head = None
+
+    def matches(self, actual):
+        self._start()
+        with self._open(actual) as stream:
+            self._head = stream.read(len(self._expected))
+        return self._head == self._expected
+
+    def describe(self, actual):
+        return "Actual %s starts with '%s' instead of '%s'" % (self._describe_actual(actual),
+                                                               format_value(self._head),
+                                                               format_value(self._expected))
+
+    def describe_negated(self, actual):
+        return "Actual %s starts with '%s'" % (self._describe_actual(actual), format_value(self._expected))
+
+
+@register_matcher("ends_with")
+@register_matcher("does_not_end_with", negated=True)
+class StreamEndsWithMatcher(StreamMatcher):
+    """
+    Tests whether the actual file ends with the expected string. Paths and seekable binary files are read from the
+    position of the expected end only; text file objects are read to their end keeping only the last characters.
+    The end of a path read for a string is decoded and its line ends are translated as text mode would.
+    """
+
+    def _start(self):
+        StreamMatcher._start(self)
+        self._end = None
+
+    def matches(self, actual):
+        self._start()
+        expected = self._expected
+        if isinstance(actual, io.IOBase):
+            if isinstance(actual, io.TextIOBase) or not actual.seekable():
+                self._end = self._read_end(actual, len(expected))
+            else:
+                self._end = self._seek_end(actual, len(expected))
+            return self._end == expected
+
+        if isinstance(expected, bytes):
+            with self._open(actual, binary=True) as stream:
+                self._end = self._seek_end(stream, len(expected))
+            return self._end == expected
+
+        encoding = self._encoding or locale.getpreferredencoding(False)
+        # each line end of the expected string may be a carriage return and line feed in the file
+        length = len(expected.encode(encoding)) + expected.count("\n") * len("\r".encode(encoding))
+        with self._open(actual, binary=True) as stream:
+            end = self._seek_end(stream, length).decode(encoding, "replace")
+        end = end.replace("\r\n", "\n").replace("\r", "\n")
+        self._end = end[max(len(end) - len(expected), 0):]
+        return self._end == expected
+
+    def _seek_end(self, stream, length):
+        start = stream.tell()
+        end = stream.seek(0, io.SEEK_END)
+        stream.seek(max(end - length, start))
+        end = stream.read()
+        self._read_count += len(end)
+        return end
+
+    def _read_end(self, stream, length):
+        end = None
+        for chunk in self._chunks(stream):
+            end = chunk if end is None or len(chunk) >= length else end + chunk
+            end = end[len(end) - length:] if length else end[:0]
+        return stream.read() if end is None else end
+
+    def describe(self, actual):
+        return "Actual %s ends with '%s' instead of '%s'" % (self._describe_actual(actual), format_value(self._end),
+                                                             format_value(self._expected))
+
+    def describe_negated(self, actual):
+        return "Actual %s ends with '%s'" % (self._describe_actual(actual), format_value(self._expected))
+
+
+@register_matcher("has_line_count")
+class LineCountMatcher(StreamMatcher):
+    """
+    Tests whether the actual file has the expected number of lines. A last line not terminated by a newline counts
+    as line. Reading stops once more lines than expected have been counted.
+    """
+
+    def __init__(self, expected_count, encoding=None):
+        StreamMatcher.__init__(self, expected_count, encoding)
+
+    def _start(self):
+        StreamMatcher._start(self)
+        self._line_count = 0
+
+    def matches(self, actual):
+        self._start()
+        with self._open(actual, binary=True) as stream:
+            last = None
+            for chunk in self._chunks(stream):
+                self._line_count += chunk.count(b"\n" if isinstance(chunk, bytes) else "\n")
+                last = chunk[-1:]
+                if self._line_count > self._expected:
+                    return False
+            if last and last not in (b"\n", "\n"):
+                self._line_count += 1
+        return self._line_count == self._expected
+
+    def describe(self, actual):
+        if self._line_count > self._expected:
+            return "Actual %s has more than %d lines" % (self._describe_actual(actual), self._expected)
+        return "Actual %s has %d lines but expected %d" % (self._describe_actual(actual), self._line_count,
+                                                           self._expected)
@@ -16,20 +16,34 @@
 import re
 import six
 
+from .cache import LRUCache
+from .formatting import format_value, format_values, get_format_limits
 from .matcher_registry import Matcher, register_matcher
 
 __author__ = 'Alexander Metzner'
 
 __all__ = [
-    "ContainsMatcher"
+    "StringMatcher",
+    "StringMatcherWithArgument",
+    "ContainsMatcher",
+    "clear_pattern_cache",
+    "compile_pattern",
+    "get_pattern_cache_stats"
 ]
 
+# Number of occurrences of expected strings listed in failure messages.
+MAX_REPORTED_HITS = 10
+# Number of compiled regular expressions kept by compile_pattern.
+PATTERN_CACHE_SIZE = 256
+
+_PATTERN_CACHE = LRUCache(PATTERN_CACHE_SIZE)
+_PATTERN_TYPES = six.string_types + (bytes,)
+
 
 class StringMatcher(Matcher):
     """Base class for matchers accepting string values."""
 
-    def accepts(self, actual):
-        return isinstance(actual, six.string_types)
+    accepted_types = six.string_types
 
 
 class StringMatcherWithArgument(StringMatcher):
@@ -42,29 +56,206 @@ class StringMatcherWithArgument(StringMatcher):
 @register_matcher("contains")
 @register_matcher("does_not_contain", negated=True)
 class ContainsMatcher(StringMatcherWithArgument):
-    """Tests whether the actual string contains the expected string."""
+    """
+    Tests whether the actual string contains the expected string, any_of or all of the expected strings. Expected
+    strings are searched for in a single pass over the actual string using a compiled alternation of them.
+    """
 
     def matches(self, actual):
-        return self._expected in actual
+        needles, requires_all = _expected_needles(self._expected)
+        if needles is None:
+            return self._expected in actual
+        if not requires_all:
+            return _needle_pattern(needles).search(actual) is not None
+        return not _missing_needles(actual, needles)
 
     def describe(self, actual):
-        return "Actual '%s' does not contain '%s'" % (actual, self._expected)
+        needles, requires_all = _expected_needles(self._expected)
+        if needles is None:
+            return "Actual '%s' does not contain '%s'" % (format_value(actual), format_value(self._expected))
+        if not requires_all:
+            return "Actual '%s' does not contain any of '%s'" % (format_value(actual), format_values(needles))
 
+        return "Actual '%s' does not contain all of '%s', missing '%s'" % (
+            format_value(actual), format_values(needles), format_values(_missing_needles(actual, needles)))
 
-@register_matcher("matches")
-@register_matcher("does_not_match", negated=True)
-class MatchesMatcher(StringMatcherWithArgument):
-    """Tests whether the actual string matches the expected regular expression."""
+    def describe_negated(self, actual):
+        needles, _ = _expected_needles(self._expected)
+        if needles is None:
+            needles = (self._expected,)
 
-    def __init__(self, expected):
+        hits = []
+        count = 0
+        for match in _needle_pattern(needles, overlapping=True).finditer(actual):
+            count += 1
+            if len(hits) < MAX_REPORTED_HITS:
+                hits.append("'%s' at %d" % (format_value(match.group(1)), match.start()))
+        if count > len(hits):
+            hits.append("and %d more" % (count - len(hits)))
+        return "Actual '%s' contains %s" % (format_value(actual), ", ".join(hits))
+
+
+def _expected_needles(expected):
+    """Returns the expected strings of any_of or all and whether all of them are required, or None for a string."""
+    if not isinstance(expected, Matcher):
+        return None, False
+    from .list_matchers import AllContainsMatcher
+    return tuple(expected.expected), isinstance(expected, AllContainsMatcher)
+
+
+def _needle_pattern(needles, overlapping=False):
+    """
+    Returns the compiled alternation of the given strings, longest first, so the longest string occurring at an offset
+    is matched. When overlapping is True, the alternation is matched within a lookahead as group 1, so occurrences
+    starting within another occurrence are found as well.
+    """
+    needles = sorted(needles, key=len, reverse=True)
+    separator = b"|" if needles and isinstance(needles[0], bytes) else "|"
+    alternation = separator.join(re.escape(needle) for needle in needles)
+    return compile_pattern("(?=(%s))" % alternation if overlapping else alternation)
+
+
+def _missing_needles(actual, needles):
+    """
+    Returns the given strings not contained in actual. Each search resumes at the offset of the previous match with
+    the strings not found yet, none of which occurs before that offset.
+    """
+    missing = list(needles)
+    offset = 0
+    while missing:
+        match = _needle_pattern(missing).search(actual, offset)
+        if match is None:
+            break
+        missing = [needle for needle in missing if needle != match.group(0)]
+        offset = match.start()
+    return missing
+
+
+def compile_pattern(pattern, flags=0):
+    """
+    Returns the compiled regular expression for the given pattern and flags. Compiled expressions are kept in a
+    bounded LRU cache shared by all regular expression matchers. Compiled patterns are returned unchanged.
+    """
+    if not isinstance(pattern, _PATTERN_TYPES):
+        return pattern
+    return _PATTERN_CACHE.get((pattern, flags), _compile)
+
+
+def _compile(key):
+    return re.compile(*key)
+
+
+def get_pattern_cache_stats():
+    """Returns a dict holding the hits, misses, size and max_size of the cache used by compile_pattern."""
+    return _PATTERN_CACHE.stats()
+
+
+def clear_pattern_cache():
+    """Discards all regular expressions compiled by compile_pattern and resets the statistics."""
+    _PATTERN_CACHE.clear()
+
+
+class RegexMatcher(StringMatcherWithArgument):
+    """
+    Base class for matchers applying a regular expression to the actual value. Besides strings, bytes, bytearrays and
+    memoryviews are accepted; they are matched in place without being copied.
+    """
+
+    accepted_types = six.string_types + (bytes, bytearray, memoryview)
+
+    def __init__(self, expected, flags=0):
         StringMatcherWithArgument.__init__(self, expected)
-        self._pattern = re.compile(expected)
+        self._pattern = compile_pattern(expected, flags)
+
+    def _describe_pattern(self):
+        return "'%s'" % format_value(getattr(self._expected, "pattern", self._expected))
+
+
+def _format_subject(actual):
+    """Formats the actual value; only the part of a memoryview that is going to be shown is copied."""
+    if isinstance(actual, memoryview):
+        max_length = get_format_limits()["max_length"]
+        if actual.nbytes > max_length:
+            return "%s... (memoryview of %d bytes)" % (format_value(actual[:max_length].tobytes()), actual.nbytes)
+        return format_value(actual.tobytes())
+    return format_value(actual)
+
+
+@register_matcher("matches")
+@register_matcher("does_not_match", negated=True)
+class MatchesMatcher(RegexMatcher):
+    """Tests whether the start of the actual string matches the expected regular expression."""
 
     def matches(self, actual):
         return True if self._pattern.match(actual) else False
 
     def describe(self, actual):
-        return "Actual '%s' does not match '%s'" % (actual, self._expected)
+        return "Actual '%s' does not match %s" % (_format_subject(actual), self._describe_pattern())
+
+
+@register_matcher("contains_match")
+@register_matcher("does_not_contain_match", negated=True)
+class ContainsMatchMatcher(RegexMatcher):
+    """Tests whether the expected regular expression matches anywhere in the actual string."""
+
+    def matches(self, actual):
+        return True if self._pattern.search(actual) else False
+
+    def describe(self, actual):
+        return "Actual '%s' does not contain a match of %s" % (_format_subject(actual), self._describe_pattern())
+
+    def describe_negated(self, actual):
+        match = self._pattern.search(actual)
+        return "Actual '%s' contains a match of %s at %d: '%s'" % (_format_subject(actual), self._describe_pattern(),
+                                                                   match.start(), format_value(match.group(0)))
+
+
+@register_matcher("fully_matches")
+@register_matcher("does_not_fully_match", negated=True)
+class FullyMatchesMatcher(RegexMatcher):
+    """Tests whether the expected regular expression matches the whole actual string."""
+
+    def matches(self, actual):
+        fullmatch = getattr(self._pattern, "fullmatch", None)
+        if fullmatch is None:
+            match = self._pattern.match(actual)
+            return match is not None and match.end() == len(actual)
+        return True if fullmatch(actual) else False
+
+    def describe(self, actual):
+        return "Actual '%s' does not fully match %s" % (_format_subject(actual), self._describe_pattern())
+
+
+@register_matcher("has_n_matches")
+class MatchCountMatcher(RegexMatcher):
+    r"""
+    Tests whether the expected regular expression matches the actual string exactly the expected number of times
+    without overlapping. Stops searching once one more match than expected has been found.
+
+    Examples
+
+    assert_that(log).has_n_matches(r"ERROR \d+", 2)
+    """
+
+    def __init__(self, expected, count, flags=0):
+        RegexMatcher.__init__(self, expected, flags)
+        self._count = count
+        self._found = None
+
+    def matches(self, actual):
+        self._found = 0
+        for _ in self._pattern.finditer(actual):
+            self._found += 1
+            if self._found > self._count:
+                break
+        return self._found == self._count
+
+    def describe(self, actual):
+        if self._found is None:
+            self.matches(actual)
+        found = "more than %d" % self._count if self._found > self._count else "%d" % self._found
+        return "Actual '%s' has %s matches of %s but expected %d" % (
+            _format_subject(actual), found, self._describe_pattern(), self._count)
 
 
 @register_matcher("starts_with")
@@ -76,7 +267,7 @@ class StartsWithMatcher(StringMatcherWithArgument):
         return actual.startswith(self._expected)
 
     def describe(self, actual):
-        return "Actual '%s' does not start with '%s'" % (actual, self._expected)
+        return "Actual '%s' does not start with '%s'" % (format_value(actual), format_value(self._expected))
 
 
 @register_matcher("ends_with")
@@ -88,4 +279,4 @@ class EndsWithMatcher(StringMatcherWithArgument):
         return actual.endswith(self._expected)
 
     def describe(self, actual):
-        return "Actual '%s' does not end with '%s'" % (actual, self._expected)
+        return "Actual '%s' does not end with '%s'" % (format_value(actual), format_value(self._expected))
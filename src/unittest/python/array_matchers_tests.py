@@ -0,0 +1,96 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyassert import assert_that
+from pyassert.array_matchers import ArrayEqualsMatcher, ArrayGreaterThanEqualMatcher, ArrayIsCloseToMatcher, \
+    ArrayLessThanMatcher
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class ArrayComparisonMatcherTest(unittest.TestCase):
+    def test_should_accept_arrays(self):
+        self.assertTrue(ArrayLessThanMatcher(1).accepts(numpy.zeros(3)))
+
+    def test_should_not_accept_lists(self):
+        self.assertFalse(ArrayLessThanMatcher(1).accepts([0, 0, 0]))
+
+    def test_should_match_when_all_elements_are_less(self):
+        self.assertTrue(ArrayLessThanMatcher(3).matches(numpy.arange(3)))
+
+    def test_should_not_match_when_any_element_is_not_less(self):
+        self.assertFalse(ArrayLessThanMatcher(2).matches(numpy.arange(3)))
+
+    def test_should_compare_element_wise_with_expected_array(self):
+        self.assertTrue(ArrayLessThanMatcher(numpy.array([1, 2, 3])).matches(numpy.array([0, 1, 2])))
+
+    def test_describe_should_report_count_indices_and_worst_offender(self):
+        self.assertEquals("Actual array of shape (6,) is not less than '2': 4 of 6 elements violate, first at "
+                          "[2, 3, 4, 5], worst at 5: 5 (expected 2)", ArrayLessThanMatcher(2).describe(numpy.arange(6)))
+
+    def test_describe_should_report_multi_dimensional_indices(self):
+        actual = numpy.array([[0.0, 1.0], [-3.0, -1.0]])
+
+        self.assertEquals("Actual array of shape (2, 2) is not greater than or equal to '0': 2 of 4 elements violate, "
+                          "first at [(1, 0), (1, 1)], worst at (1, 0): -3.0 (expected 0)",
+                          ArrayGreaterThanEqualMatcher(0).describe(actual))
+
+    def test_should_not_match_nan(self):
+        self.assertFalse(ArrayGreaterThanEqualMatcher(0).matches(numpy.array([1.0, numpy.nan])))
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class ArrayEqualsMatcherTest(unittest.TestCase):
+    def test_should_match_equal_arrays(self):
+        self.assertTrue(ArrayEqualsMatcher(numpy.arange(5)).matches(numpy.arange(5)))
+
+    def test_should_not_match_arrays_of_incompatible_shape(self):
+        self.assertFalse(ArrayEqualsMatcher(numpy.arange(3)).matches(numpy.arange(5)))
+
+    def test_describe_incompatible_shape(self):
+        self.assertEquals("Actual array of shape (5,) is not equal to expected array of shape (3,): shape (3,) cannot "
+                          "be broadcast to the actual shape",
+                          ArrayEqualsMatcher(numpy.arange(3)).describe(numpy.arange(5)))
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class ArrayIsCloseToMatcherTest(unittest.TestCase):
+    def test_should_match_within_relative_tolerance(self):
+        self.assertTrue(ArrayIsCloseToMatcher(numpy.ones(3), rel_tol=1e-3).matches(numpy.ones(3) * 1.0001))
+
+    def test_should_not_match_outside_relative_tolerance(self):
+        self.assertFalse(ArrayIsCloseToMatcher(numpy.ones(3), rel_tol=1e-5).matches(numpy.ones(3) * 1.0001))
+
+    def test_should_match_within_absolute_tolerance(self):
+        self.assertTrue(ArrayIsCloseToMatcher(0.0, abs_tol=1e-6).matches(numpy.array([1e-7, -1e-7])))
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class ArrayAssertionTest(unittest.TestCase):
+    def test_should_dispatch_arrays_to_array_matchers(self):
+        actual = numpy.arange(100.0)
+
+        assert_that(actual).is_less_than(100).and_ge(0).and_equals(actual.copy()).and_is_close_to(actual + 1e-12,
+                                                                                                  abs_tol=1e-9)
+        assert_that(actual).is_not_equal_to(numpy.zeros(100))
+
+    def test_should_keep_dispatching_numbers_to_number_matchers(self):
+        assert_that(7).is_less_than(8).and_is_equal_to(7)
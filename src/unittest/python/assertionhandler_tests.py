@@ -0,0 +1,160 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import unittest
+
+from pyassert import Matcher, registry_scope
+from pyassert.assertionhandler import AssertionHandler, InvalidUsageException, MatcherAttribute, \
+    NoOpAssertionHandler, assert_that, check_that, disable_assertions, enable_assertions, sample_assertions
+
+
+class AssertionHandlerTest(unittest.TestCase):
+    def test_should_not_have_instance_dict(self):
+        self.assertRaises(AttributeError, setattr, assert_that("spam"), "spam", "eggs")
+
+    def test_should_install_matcher_attribute_when_matcher_name_is_used(self):
+        assert_that("spam").contains("pa").and_ends_with("am")
+
+        self.assertTrue(isinstance(AssertionHandler.__dict__["contains"], MatcherAttribute))
+        self.assertTrue(isinstance(AssertionHandler.__dict__["and_ends_with"], MatcherAttribute))
+
+    def test_should_select_matcher_name_using_installed_attribute(self):
+        assert_that("spam").starts_with("sp")
+        handler = assert_that("spam")
+
+        self.assertTrue(handler.starts_with is handler)
+        self.assertEquals("starts_with", handler._matcher_name)
+
+    def test_should_not_allow_installed_and_matcher_as_first_matcher(self):
+        assert_that("spam").contains("pa").and_starts_with("sp")
+
+        self.assertRaises(InvalidUsageException, lambda: assert_that("spam").and_starts_with("sp"))
+
+
+class DescribeCountingMatcher(Matcher):
+    descriptions = 0
+
+    def describe(self, actual):
+        DescribeCountingMatcher.descriptions += 1
+        return "never matches"
+
+
+class CheckHandlerTest(unittest.TestCase):
+    def test_should_be_truthy_when_all_matchers_match(self):
+        result = check_that("spam").contains("pa").and_ends_with("am")
+
+        self.assertTrue(result)
+        self.assertEquals(None, result.message)
+
+    def test_should_be_falsy_when_matcher_does_not_match(self):
+        result = check_that("spam").contains("eggs")
+
+        self.assertFalse(result)
+        self.assertEquals("Assertion failed: Actual 'spam' does not contain 'eggs'", result.message)
+
+    def test_should_skip_links_after_failure(self):
+        result = check_that("spam").ends_with("eggs").and_contains("ham")
+
+        self.assertFalse(result)
+        self.assertEquals("Assertion failed: Actual 'spam' does not end with 'eggs'", result.message)
+
+    def test_should_be_falsy_when_no_matcher_accepts_actual_value(self):
+        result = check_that(7).contains("spam")
+
+        self.assertFalse(result)
+        self.assertTrue(result.message.startswith("No matcher named 'contains'"))
+
+    def test_should_not_describe_failure_unless_message_is_accessed(self):
+        with registry_scope() as registry:
+            registry.register_matcher("never_matches", DescribeCountingMatcher)
+            descriptions = DescribeCountingMatcher.descriptions
+
+            result = check_that("spam").never_matches()
+            self.assertEquals(descriptions, DescribeCountingMatcher.descriptions)
+
+            result.message
+            self.assertEquals(descriptions + 1, DescribeCountingMatcher.descriptions)
+
+    def test_should_not_allow_and_matcher_as_first_matcher(self):
+        self.assertRaises(InvalidUsageException, lambda: check_that("spam").and_contains("pa"))
+
+
+class MatcherAttributeTest(unittest.TestCase):
+    def test_should_strip_and_prefix(self):
+        attribute = MatcherAttribute("and_contains")
+
+        self.assertEquals("contains", attribute.matcher_name)
+        self.assertTrue(attribute.chained)
+
+    def test_should_keep_name_without_and_prefix(self):
+        attribute = MatcherAttribute("contains")
+
+        self.assertEquals("contains", attribute.matcher_name)
+        self.assertFalse(attribute.chained)
+
+
+class AssertionModeTest(unittest.TestCase):
+    def tearDown(self):
+        enable_assertions()
+
+    def test_should_return_shared_no_op_handler_when_assertions_are_disabled(self):
+        disable_assertions()
+
+        handler = assert_that("spam")
+
+        self.assertTrue(isinstance(handler, NoOpAssertionHandler))
+        self.assertTrue(handler is assert_that("eggs"))
+
+    def test_should_not_fail_when_assertions_are_disabled(self):
+        disable_assertions()
+
+        assert_that("spam").contains("eggs").and_is_a_matcher_that_does_not_exist(42)
+
+    def test_should_evaluate_assertions_again_when_enabled(self):
+        disable_assertions()
+        enable_assertions()
+
+        try:
+            assert_that("spam").contains("eggs")
+            self.fail("AssertionError expected")
+        except AssertionError:
+            pass
+
+    def test_should_evaluate_checks_when_assertions_are_disabled(self):
+        disable_assertions()
+
+        self.assertFalse(check_that("spam").contains("eggs"))
+
+    def test_should_evaluate_every_nth_assertion_when_sampling(self):
+        sample_assertions(3)
+
+        evaluated = [isinstance(assert_that("spam"), AssertionHandler) for _ in range(7)]
+
+        self.assertEquals([True, False, False, True, False, False, True], evaluated)
+
+    def test_should_count_samples_per_thread(self):
+        sample_assertions(1000)
+        assert_that("spam")
+        evaluated = []
+
+        thread = threading.Thread(target=lambda: evaluated.append(isinstance(assert_that("spam"), AssertionHandler)))
+        thread.start()
+        thread.join()
+
+        self.assertEquals([True], evaluated)
+
+    def test_should_reject_sampling_rate_less_than_one(self):
+        self.assertRaises(ValueError, sample_assertions, 0)
@@ -0,0 +1,190 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import array
+import mmap
+import unittest
+
+from pyassert import any_of, all, assert_that, check_that, expect, soft_assertions, SoftAssertionError
+from pyassert import binary_matchers
+from pyassert.binary_matchers import BinaryContainsMatcher, BinaryStartsWithMatcher, BinaryEndsWithMatcher, \
+    BinaryIsEmptyMatcher, hex_dump
+
+DATA = bytes(bytearray(range(256))) * 4
+
+
+def binary_values(data):
+    mapped = mmap.mmap(-1, len(data))
+    mapped.write(data)
+    return [data, bytearray(data), memoryview(data), mapped]
+
+
+class BinaryMatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.block_size = binary_matchers.BLOCK_SIZE
+        binary_matchers.BLOCK_SIZE = 7
+
+    def tearDown(self):
+        binary_matchers.BLOCK_SIZE = self.block_size
+
+
+class HexDumpTest(unittest.TestCase):
+    def test_should_render_offset_hex_and_ascii(self):
+        self.assertEquals(["00000000  73 70 61 6d 00 ff 0a                             |spam...|"],
+                          hex_dump(b"spam\x00\xff\n", 0, 100))
+
+    def test_should_align_start_to_line(self):
+        lines = hex_dump(DATA, 40, 70)
+
+        self.assertEquals(["00000020", "00000030", "00000040"], [line[:8] for line in lines])
+        self.assertTrue(lines[-1].endswith("|@ABCDE|"))
+
+    def test_should_dump_memoryview(self):
+        self.assertEquals(hex_dump(DATA, 0, 32), hex_dump(memoryview(DATA), 0, 32))
+
+
+class BinaryContainsMatcherTest(BinaryMatcherTestCase):
+    def test_should_find_bytes_in_all_binary_types(self):
+        for actual in binary_values(DATA):
+            self.assertTrue(BinaryContainsMatcher(b"\xfe\xff\x00\x01").matches(actual))
+            self.assertFalse(BinaryContainsMatcher(b"\x01\x00").matches(actual))
+
+    def test_should_find_bytes_spanning_blocks_of_memoryview(self):
+        view = memoryview(DATA)
+        for offset in range(len(DATA) - 5):
+            self.assertTrue(BinaryContainsMatcher(DATA[offset:offset + 5]).matches(view))
+
+    def test_should_find_byte_value(self):
+        self.assertTrue(BinaryContainsMatcher(65).matches(memoryview(DATA)))
+
+    def test_should_find_any_of_and_all_expected_bytes(self):
+        self.assertTrue(BinaryContainsMatcher(any_of(b"spam", b"ABC")).matches(memoryview(DATA)))
+        self.assertFalse(BinaryContainsMatcher(all(b"spam", b"ABC")).matches(memoryview(DATA)))
+
+    def test_should_search_non_byte_memoryview_as_bytes(self):
+        view = memoryview(array.array("B", [1, 2, 3, 4])).cast("B", [2, 2])
+
+        self.assertTrue(BinaryContainsMatcher(b"\x02\x03").matches(view))
+
+    def test_describe_should_dump_start_of_actual(self):
+        self.assertEquals("Actual bytes of 4 bytes does not contain b'ham':\n"
+                          "  00000000  73 70 61 6d                                      |spam|",
+                          BinaryContainsMatcher(b"ham").describe(b"spam"))
+
+    def test_describe_should_list_missing_bytes(self):
+        self.assertTrue(BinaryContainsMatcher(all(b"sp", b"ham", b"eggs")).describe(b"spam").startswith(
+            "Actual bytes of 4 bytes does not contain all expected bytes, missing b'ham', b'eggs':"))
+
+    def test_describe_negated_should_dump_around_occurrence(self):
+        description = BinaryContainsMatcher(b"@ABC").describe_negated(memoryview(DATA))
+
+        self.assertEquals("Actual memoryview of 1024 bytes contains b'@ABC' at offset 64:", description.split("\n")[0])
+        self.assertEquals(5, len(description.split("\n")))
+
+
+class BinaryStartsWithMatcherTest(BinaryMatcherTestCase):
+    def test_should_match_prefix_of_all_binary_types(self):
+        for actual in binary_values(DATA):
+            self.assertTrue(BinaryStartsWithMatcher(DATA[:100]).matches(actual))
+            self.assertFalse(BinaryStartsWithMatcher(DATA[:99] + b"x").matches(actual))
+            self.assertFalse(BinaryStartsWithMatcher(DATA + b"x").matches(actual))
+
+    def test_should_match_slice_of_memoryview(self):
+        self.assertTrue(BinaryStartsWithMatcher(DATA[10:30]).matches(memoryview(DATA)[10:]))
+
+    def test_describe_should_dump_actual_and_expected_around_difference(self):
+        description = BinaryStartsWithMatcher(b"\x00\x01\x02x").describe(memoryview(DATA))
+
+        self.assertEquals([
+            "Actual memoryview of 1024 bytes differs from the expected 4 bytes at offset 3:",
+            "actual",
+            "  00000000  00 01 02 03 04 05 06 07 08 09 0a 0b 0c 0d 0e 0f  |................|",
+            "  00000010  10 11 12 13 14 15 16 17 18 19 1a 1b 1c 1d 1e 1f  |................|",
+            "  00000020  20 21 22                                         | !\"|",
+            "expected",
+            "  00000000  00 01 02 78                                      |...x|"], description.split("\n"))
+
+    def test_describe_should_tell_that_actual_is_shorter(self):
+        self.assertEquals("Actual bytearray of 4 bytes is shorter than the expected 5 bytes:\n"
+                          "  00000000  73 70 61 6d                                      |spam|",
+                          BinaryStartsWithMatcher(b"spams").describe(bytearray(b"spam")))
+
+
+class BinaryEndsWithMatcherTest(BinaryMatcherTestCase):
+    def test_should_match_suffix_of_all_binary_types(self):
+        for actual in binary_values(DATA):
+            self.assertTrue(BinaryEndsWithMatcher(DATA[-100:]).matches(actual))
+            self.assertFalse(BinaryEndsWithMatcher(b"x" + DATA[-99:]).matches(actual))
+            self.assertFalse(BinaryEndsWithMatcher(b"x" + DATA).matches(actual))
+
+    def test_describe_should_tell_offset_in_actual(self):
+        description = BinaryEndsWithMatcher(b"\xfdx\xff").describe(memoryview(DATA))
+
+        self.assertEquals("Actual memoryview of 1024 bytes differs from the expected 3 bytes at offset 1022:",
+                          description.split("\n")[0])
+
+
+class BinaryIsEmptyMatcherTest(unittest.TestCase):
+    def test_should_match_empty_values(self):
+        for actual in (b"", bytearray(), memoryview(b"")):
+            self.assertTrue(BinaryIsEmptyMatcher().matches(actual))
+
+    def test_should_not_match_non_empty_values(self):
+        for actual in binary_values(b"spam"):
+            self.assertFalse(BinaryIsEmptyMatcher().matches(actual))
+
+    def test_describe_negated_should_tell_type(self):
+        self.assertEquals("Actual memoryview of 0 bytes is empty", BinaryIsEmptyMatcher().describe_negated(
+            memoryview(b"")))
+
+
+class BinaryMatchersAcceptanceTest(unittest.TestCase):
+    def test_should_dispatch_binary_values_to_binary_matchers(self):
+        view = memoryview(DATA)
+
+        assert_that(view).contains(b"@ABC").and_starts_with(b"\x00\x01").and_ends_with(b"\xff").and_is_not_empty()
+        assert_that(bytearray(DATA)).does_not_contain(b"spam").and_does_not_start_with(b"spam")
+
+    def test_should_reject_text_as_expected_value(self):
+        for text, assertion in (("a", lambda: assert_that(b"abc").starts_with("a")),
+                                ("c", lambda: assert_that(bytearray(b"abc")).does_not_end_with("c")),
+                                ("b", lambda: assert_that(memoryview(b"abc")).does_not_contain(any_of(b"x", "b"))),
+                                ("x", lambda: expect.does_not_start_with("x")(b"abc"))):
+            try:
+                assertion()
+                self.fail("AssertionError expected")
+            except AssertionError as error:
+                self.assertEquals("Assertion failed: Expected '%s' is text but binary data can only be compared to "
+                                  "bytes, encode the expected text first" % text, str(error))
+
+    def test_should_report_text_as_expected_value_as_failure(self):
+        self.assertEquals("Assertion failed: Expected 'id' is text but binary data can only be compared to bytes, "
+                          "encode the expected text first", check_that(b"xx").contains("id").message)
+
+    def test_should_collect_text_as_expected_value_in_soft_assertions(self):
+        try:
+            with soft_assertions():
+                assert_that(b"xx").contains("id")
+                assert_that(b"xx").does_not_contain("id")
+            self.fail("SoftAssertionError expected")
+        except SoftAssertionError as error:
+            self.assertEquals(2, len(error.failures))
+
+    def test_should_fail_with_hex_dump(self):
+        try:
+            assert_that(memoryview(b"spam")).starts_with(b"sham")
+            self.fail("AssertionError expected")
+        except AssertionError as error:
+            self.assertTrue("|spam|" in str(error))
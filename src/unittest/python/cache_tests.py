@@ -0,0 +1,48 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from pyassert.cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.computed = []
+        self.cache = LRUCache(2)
+
+    def compute(self, key):
+        self.computed.append(key)
+        return key.upper()
+
+    def test_should_compute_missing_value_once(self):
+        self.assertEquals("SPAM", self.cache.get("spam", self.compute))
+        self.assertEquals("SPAM", self.cache.get("spam", self.compute))
+
+        self.assertEquals(["spam"], self.computed)
+
+    def test_should_evict_least_recently_used_value(self):
+        self.cache.get("spam", self.compute)
+        self.cache.get("eggs", self.compute)
+        self.cache.get("spam", self.compute)
+        self.cache.get("ham", self.compute)
+        self.cache.get("spam", self.compute)
+        self.cache.get("eggs", self.compute)
+
+        self.assertEquals(["spam", "eggs", "ham", "eggs"], self.computed)
+        self.assertEquals(2, len(self.cache))
+
+    def test_should_reject_size_less_than_one(self):
+        self.assertRaises(ValueError, LRUCache, 0)
@@ -0,0 +1,162 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import random
+import time
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from pyassert.diff import DIFF_MAX_LINES, describe_difference, diff_opcodes
+
+
+def longest_common_subsequence_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for element in a:
+        current = [0]
+        for index, other in enumerate(b):
+            current.append(previous[index] + 1 if element == other else max(previous[index + 1], current[index]))
+        previous = current
+    return previous[-1]
+
+
+class DiffOpcodesTest(unittest.TestCase):
+    def test_should_return_single_equal_opcode_for_equal_sequences(self):
+        self.assertEquals(([("equal", 0, 4, 0, 4)], False), diff_opcodes("spam", "spam"))
+
+    def test_should_return_opcodes_like_difflib(self):
+        self.assertEquals(([("equal", 0, 2, 0, 2), ("replace", 2, 3, 2, 4), ("equal", 3, 4, 4, 5),
+                            ("delete", 4, 5, 5, 5)], False),
+                          diff_opcodes(["sp", "am", "and", "eggs", "!"], ["sp", "am", "or", "ham", "eggs"]))
+
+    def test_should_find_shortest_edit_script(self):
+        generator = random.Random(42)
+        for _ in range(500):
+            a = [generator.choice("abc") for _ in range(generator.randint(0, 12))]
+            b = [generator.choice("abc") for _ in range(generator.randint(0, 12))]
+            opcodes, _ = diff_opcodes(a, b)
+
+            a_position = b_position = equal = 0
+            for tag, a_start, a_end, b_start, b_end in opcodes:
+                self.assertEquals((a_position, b_position), (a_start, b_start))
+                if tag == "equal":
+                    self.assertEquals(a[a_start:a_end], b[b_start:b_end])
+                    equal += a_end - a_start
+                a_position, b_position = a_end, b_end
+            self.assertEquals((len(a), len(b)), (a_position, b_position))
+            self.assertEquals(longest_common_subsequence_length(a, b), equal)
+
+    def test_should_skip_common_prefix_and_suffix_of_long_texts_quickly(self):
+        a = "x" * 10000000
+        b = a[:5000000] + "y" + a[5000001:]
+
+        started = time.time()
+        self.assertEquals(([("equal", 0, 5000000, 0, 5000000), ("replace", 5000000, 5000001, 5000000, 5000001),
+                            ("equal", 5000001, 10000000, 5000001, 10000000)], False), diff_opcodes(a, b))
+        self.assertTrue(time.time() - started < 1)
+
+    @unittest.skipIf(tracemalloc is None, "requires tracemalloc")
+    def test_should_use_memory_bounded_by_budget_for_long_texts(self):
+        generator = random.Random(42)
+        a = "".join(generator.choice("ab") for _ in range(1000000))
+        b = "".join(generator.choice("ab") for _ in range(1000000))
+
+        tracemalloc.start()
+        try:
+            _, exhausted = diff_opcodes(a, b)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertTrue(exhausted)
+        self.assertTrue(peak < 1000000, "diff used %d bytes" % peak)
+
+    def test_should_report_remaining_middle_as_single_change_when_budget_is_exhausted(self):
+        a = list(range(0, 2000, 2))
+        b = list(range(1, 2000, 2))
+
+        self.assertEquals(([("replace", 0, 1000, 0, 1000)], True), diff_opcodes(a, b, max_cost=100))
+
+
+class DescribeDifferenceTest(unittest.TestCase):
+    def test_should_not_describe_short_single_line_texts(self):
+        self.assertEquals(None, describe_difference("spam", "eggs"))
+
+    def test_should_not_describe_values_of_different_types(self):
+        self.assertEquals(None, describe_difference("spam\neggs", ["spam", "eggs"]))
+
+    def test_should_not_describe_values_with_equal_elements(self):
+        self.assertEquals(None, describe_difference("a\nb", "a\nb"))
+        self.assertEquals(None, describe_difference("a" * 60, "a" * 60))
+        self.assertEquals(None, describe_difference([1] * 60, tuple([1] * 60)))
+
+    def test_should_describe_multi_line_texts_line_by_line(self):
+        expected = "\n".join("line %d" % number for number in range(1, 101))
+        actual = expected.replace("line 42\n", "line 42 changed\n")
+
+        self.assertEquals("First difference at line 42; diff (- expected, + actual):\n"
+                          "@@ expected line 42, actual line 42 @@\n"
+                          "  line 40\n"
+                          "  line 41\n"
+                          "- line 42\n"
+                          "+ line 42 changed\n"
+                          "  line 43\n"
+                          "  line 44", describe_difference(actual, expected))
+
+    def test_should_describe_long_single_line_texts_character_by_character(self):
+        expected = "spam and eggs " * 10
+        actual = expected[:70] + "spam and ham " + expected[84:]
+
+        self.assertEquals("First difference at index 79; diff (- expected, + actual):\n"
+                          "@@ expected index 79, actual index 79 @@\n"
+                          "- '...m and eggs spam and eggs spam and eggs spam ...'\n"
+                          "+ '...m and eggs spam and ham spam and eggs spam ...'",
+                          describe_difference(actual, expected))
+
+    def test_should_describe_long_lists_element_by_element(self):
+        expected = list(range(60))
+        actual = expected[:30] + expected[31:]
+
+        self.assertEquals("First difference at index 30; diff (- expected, + actual):\n"
+                          "@@ expected index 30, actual index 30 @@\n"
+                          "  '28'\n"
+                          "  '29'\n"
+                          "- '30'\n"
+                          "  '31'\n"
+                          "  '32'", describe_difference(actual, expected))
+
+    def test_should_bound_number_of_lines(self):
+        expected = list(range(1000))
+        actual = [number if number % 10 else -number for number in expected]
+
+        description = describe_difference(actual, expected)
+
+        self.assertTrue(len(description.split("\n")) <= DIFF_MAX_LINES + 1)
+        self.assertTrue(description.endswith("... and 94 more differences"), description)
+
+    def test_should_describe_huge_unrelated_sequences_in_bounded_time(self):
+        generator = random.Random(42)
+        expected = [generator.random() for _ in range(100000)]
+        actual = [generator.random() for _ in range(100000)]
+
+        started = time.time()
+        description = describe_difference(actual, expected)
+
+        self.assertTrue(time.time() - started < 2)
+        self.assertTrue(description.endswith("(diff budget exhausted, the remaining differences are reported as a "
+                                             "single change)"))
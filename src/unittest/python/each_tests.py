@@ -0,0 +1,141 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import itertools
+import pickle
+import time
+import unittest
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = ThreadPoolExecutor = None
+
+from pyassert import Matcher, registry_scope
+from pyassert.each import EachAssertionError, assert_each
+from pyassert.expectation import expect
+
+RECORD_ID = expect.matches(r"^[A-Z]{3}\d+$").and_does_not_start_with("ZZZ")
+
+
+class RecordingMatcher(Matcher):
+    """Fails for every value, describing the value recorded by the last call of matches."""
+
+    def matches(self, actual):
+        self._recorded = actual
+        time.sleep(0.001)
+        return False
+
+    def describe(self, actual):
+        return "recorded %s" % self._recorded
+
+
+def record_ids(count, invalid=()):
+    return ("SPAM%d" % index if index in invalid else "ABC%d" % (index * 9 + 1) for index in range(count))
+
+
+class AssertEachTest(unittest.TestCase):
+    def test_should_pass_when_all_elements_match(self):
+        assert_each(["ABC1", "XYZ2"], RECORD_ID)
+
+    def test_should_report_failing_elements_with_indices(self):
+        try:
+            assert_each(["ABC1", "abc", "XYZ2", "ZZZ1"], RECORD_ID)
+            self.fail("EachAssertionError expected")
+        except EachAssertionError as error:
+            self.assertEquals(2, error.count)
+            self.assertEquals(4, error.checked)
+            self.assertEquals("2 of 4 checked elements failed:\n"
+                              "  [1] Assertion failed: Actual 'abc' does not match '^[A-Z]{3}\\d+$'\n"
+                              "  [3] Assertion failed: NOT: Actual 'ZZZ1' does not start with 'ZZZ'", str(error))
+
+    def test_should_stop_after_first_failing_chunk(self):
+        elements = itertools.chain(["abc"], itertools.repeat("ABC1"))
+
+        try:
+            assert_each(elements, RECORD_ID, chunk_size=10)
+            self.fail("EachAssertionError expected")
+        except EachAssertionError as error:
+            self.assertEquals(10, error.checked)
+
+    def test_should_check_all_chunks_unless_failing_fast(self):
+        try:
+            assert_each(["abc"] * 25, RECORD_ID, chunk_size=10, fail_fast=False)
+            self.fail("EachAssertionError expected")
+        except EachAssertionError as error:
+            self.assertEquals(25, error.count)
+            self.assertEquals(25, error.checked)
+
+    def test_should_keep_max_failures_only(self):
+        try:
+            assert_each(["abc"] * 25, RECORD_ID, max_failures=3)
+            self.fail("EachAssertionError expected")
+        except EachAssertionError as error:
+            self.assertEquals([0, 1, 2], [index for index, _ in error.failures])
+            self.assertTrue(str(error).endswith("  ... and 22 more"))
+
+    def test_should_pickle_expectation_using_negated_matcher(self):
+        expectation = pickle.loads(pickle.dumps(RECORD_ID))
+
+        self.assertTrue(expectation.check("ABC1") is None)
+        self.assertFalse(expectation.check("ZZZ1") is None)
+
+
+@unittest.skipIf(ThreadPoolExecutor is None, "requires concurrent.futures")
+class AssertEachInParallelTest(unittest.TestCase):
+    def test_should_check_chunks_in_thread_pool(self):
+        with ThreadPoolExecutor(4) as executor:
+            assert_each(record_ids(10000), RECORD_ID, chunk_size=100, executor=executor)
+
+    def test_should_report_failures_of_thread_pool_ordered_by_index(self):
+        with ThreadPoolExecutor(4) as executor:
+            try:
+                assert_each(record_ids(10000, invalid=(5000, 1234)), RECORD_ID, chunk_size=100, executor=executor,
+                            fail_fast=False)
+                self.fail("EachAssertionError expected")
+            except EachAssertionError as error:
+                self.assertEquals([1234, 5000], [index for index, _ in error.failures])
+                self.assertEquals(10000, error.checked)
+
+    def test_should_check_chunks_in_thread_pool_using_stateful_matchers(self):
+        with registry_scope() as registry:
+            registry.register_matcher("is_recorded", RecordingMatcher)
+            expectation = expect.is_recorded()
+
+        with ThreadPoolExecutor(4) as executor:
+            try:
+                assert_each(range(200), expectation, chunk_size=10, executor=executor, fail_fast=False)
+                self.fail("EachAssertionError expected")
+            except EachAssertionError as error:
+                self.assertEquals(["Assertion failed: recorded %d" % index for index in range(100)],
+                                  [message for _, message in error.failures])
+
+    def test_should_cancel_remaining_chunks_after_failure(self):
+        with ThreadPoolExecutor(2) as executor:
+            try:
+                assert_each(record_ids(100000, invalid=(0,)), RECORD_ID, chunk_size=100, executor=executor,
+                            max_pending_chunks=4)
+                self.fail("EachAssertionError expected")
+            except EachAssertionError as error:
+                self.assertEquals(1, error.count)
+                self.assertTrue(error.checked < 100000)
+
+    def test_should_check_chunks_in_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            try:
+                assert_each(record_ids(1000, invalid=(999,)), RECORD_ID, chunk_size=100, executor=executor)
+                self.fail("EachAssertionError expected")
+            except EachAssertionError as error:
+                self.assertEquals([999], [index for index, _ in error.failures])
@@ -0,0 +1,107 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import unittest
+
+from pyassert import InvalidUsageException, Matcher, NoSuchMatcherException, registry_scope
+from pyassert.expectation import Expectation, expect
+
+
+class CountingMatcher(Matcher):
+    instances = 0
+
+    def __init__(self):
+        CountingMatcher.instances += 1
+
+    def matches(self, actual):
+        return actual == "spam"
+
+    def describe(self, actual):
+        return "'%s' is not spam" % actual
+
+
+class ExpectationTest(unittest.TestCase):
+    def test_should_match_value_satisfying_all_steps(self):
+        expect.contains("pa").and_ends_with("am")("spam")
+
+    def test_should_raise_assertion_error_when_step_fails(self):
+        plan = expect.contains("pa").and_ends_with("eggs")
+
+        try:
+            plan("spam")
+            self.fail("AssertionError expected")
+        except AssertionError as error:
+            self.assertEquals("Assertion failed: Actual 'spam' does not end with 'eggs'", str(error))
+
+    def test_should_return_failure_when_checking_value_not_satisfying_step(self):
+        plan = expect.contains("pa").and_ends_with("eggs")
+
+        self.assertTrue(plan.check("spam and eggs") is None)
+        self.assertEquals("Assertion failed: Actual 'spam' does not end with 'eggs'", plan.check("spam").message)
+
+    def test_should_describe_failure_of_stateful_matcher_after_plan_is_evaluated_again(self):
+        plan = expect.contains("FATAL")
+
+        failure = plan.check(io.StringIO("x" * 10))
+        plan.check(io.StringIO("x" * 3))
+
+        self.assertTrue(failure.message.endswith("does not contain 'FATAL' (10 characters read)"), failure.message)
+
+    def test_should_raise_assertion_error_when_no_matcher_accepts_value(self):
+        self.assertRaises(AssertionError, expect.is_less_than(7), "spam")
+
+    def test_should_select_matcher_by_type_of_actual_value(self):
+        plan = expect.contains("a")
+
+        plan("spam")
+        plan(["a", "b"])
+        self.assertRaises(AssertionError, plan, ["b"])
+
+    def test_should_evaluate_negated_matchers(self):
+        plan = expect.does_not_contain("eggs")
+
+        plan("spam")
+        self.assertRaises(AssertionError, plan, "eggs")
+
+    def test_should_not_change_expectation_when_adding_steps(self):
+        plan = expect.contains("pa")
+        plan.and_ends_with("eggs")
+
+        plan("spam")
+
+    def test_should_instantiate_matchers_once(self):
+        with registry_scope() as registry:
+            registry.register_matcher("is_spam", CountingMatcher)
+            plan = expect.is_spam()
+        instances = CountingMatcher.instances
+
+        for _ in range(10):
+            plan("spam")
+
+        self.assertEquals(instances, CountingMatcher.instances)
+
+    def test_should_not_allow_and_matcher_as_first_matcher(self):
+        self.assertRaises(InvalidUsageException, lambda: expect.and_contains("spam"))
+
+    def test_should_raise_exception_when_no_matcher_with_name_is_found(self):
+        self.assertRaises(NoSuchMatcherException, lambda: expect.matcher_not_found("spam"))
+
+    def test_should_not_resolve_special_attributes_as_matchers(self):
+        self.assertRaises(AttributeError, lambda: expect.__deepcopy__)
+
+    def test_expect_should_be_empty_expectation(self):
+        self.assertTrue(isinstance(expect, Expectation))
+        expect("anything")
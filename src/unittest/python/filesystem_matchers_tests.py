@@ -214,3 +214,90 @@ class FileContentMatcherTest(TempDirTestBase):
 
         self.assertEquals("Actual file 'spam' has content 'Keep It Simple, Stupid.' but expected 'Hello world.'.",
             matcher.describe("spam"))
+
+    def test_should_match_file_with_matching_bytes(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(b"\x00spam\xff")
+
+        self.assertTrue(FileContentMatcher(b"\x00spam\xff").matches(file_name))
+        self.assertFalse(FileContentMatcher(b"\x00spam\xfe").matches(file_name))
+
+    def test_should_match_text_using_given_encoding(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(u"Späm".encode("utf-16-le"))
+
+        self.assertTrue(FileContentMatcher(u"Späm", encoding="utf-16-le").matches(file_name))
+        self.assertFalse(FileContentMatcher(u"Späm", encoding="utf-8").matches(file_name))
+
+    def test_should_match_empty_file(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "w") as temp_file:
+            temp_file.write("")
+
+        self.assertTrue(FileContentMatcher("").matches(file_name))
+        self.assertFalse(FileContentMatcher("spam").matches(file_name))
+
+    def test_should_match_text_with_any_line_ends(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(b"spam\r\neggs\r\n")
+
+        self.assertTrue(FileContentMatcher("spam\neggs\n").matches(file_name))
+        self.assertFalse(FileContentMatcher(b"spam\neggs\n").matches(file_name))
+
+    def test_should_not_read_file_of_other_size(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(b"Hello world.")
+
+        matcher = FileContentMatcher(b"Hello world!!")
+        self.assertFalse(matcher.matches(file_name))
+        self.assertEquals(None, matcher._difference)
+
+    def test_should_describe_window_around_first_difference_of_large_file(self):
+        file_name = os.path.join(self.basedir, "spam")
+        content = b"spam and eggs\n" * 10000
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(content[:70000] + b"X" + content[70001:])
+
+        matcher = FileContentMatcher(content)
+        matcher.matches(file_name)
+
+        self.assertEquals("Actual file 'spam' of 140000 bytes differs from the expected 140000 bytes at offset 70000: "
+                          "has ...%r... but expected ...%r...." % (content[69960:70000] + b"X" + content[70001:70040],
+                                                                   content[69960:70040]), matcher.describe("spam"))
+
+    def test_should_describe_window_of_text_file_showing_line_ends(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "wb") as temp_file:
+            temp_file.write(b"spam and eggs\r\n" * 10 + b"spam\r" + b"spam and eggs\r\n" * 10)
+
+        expected = u"spam and eggs\n" * 20
+        actual = u"spam and eggs\n" * 10 + u"spam\n" + u"spam and eggs\n" * 10
+        matcher = FileContentMatcher(expected)
+        matcher.matches(file_name)
+
+        self.assertEquals("Actual file 'spam' differs from the expected 280 characters at offset 144: "
+                          "has ...%r... but expected ...%r...." % (actual[104:184], expected[104:184]),
+                          matcher.describe("spam"))
+
+    def test_should_describe_file_continuing_after_expected_content(self):
+        file_name = os.path.join(self.basedir, "spam")
+
+        with open(file_name, "w") as temp_file:
+            temp_file.write("x" * 100 + "spam")
+
+        matcher = FileContentMatcher("x" * 100)
+        matcher.matches(file_name)
+
+        self.assertEquals("Actual file 'spam' differs from the expected 100 characters at offset 100: "
+                          "has ...%r but expected ...%r." % ("x" * 40 + "spam", "x" * 40), matcher.describe("spam"))
@@ -0,0 +1,121 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import collections
+import unittest
+
+from pyassert import assert_that
+from pyassert.formatting import format_value, format_values, get_format_limits, set_format_limits
+
+
+class FormatValueTest(unittest.TestCase):
+    def test_should_format_small_values_like_string_formatting(self):
+        for value in ["spam", ["spam", 1], ("spam",), (1, 2), {"spam": [1, (2,)]}, set(), {1}, frozenset([1]), [], 7,
+                      None, 7.5]:
+            self.assertEquals("%s" % (value,), format_value(value))
+
+    def test_should_shorten_long_string(self):
+        text = format_value("x" * 100000)
+
+        self.assertTrue(len(text) < 2100)
+        self.assertTrue(text.endswith("..." + "x" * 1000 + " (str of 100000 characters)"))
+
+    def test_should_render_head_and_tail_of_long_list(self):
+        text = format_value(list(range(1000000)))
+
+        self.assertTrue(text.startswith("[0, 1, 2, "))
+        self.assertTrue(text.endswith(", ..., 999950, 999951, 999952, 999953, 999954, 999955, 999956, 999957, 999958, "
+                                      "999959, 999960, 999961, 999962, 999963, 999964, 999965, 999966, 999967, 999968, "
+                                      "999969, 999970, 999971, 999972, 999973, 999974, 999975, 999976, 999977, 999978, "
+                                      "999979, 999980, 999981, 999982, 999983, 999984, 999985, 999986, 999987, 999988, "
+                                      "999989, 999990, 999991, 999992, 999993, 999994, 999995, 999996, 999997, 999998, "
+                                      "999999] (list of 1000000 elements)"))
+
+    def test_should_render_first_elements_of_large_set(self):
+        text = format_value(set(range(1000)))
+
+        self.assertTrue(text.endswith(", ...} (set of 1000 elements)"))
+
+    def test_should_stop_rendering_when_length_is_exhausted(self):
+        text = format_value(["x" * 1500, "y" * 1500, "z" * 1500])
+
+        self.assertTrue(len(text) < 2100)
+        self.assertTrue(text.endswith(", ...] (list of 3 elements)"))
+
+    def test_should_cut_off_deeply_nested_values(self):
+        self.assertEquals("[[[[[[[...]]]]]]] (list of 1 elements)", format_value([[[[[[[[1]]]]]]]]))
+
+    def test_should_format_small_collection_subclasses_like_string_formatting(self):
+        for value in [collections.OrderedDict([("spam", 1)]), collections.Counter("spam"), collections.deque([1, 2]),
+                      collections.defaultdict(list), b"spam", bytearray(b"spam")]:
+            self.assertEquals("%s" % (value,), format_value(value))
+
+    def test_should_render_first_items_of_large_ordered_dict(self):
+        text = format_value(collections.OrderedDict((key, key) for key in range(1000000)))
+
+        self.assertTrue(text.startswith("OrderedDict({0: 0, 1: 1, "))
+        self.assertTrue(text.endswith(", 99: 99, ...}) (OrderedDict of 1000000 elements)"))
+
+    def test_should_render_first_elements_of_large_deque(self):
+        text = format_value(collections.deque(range(1000000)))
+
+        self.assertTrue(text.startswith("deque([0, 1, "))
+        self.assertTrue(text.endswith(", 99, ...]) (deque of 1000000 elements)"))
+
+    def test_should_render_head_and_tail_of_long_bytes(self):
+        text = format_value(b"x" * 1000000)
+
+        self.assertTrue(len(text) < 2100)
+        self.assertTrue(text.startswith("b'xxx"))
+        self.assertTrue(text.endswith("x' (bytes of 1000000 bytes)"))
+        self.assertTrue("x'...b'x" in text)
+
+    def test_should_render_head_and_tail_of_nested_bytearray(self):
+        text = format_value([bytearray(1000000)])
+
+        self.assertTrue(len(text) < 2100)
+        self.assertTrue(text.endswith(" (list of 1 elements)"))
+
+    def test_should_format_values_separated_by_commas(self):
+        self.assertEquals("spam, 7, ['eggs']", format_values(("spam", 7, ["eggs"])))
+
+
+class FormatLimitsTest(unittest.TestCase):
+    def setUp(self):
+        self.limits = get_format_limits()
+
+    def tearDown(self):
+        set_format_limits(**self.limits)
+
+    def test_should_use_configured_number_of_items(self):
+        set_format_limits(max_items=3)
+
+        self.assertEquals("[0, 1, ..., 9] (list of 10 elements)", format_value(list(range(10))))
+
+    def test_should_use_configured_length(self):
+        set_format_limits(max_length=10)
+
+        self.assertEquals("spams...seggs (str of 40 characters)", format_value("spam" * 5 + "eggs" * 5))
+
+    def test_should_reject_limit_less_than_one(self):
+        self.assertRaises(ValueError, set_format_limits, max_depth=0)
+
+    def test_should_bound_failure_message(self):
+        try:
+            assert_that(list(range(1000000))).contains(-1)
+            self.fail("AssertionError expected")
+        except AssertionError as error:
+            self.assertTrue(len(str(error)) < 2200)
+            self.assertTrue("(list of 1000000 elements)" in str(error))
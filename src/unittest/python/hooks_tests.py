@@ -0,0 +1,90 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import unittest
+
+from pyassert import Matcher, assert_that, check_that, registry_scope
+from pyassert import assertionhandler
+from pyassert.hooks import FAILED, PASSED, REJECTED, add_evaluation_hook, remove_evaluation_hook
+from pyassert.string_matchers import ContainsMatcher
+
+
+class RejectingMatcher(Matcher):
+    def accepts(self, actual):
+        return False
+
+
+class AcceptingMatcher(Matcher):
+    def matches(self, actual):
+        return True
+
+
+class EvaluationHookTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.hook = add_evaluation_hook(before=lambda *arguments: self.record(("before",) + arguments),
+                                        after=lambda *arguments: self.record(("after",) + arguments[:-1]))
+        self.thread = threading.current_thread()
+
+    def record(self, call):
+        # hooks are process wide; ignore evaluations of threads left over by other tests
+        if threading.current_thread() is self.thread:
+            self.calls.append(call)
+
+    def tearDown(self):
+        remove_evaluation_hook(self.hook)
+
+    def test_should_call_hooks_around_passing_matcher(self):
+        assert_that("spam").contains("pa")
+
+        self.assertEquals([("before", "contains", ContainsMatcher, str),
+                           ("after", "contains", ContainsMatcher, str, PASSED)], self.calls)
+
+    def test_should_report_failed_outcome(self):
+        check_that("spam").contains("eggs")
+
+        self.assertEquals(("after", "contains", ContainsMatcher, str, FAILED), self.calls[-1])
+
+    def test_should_report_rejecting_matcher_and_picked_matcher(self):
+        with registry_scope() as registry:
+            registry.register_matcher("is_spam", RejectingMatcher)
+            registry.register_matcher("is_spam", AcceptingMatcher)
+
+            assert_that("spam").is_spam()
+
+        self.assertEquals([("before", "is_spam", RejectingMatcher, str),
+                           ("after", "is_spam", RejectingMatcher, str, REJECTED),
+                           ("before", "is_spam", AcceptingMatcher, str),
+                           ("after", "is_spam", AcceptingMatcher, str, PASSED)], self.calls)
+
+    def test_should_pass_elapsed_seconds(self):
+        elapsed = []
+        hook = add_evaluation_hook(after=lambda *arguments: elapsed.append(arguments[-1]))
+        try:
+            assert_that("spam").contains("pa")
+        finally:
+            remove_evaluation_hook(hook)
+
+        self.assertEquals(1, len(elapsed))
+        self.assertTrue(elapsed[0] >= 0)
+
+    def test_should_not_call_removed_hook(self):
+        remove_evaluation_hook(self.hook)
+
+        assert_that("spam").contains("pa")
+
+        self.assertEquals([], self.calls)
+        self.assertEquals((), assertionhandler._OBSERVERS)
@@ -0,0 +1,162 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import itertools
+import unittest
+
+from pyassert import assert_that, expect
+from pyassert.iterator_matchers import ElementCountMatcher, IteratorContainsMatcher, IteratorIsEmptyMatcher, \
+    MaximumElementCountMatcher, MinimumElementCountMatcher
+from pyassert.list_matchers import all, any_of
+
+
+class IteratorContainsMatcherTest(unittest.TestCase):
+    def test_should_stop_reading_when_element_is_found(self):
+        actual = itertools.count()
+
+        self.assertTrue(IteratorContainsMatcher(5).matches(actual))
+        self.assertEquals(6, next(actual))
+
+    def test_should_not_match_when_element_is_missing(self):
+        self.assertFalse(IteratorContainsMatcher("eggs").matches(iter(["spam", "ham"])))
+
+    def test_should_stop_reading_when_any_element_is_found(self):
+        actual = itertools.count()
+
+        self.assertTrue(IteratorContainsMatcher(any_of(-1, 3, 7)).matches(actual))
+        self.assertEquals(4, next(actual))
+
+    def test_should_stop_reading_when_all_elements_are_found(self):
+        actual = itertools.count()
+
+        self.assertTrue(IteratorContainsMatcher(all(7, 3)).matches(actual))
+        self.assertEquals(8, next(actual))
+
+    def test_should_match_unhashable_elements(self):
+        self.assertTrue(IteratorContainsMatcher(all([1], {"spam": 2})).matches(iter([[0], [1], {"spam": 2}])))
+
+    def test_describe(self):
+        matcher = IteratorContainsMatcher("eggs")
+        matcher.matches(iter(["spam", "ham"]))
+
+        self.assertEquals("Actual iterator does not contain 'eggs' (2 elements read: ['spam', 'ham'])",
+                          matcher.describe(None))
+
+    def test_describe_should_list_missing_elements_and_bounded_sample(self):
+        matcher = IteratorContainsMatcher(all(3, -1, -2))
+        matcher.matches(iter(range(1000)))
+
+        self.assertEquals("Actual iterator does not contain all elements of '3, -1, -2', missing '-1, -2' "
+                          "(1000 elements read, starting with [0, 1, 2, 3, 4, 5, 6, 7, 8, 9])", matcher.describe(None))
+
+    def test_describe_should_only_show_elements_of_last_iterator(self):
+        matcher = IteratorContainsMatcher(99)
+        matcher.matches(iter(range(5)))
+        matcher.matches(iter(range(100, 103)))
+
+        self.assertEquals("Actual iterator does not contain '99' (3 elements read: [100, 101, 102])",
+                          matcher.describe(None))
+
+    def test_should_reset_read_elements_when_expectation_is_reused(self):
+        contains_99 = expect.contains(99)
+        contains_99(iter(range(90, 100)))
+
+        try:
+            contains_99(iter(range(100, 103)))
+            self.fail("AssertionError expected")
+        except AssertionError as error:
+            self.assertTrue("(3 elements read: [100, 101, 102])" in str(error))
+
+    def test_describe_negated(self):
+        matcher = IteratorContainsMatcher("spam")
+        matcher.matches(iter(["spam", "ham"]))
+
+        self.assertEquals("Actual iterator contains 'spam' (1 elements read: ['spam'])",
+                          matcher.describe_negated(None))
+
+
+class IteratorIsEmptyMatcherTest(unittest.TestCase):
+    def test_should_match_empty_iterator(self):
+        self.assertTrue(IteratorIsEmptyMatcher().matches(iter([])))
+
+    def test_should_read_single_element_of_non_empty_iterator(self):
+        actual = itertools.count()
+
+        self.assertFalse(IteratorIsEmptyMatcher().matches(actual))
+        self.assertEquals(1, next(actual))
+
+
+class ElementCountMatcherTest(unittest.TestCase):
+    def test_should_match_iterator_with_expected_number_of_elements(self):
+        self.assertTrue(ElementCountMatcher(3).matches(iter("abc")))
+
+    def test_should_read_one_element_more_than_expected(self):
+        actual = itertools.count()
+        matcher = ElementCountMatcher(3)
+
+        self.assertFalse(matcher.matches(actual))
+        self.assertEquals(4, next(actual))
+        self.assertEquals("Actual iterator has more than 3 elements (4 elements read: [0, 1, 2, 3])",
+                          matcher.describe(None))
+
+    def test_describe_fewer_elements(self):
+        matcher = ElementCountMatcher(3)
+        matcher.matches(iter("ab"))
+
+        self.assertEquals("Actual iterator has 2 elements but expected 3 (2 elements read: ['a', 'b'])",
+                          matcher.describe(None))
+
+    def test_should_count_elements_of_each_iterator_separately(self):
+        matcher = ElementCountMatcher(3)
+
+        self.assertFalse(matcher.matches(iter("ab")))
+        self.assertFalse(matcher.matches(iter("c")))
+        self.assertEquals("Actual iterator has 1 elements but expected 3 (1 elements read: ['c'])",
+                          matcher.describe(None))
+
+
+class MinimumAndMaximumElementCountMatcherTest(unittest.TestCase):
+    def test_should_stop_reading_when_minimum_is_reached(self):
+        actual = itertools.count()
+
+        self.assertTrue(MinimumElementCountMatcher(2).matches(actual))
+        self.assertEquals(2, next(actual))
+
+    def test_should_not_read_when_minimum_is_zero(self):
+        actual = itertools.count()
+
+        self.assertTrue(MinimumElementCountMatcher(0).matches(actual))
+        self.assertEquals(0, next(actual))
+
+    def test_should_not_match_more_than_maximum(self):
+        actual = itertools.count()
+
+        self.assertFalse(MaximumElementCountMatcher(2).matches(actual))
+        self.assertEquals(3, next(actual))
+
+    def test_should_match_up_to_maximum(self):
+        self.assertTrue(MaximumElementCountMatcher(2).matches(iter("ab")))
+
+
+class IteratorAssertionTest(unittest.TestCase):
+    def test_should_dispatch_generators_to_iterator_matchers(self):
+        assert_that(element for element in range(10)).contains(any_of(-1, 5)).and_has_element_count(4)
+        assert_that(iter([])).is_empty()
+        assert_that(iter([1])).is_not_empty()
+        assert_that(iter([1, 2])).does_not_contain(3)
+
+    def test_should_keep_dispatching_lists_to_list_matchers(self):
+        assert_that(["spam"]).contains("spam")
+        self.assertRaises(AssertionError, lambda: assert_that([]).has_element_count(0))
@@ -17,7 +17,10 @@ __author__ = "Alexander Metzner"
 
 import unittest
 
-from pyassert.list_matchers import IsEmptyMatcher, AnyOfContainsMatcher, AllContainsMatcher, ContainsMatcher
+from pyassert import assert_that
+from pyassert import list_matchers
+from pyassert.list_matchers import IsEmptyMatcher, AnyOfContainsMatcher, AllContainsMatcher, ContainsMatcher, \
+    ContainsExactlyInAnyOrderMatcher, membership_test, multiset_difference
 
 
 class AnyOfContainsMatcherTest(unittest.TestCase):
@@ -31,6 +34,12 @@ class AnyOfContainsMatcherTest(unittest.TestCase):
         self.assertEquals("Actual '['spam']' does not contain any of 'foo, bar'",
             AnyOfContainsMatcher(["foo", "bar"]).describe(["spam"]))
 
+    def test_should_match_large_list_using_index(self):
+        actual = list(range(100000))
+
+        self.assertTrue(AnyOfContainsMatcher([-1, -2, -3, 99999]).matches(actual))
+        self.assertFalse(AnyOfContainsMatcher([-1, -2, -3, -4]).matches(actual))
+
 
 class AllContainsMatcherTest(unittest.TestCase):
     def test_matches_should_return_true_when_element_matches_all_elements(self):
@@ -43,9 +52,54 @@ class AllContainsMatcherTest(unittest.TestCase):
         self.assertFalse(AllContainsMatcher(["spam", "eggs"]).matches(["spam"]))
 
     def test_describe(self):
-        self.assertEquals("Actual '['spam']' does not contain all elements of 'foo, bar'",
+        self.assertEquals("Actual '['spam']' does not contain all elements of 'foo, bar', missing 'foo, bar'",
             AllContainsMatcher(["foo", "bar"]).describe(["spam"]))
 
+    def test_describe_should_list_missing_elements_only(self):
+        self.assertEquals("Actual '['spam', 'eggs']' does not contain all elements of 'spam, foo, eggs', missing 'foo'",
+                          AllContainsMatcher(["spam", "foo", "eggs"]).describe(["spam", "eggs"]))
+
+    def test_should_match_large_list_using_index(self):
+        actual = list(range(100000))
+
+        self.assertTrue(AllContainsMatcher(list(range(0, 100000, 10))).matches(actual))
+        self.assertFalse(AllContainsMatcher(list(range(0, 100000, 10)) + [-1]).matches(actual))
+
+    def test_describe_should_list_missing_elements_of_large_list(self):
+        description = AllContainsMatcher([1, 2, 3, -1, -2]).describe(list(range(1000)))
+        self.assertTrue(description.endswith(", missing '-1, -2'"))
+
+    def test_describe_should_reuse_index_built_by_matches(self):
+        actual = list(range(1000))
+        matcher = AllContainsMatcher([1, 2, 3, -1, -2])
+        built = []
+        original_membership_test = list_matchers.membership_test
+
+        def counting_membership_test(*arguments):
+            built.append(arguments)
+            return original_membership_test(*arguments)
+
+        list_matchers.membership_test = counting_membership_test
+        try:
+            matcher.matches(actual)
+            description = matcher.describe(actual)
+        finally:
+            list_matchers.membership_test = original_membership_test
+
+        self.assertEquals(1, len(built))
+        self.assertTrue(description.endswith(", missing '-1, -2'"))
+
+    def test_should_match_large_list_with_unhashable_elements(self):
+        actual = [[element] for element in range(100)]
+
+        self.assertTrue(AllContainsMatcher([[1], [2], [3], [4]]).matches(actual))
+        self.assertFalse(AllContainsMatcher([[1], [2], [3], [-1]]).matches(actual))
+
+    def test_should_match_unhashable_expected_elements_against_index(self):
+        actual = list(range(100)) + [[1]]
+
+        self.assertTrue(AllContainsMatcher([1, 2, 3, [1]]).matches(actual))
+
 
 class IsEmptyMatcherTest(unittest.TestCase):
     def test_should_match_empty_list(self):
@@ -83,3 +137,78 @@ class ContainsMatcherTest(unittest.TestCase):
     def test_describe_negated(self):
         self.assertEquals("'['foo', 'bar']' contains 'foo'",
                           ContainsMatcher("foo").describe_negated(["foo", "bar"]))
+
+
+class ContainsExactlyInAnyOrderMatcherTest(unittest.TestCase):
+    def test_matches_should_return_true_when_elements_are_equal_in_different_order(self):
+        self.assertTrue(ContainsExactlyInAnyOrderMatcher(["eggs", "spam", "spam"]).matches(["spam", "eggs", "spam"]))
+
+    def test_matches_should_return_false_when_number_of_occurrences_differs(self):
+        self.assertFalse(ContainsExactlyInAnyOrderMatcher(["spam", "eggs", "eggs"]).matches(["spam", "spam", "eggs"]))
+
+    def test_matches_should_return_false_when_lengths_differ(self):
+        self.assertFalse(ContainsExactlyInAnyOrderMatcher(["spam"]).matches(["spam", "spam"]))
+
+    def test_should_accept_generator_as_expected_elements(self):
+        matcher = ContainsExactlyInAnyOrderMatcher(word for word in ("eggs", "spam"))
+
+        self.assertTrue(matcher.matches(["spam", "eggs"]))
+        self.assertTrue(matcher.matches(("eggs", "spam")))
+
+    def test_matches_should_compare_unhashable_elements(self):
+        self.assertTrue(ContainsExactlyInAnyOrderMatcher([{"id": 2}, 1, {"id": 1}]).matches(({"id": 1}, 1, {"id": 2})))
+        self.assertFalse(ContainsExactlyInAnyOrderMatcher([{"id": 1}, {"id": 1}]).matches([{"id": 1}, {"id": 2}]))
+
+    def test_describe(self):
+        self.assertEquals("Actual '['spam', 'spam', 'ham']' does not contain exactly '['spam', 'eggs', 'eggs']' in any "
+                          "order: missing 'eggs' (2 times); unexpected 'spam', 'ham'",
+                          ContainsExactlyInAnyOrderMatcher(["spam", "eggs", "eggs"]).describe(["spam", "spam", "ham"]))
+
+    def test_describe_should_bound_number_of_reported_elements(self):
+        description = ContainsExactlyInAnyOrderMatcher(list(range(1000))).describe(list(range(1000, 2000)))
+
+        self.assertTrue(description.endswith("'9', and 990 more; unexpected '1000', '1001', '1002', '1003', '1004', "
+                                             "'1005', '1006', '1007', '1008', '1009', and 990 more"), description)
+
+    def test_should_be_dispatched_for_lists_and_tuples(self):
+        assert_that((3, 1, 2)).contains_exactly_in_any_order([1, 2, 3])
+
+        try:
+            assert_that([1, 2, 2]).contains_exactly_in_any_order([1, 2, 3])
+        except AssertionError as error:
+            self.assertTrue("missing '3'; unexpected '2'" in str(error), str(error))
+        else:
+            self.fail("AssertionError expected")
+
+
+class MultisetDifferenceTest(unittest.TestCase):
+    def test_should_return_missing_and_unexpected_elements_with_counts(self):
+        self.assertEquals(([("eggs", 2)], [("spam", 1)]),
+                          multiset_difference(["spam", "spam", "ham"], ["spam", "eggs", "eggs", "ham"]))
+
+    def test_should_count_unhashable_elements(self):
+        self.assertEquals(([([1], 1)], [("spam", 1), ([2], 2)]),
+                          sorted_difference(multiset_difference([[2], "spam", [2], [3]], [[3], [1]])))
+
+
+def sorted_difference(difference):
+    missing, unexpected = difference
+    return missing, sorted(unexpected, key=repr)
+
+
+class MembershipTestTest(unittest.TestCase):
+    def test_should_scan_small_list(self):
+        actual = ["spam"]
+
+        self.assertEquals(actual.__contains__, membership_test(actual, 100))
+
+    def test_should_scan_large_list_for_few_expected_elements(self):
+        actual = list(range(1000))
+
+        self.assertEquals(actual.__contains__, membership_test(actual, 1))
+
+    def test_should_index_large_list_for_many_expected_elements(self):
+        contains = membership_test(list(range(1000)), 100)
+
+        self.assertTrue(contains(999))
+        self.assertFalse(contains(1000))
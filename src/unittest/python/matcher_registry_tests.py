@@ -14,10 +14,12 @@
 #  limitations under the License.
 
 import random
+import threading
 import unittest
 from mockito import mock, when, verify, any as any_value
 
-from pyassert import MatcherRegistry, Matcher, NegatedMatcherDecorator, register_matcher
+from pyassert import MatcherRegistry, Matcher, NegatedMatcherDecorator, NoSuchMatcherException, OptionalTypes, \
+    register_matcher, registry_scope, ScopedMatcherRegistry
 
 class MatcherTest(unittest.TestCase):
     def setUp(self):
@@ -40,20 +42,206 @@ class MatcherRegistryTest(unittest.TestCase):
 
     def test_should_register_and_resolve_single_matcher(self):
         self.registry.register_matcher("spam", AnyMatcher)
-        self.assertEquals([AnyMatcher], self.registry.resolve_matchers("spam"))
+        self.assertEquals((AnyMatcher,), self.registry.resolve_matchers("spam"))
 
     def test_should_register_two_matcher_and_resolve_single_matcher(self):
         self.registry.register_matcher("spam", AnyMatcher)
         self.registry.register_matcher("eggs", AnyOtherMatcher)
-        self.assertEquals([AnyMatcher], self.registry.resolve_matchers("spam"))
+        self.assertEquals((AnyMatcher,), self.registry.resolve_matchers("spam"))
 
     def test_should_register_two_matcher_on_the_same_name_and_resolve_two_matcher(self):
         self.registry.register_matcher("spam", AnyMatcher)
         self.registry.register_matcher("spam", AnyOtherMatcher)
-        self.assertEquals([AnyMatcher, AnyOtherMatcher],
+        self.assertEquals((AnyMatcher, AnyOtherMatcher),
             self.registry.resolve_matchers("spam"))
 
 
+class MatcherRegistryConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.registry = MatcherRegistry()
+
+    def run_threads(self, *targets):
+        threads = [threading.Thread(target=target) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_should_keep_all_matchers_registered_concurrently(self):
+        def register():
+            for _ in range(200):
+                self.registry.register_matcher("spam", AnyMatcher)
+
+        self.run_threads(*[register] * 4)
+
+        self.assertEquals(800, len(self.registry.resolve_matchers("spam")))
+
+    def test_should_resolve_complete_matchers_while_registering(self):
+        self.registry.register_matcher("spam", AnyMatcher)
+        errors = []
+
+        def register():
+            for _ in range(200):
+                self.registry.register_matcher("spam", AnyOtherMatcher)
+                self.registry.register_matcher("eggs", AnyMatcher)
+
+        def resolve():
+            for _ in range(2000):
+                matchers = self.registry.resolve_matchers("spam")
+                if matchers[0] is not AnyMatcher:
+                    errors.append(matchers)
+                self.registry.resolve_dispatch("spam", str)
+
+        self.run_threads(register, resolve, resolve)
+
+        self.assertEquals([], errors)
+        self.assertEquals(201, len(self.registry.resolve_dispatch("spam", str)))
+
+    def test_should_not_change_resolved_matchers_when_registering(self):
+        self.registry.register_matcher("spam", AnyMatcher)
+        matchers = self.registry.resolve_matchers("spam")
+
+        self.registry.register_matcher("spam", AnyOtherMatcher)
+
+        self.assertEquals((AnyMatcher,), matchers)
+
+
+class MatcherRegistryDispatchTest(unittest.TestCase):
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.registry = MatcherRegistry()
+
+    def test_should_skip_matcher_whose_declared_types_reject_actual_type(self):
+        self.registry.register_matcher("spam", StringOnlyMatcher)
+        self.registry.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((ListOnlyMatcher, False),), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_stop_at_first_matcher_whose_declared_types_accept_actual_type(self):
+        self.registry.register_matcher("spam", StringOnlyMatcher)
+        self.registry.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((StringOnlyMatcher, False),), self.registry.resolve_dispatch("spam", str))
+
+    def test_should_probe_matcher_without_declared_types(self):
+        self.registry.register_matcher("spam", AnyMatcher)
+        self.registry.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((AnyMatcher, True), (ListOnlyMatcher, False)), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_probe_matcher_overriding_accepts_of_declaring_base_class(self):
+        class ProbingMatcher(StringOnlyMatcher):
+            def accepts(self, actual):
+                return actual == "spam"
+
+        self.registry.register_matcher("spam", ProbingMatcher)
+        self.assertEquals(((ProbingMatcher, True),), self.registry.resolve_dispatch("spam", str))
+
+    def test_should_invalidate_dispatch_when_registering_matcher(self):
+        self.registry.register_matcher("spam", StringOnlyMatcher)
+        self.assertEquals((), self.registry.resolve_dispatch("spam", list))
+
+        self.registry.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((ListOnlyMatcher, False),), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_raise_exception_when_dispatching_unknown_matcher(self):
+        self.assertRaises(NoSuchMatcherException, self.registry.resolve_dispatch, "spam", str)
+
+    def test_should_not_dispatch_to_optional_types_of_module_not_imported(self):
+        class OptionalModuleMatcher(Matcher):
+            accepted_types = OptionalTypes("pyassert_module_that_does_not_exist", ("Spam",))
+
+        self.registry.register_matcher("spam", OptionalModuleMatcher)
+        self.assertEquals((), self.registry.resolve_dispatch("spam", str))
+
+    def test_should_dispatch_to_optional_types_of_imported_module(self):
+        class OptionalModuleMatcher(Matcher):
+            accepted_types = OptionalTypes("threading", ("Thread",))
+
+        self.registry.register_matcher("spam", OptionalModuleMatcher)
+        self.assertEquals(((OptionalModuleMatcher, False),), self.registry.resolve_dispatch("spam", threading.Thread))
+        self.assertTrue(OptionalModuleMatcher().accepts(threading.Thread()))
+
+
+class ScopedMatcherRegistryTest(unittest.TestCase):
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.parent = MatcherRegistry()
+        self.registry = ScopedMatcherRegistry(self.parent)
+
+    def test_should_resolve_matchers_of_parent(self):
+        self.parent.register_matcher("spam", AnyMatcher)
+        self.assertEquals((AnyMatcher,), self.registry.resolve_matchers("spam"))
+
+    def test_should_resolve_own_matchers_before_matchers_of_parent(self):
+        self.parent.register_matcher("spam", AnyMatcher)
+        self.registry.register_matcher("spam", AnyOtherMatcher)
+        self.assertEquals((AnyOtherMatcher, AnyMatcher), self.registry.resolve_matchers("spam"))
+
+    def test_should_not_register_matchers_with_parent(self):
+        self.registry.register_matcher("spam", AnyMatcher)
+        self.assertRaises(NoSuchMatcherException, self.parent.resolve_matchers, "spam")
+
+    def test_should_raise_exception_when_neither_registry_knows_matcher(self):
+        self.assertRaises(NoSuchMatcherException, self.registry.resolve_matchers, "spam")
+        self.assertRaises(NoSuchMatcherException, self.registry.resolve_dispatch, "spam", str)
+
+    def test_should_dispatch_through_parent(self):
+        self.parent.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((ListOnlyMatcher, False),), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_dispatch_to_own_matcher_accepting_type_by_declaration(self):
+        self.parent.register_matcher("spam", AnyMatcher)
+        self.registry.register_matcher("spam", ListOnlyMatcher)
+        self.assertEquals(((ListOnlyMatcher, False),), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_dispatch_to_parent_matchers_after_own_matchers(self):
+        self.parent.register_matcher("spam", ListOnlyMatcher)
+        self.registry.register_matcher("spam", StringOnlyMatcher)
+        self.assertEquals(((ListOnlyMatcher, False),), self.registry.resolve_dispatch("spam", list))
+
+    def test_should_dispatch_to_matchers_registered_with_parent_later(self):
+        self.registry.register_matcher("spam", AnyMatcher)
+        self.assertEquals(((AnyMatcher, True),), self.registry.resolve_dispatch("spam", list))
+
+        self.parent.register_matcher("spam", ListOnlyMatcher)
+
+        self.assertEquals(((AnyMatcher, True), (ListOnlyMatcher, False)), self.registry.resolve_dispatch("spam", list))
+
+
+class RegistryScopeTest(unittest.TestCase):
+    def test_should_activate_scoped_registry(self):
+        with registry_scope() as registry:
+            self.assertTrue(MatcherRegistry.current() is registry)
+
+        self.assertTrue(MatcherRegistry.current() is MatcherRegistry.instance())
+
+    def test_should_nest_scopes(self):
+        with registry_scope() as outer:
+            outer.register_matcher("spam", AnyMatcher)
+            with registry_scope() as inner:
+                self.assertEquals((AnyMatcher,), inner.resolve_matchers("spam"))
+            self.assertTrue(MatcherRegistry.current() is outer)
+
+    def test_should_register_matcher_with_scoped_registry_using_decorator(self):
+        with registry_scope() as registry:
+            @register_matcher("spam_in_scope", registry=registry)
+            class SpamMatcher(Matcher):
+                pass
+
+            self.assertEquals((SpamMatcher,), MatcherRegistry.current().resolve_matchers("spam_in_scope"))
+
+        self.assertRaises(NoSuchMatcherException, MatcherRegistry.current().resolve_matchers, "spam_in_scope")
+
+    def test_should_not_share_scope_with_other_threads(self):
+        registries = []
+
+        with registry_scope():
+            thread = threading.Thread(target=lambda: registries.append(MatcherRegistry.current()))
+            thread.start()
+            thread.join()
+
+        self.assertTrue(registries[0] is MatcherRegistry.instance())
+
+
 class NegatedMatcherDecoratorTest(unittest.TestCase):
     def test_should_delegate_accept_calls(self):
         actual_mock = mock()
@@ -92,6 +280,15 @@ class NegatedMatcherDecoratorTest(unittest.TestCase):
         verify(matcher_mock).describe_negated(actual_mock)
         verify(matcher_mock, 0).describe(actual_mock)
 
+    def test_should_delegate_to_matches_negated_when_overridden(self):
+        class FailingInBothContextsMatcher(Matcher):
+            def matches_negated(self, actual):
+                return False
+
+        matcher = NegatedMatcherDecorator(FailingInBothContextsMatcher())
+
+        self.assertFalse(matcher.matches("spam"))
+
 
 class MatcherRegistrationIntegrationTest(unittest.TestCase):
     def setUp(self):
@@ -101,7 +298,7 @@ class MatcherRegistrationIntegrationTest(unittest.TestCase):
         @register_matcher(self.name)
         class SomeMatcher(Matcher): pass
 
-        self.assertEquals([SomeMatcher], MatcherRegistry.instance().resolve_matchers(self.name))
+        self.assertEquals((SomeMatcher,), MatcherRegistry.instance().resolve_matchers(self.name))
 
     def test_should_register_negated_matcher(self):
         @register_matcher(self.name, negated=True)
@@ -111,10 +308,29 @@ class MatcherRegistrationIntegrationTest(unittest.TestCase):
 
         self.assertTrue(isinstance(matcher, NegatedMatcherDecorator))
 
+    def test_should_dispatch_negated_matcher_on_declared_types(self):
+        @register_matcher(self.name, negated=True)
+        class SomeMatcher(Matcher):
+            accepted_types = (str,)
+
+        dispatch = MatcherRegistry.instance().resolve_dispatch(self.name, int)
+
+        self.assertEquals((), dispatch)
+
 
 class AnyMatcher(Matcher):
     """any matcher"""
 
 
 class AnyOtherMatcher(Matcher):
-    """any other matcher"""
\ No newline at end of file
+    """any other matcher"""
+
+
+class StringOnlyMatcher(Matcher):
+    """matcher accepting strings"""
+    accepted_types = (str,)
+
+
+class ListOnlyMatcher(Matcher):
+    """matcher accepting lists"""
+    accepted_types = (list,)
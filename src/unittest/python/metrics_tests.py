@@ -0,0 +1,131 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import threading
+import unittest
+
+from pyassert import Matcher, assert_that, check_that, metrics, registry_scope
+from pyassert.metrics import HISTOGRAM_BOUNDS, LatencyHistogram, disable_metrics, enable_metrics, get_metrics, \
+    get_metrics_json, reset_metrics
+
+CONTAINS_MATCHER = "pyassert.string_matchers.ContainsMatcher"
+
+
+class RejectingMatcher(Matcher):
+    def accepts(self, actual):
+        return False
+
+
+class AcceptingMatcher(Matcher):
+    def matches(self, actual):
+        return True
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_should_count_timing_in_first_bucket_with_greater_bound(self):
+        histogram = LatencyHistogram()
+
+        histogram.record(3e-6)
+        histogram.record(1.0)
+
+        self.assertEquals(1, histogram.buckets[2])
+        self.assertEquals(1, histogram.buckets[len(HISTOGRAM_BOUNDS)])
+        self.assertEquals(2, histogram.count)
+
+    def test_should_merge_histograms(self):
+        histogram = LatencyHistogram()
+        other = LatencyHistogram()
+        histogram.record(3e-6)
+        other.record(3e-6)
+
+        histogram.merge(other)
+
+        self.assertEquals(2, histogram.buckets[2])
+        self.assertEquals(2, histogram.count)
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        reset_metrics()
+        enable_metrics()
+
+    def tearDown(self):
+        disable_metrics()
+        reset_metrics()
+
+    def test_should_count_passes_and_failures(self):
+        assert_that("spam").contains("pa")
+        check_that("spam").contains("eggs")
+
+        metrics = get_metrics()["matchers"]["contains"][CONTAINS_MATCHER]
+        self.assertEquals(2, metrics["calls"])
+        self.assertEquals(1, metrics["passes"])
+        self.assertEquals(1, metrics["failures"])
+        self.assertEquals(2, metrics["matches_seconds"]["count"])
+
+    def test_should_record_describe_time_when_message_is_built(self):
+        result = check_that("spam").contains("eggs")
+        self.assertEquals(0, get_metrics()["matchers"]["contains"][CONTAINS_MATCHER]["describe_seconds"]["count"])
+
+        result.message
+
+        self.assertEquals(1, get_metrics()["matchers"]["contains"][CONTAINS_MATCHER]["describe_seconds"]["count"])
+
+    def test_should_count_rejections(self):
+        with registry_scope() as registry:
+            registry.register_matcher("is_spam", RejectingMatcher)
+            registry.register_matcher("is_spam", AcceptingMatcher)
+
+            assert_that("spam").is_spam()
+
+        metrics = get_metrics()["matchers"]["is_spam"]
+        self.assertEquals(1, metrics[__name__ + ".RejectingMatcher"]["rejections"])
+        self.assertEquals(1, metrics[__name__ + ".AcceptingMatcher"]["passes"])
+
+    def test_should_key_negated_matcher_by_target_class(self):
+        assert_that("spam").does_not_contain("eggs")
+
+        self.assertEquals(1, get_metrics()["matchers"]["does_not_contain"][CONTAINS_MATCHER]["passes"])
+
+    def test_should_merge_metrics_of_all_threads(self):
+        threads = [threading.Thread(target=lambda: assert_that("spam").contains("pa")) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEquals(4, get_metrics()["matchers"]["contains"][CONTAINS_MATCHER]["passes"])
+
+    def test_should_merge_metrics_of_exited_threads_into_total(self):
+        for _ in range(20):
+            thread = threading.Thread(target=lambda: assert_that("spam").contains("pa"))
+            thread.start()
+            thread.join()
+
+        self.assertEquals(20, get_metrics()["matchers"]["contains"][CONTAINS_MATCHER]["passes"])
+        self.assertTrue(len(metrics._GENERATION.running) <= 1)
+
+    def test_should_not_record_when_disabled(self):
+        disable_metrics()
+
+        assert_that("spam").contains("pa")
+
+        self.assertEquals({}, get_metrics()["matchers"])
+
+    def test_should_export_snapshot_as_json(self):
+        assert_that("spam").contains("pa")
+
+        self.assertEquals(get_metrics(), json.loads(get_metrics_json()))
@@ -18,7 +18,7 @@ __author__ = "Alexander Metzner"
 import unittest
 
 from pyassert.number_matchers import BaseNumberMatcher, LessThanMatcher, LessThanEqualMatcher, GreaterThanMatcher,\
-    GreaterThanEqualMatcher
+    GreaterThanEqualMatcher, IsCloseToMatcher
 
 class BaseNumberMatcherTest(unittest.TestCase):
     def setUp(self):
@@ -100,3 +100,21 @@ class GreaterThanEqualMatcherTest(unittest.TestCase):
 
     def test_should_provide_description(self):
         self.assertEquals("Actual '6' is not greater than or equal to '7'", self.matcher.describe(6))
+
+
+class IsCloseToMatcherTest(unittest.TestCase):
+    def test_should_match_equal_numbers(self):
+        self.assertTrue(IsCloseToMatcher(7).matches(7))
+
+    def test_should_match_within_relative_tolerance(self):
+        self.assertTrue(IsCloseToMatcher(1.0, rel_tol=1e-3).matches(1.0001))
+
+    def test_should_not_match_outside_relative_tolerance(self):
+        self.assertFalse(IsCloseToMatcher(1.0).matches(1.0001))
+
+    def test_should_match_within_absolute_tolerance(self):
+        self.assertTrue(IsCloseToMatcher(0.0, abs_tol=1e-6).matches(1e-7))
+
+    def test_should_provide_description(self):
+        self.assertEquals("Actual '1.5' is not close to '1.0' (rel_tol=1e-09, abs_tol=0.0)",
+                          IsCloseToMatcher(1.0).describe(1.5))
@@ -16,7 +16,7 @@
 import unittest
 
 from pyassert.object_matchers import EqualsMatcher, IsTypeMatcher, IsTrueMatcher, IsFalseMatcher, NoneMatcher,\
-    InstanceOfMatcher, IsMatcher
+    InstanceOfMatcher, IsMatcher, DeeplyEqualsMatcher, deep_differences
 
 class IsMatcherTest(unittest.TestCase):
     def test_matches_should_return_true_when_objects_are_identical(self):
@@ -49,6 +49,98 @@ class EqualsMatcherTest(unittest.TestCase):
         expected = "Actual 'eggs' does not equal expected 'spam'"
         self.assertEquals(expected, matcher.describe("eggs"))
 
+    def test_describe_should_append_diff_of_multi_line_texts(self):
+        matcher = EqualsMatcher("spam\neggs")
+        expected = ("Actual 'spam\nham' does not equal expected 'spam\neggs'\n"
+                    "First difference at line 2; diff (- expected, + actual):\n"
+                    "@@ expected line 2, actual line 2 @@\n"
+                    "  spam\n"
+                    "- eggs\n"
+                    "+ ham")
+        self.assertEquals(expected, matcher.describe("spam\nham"))
+
+    def test_describe_negated_should_not_append_diff(self):
+        matcher = EqualsMatcher("spam\neggs")
+        expected = "NOT: Actual 'spam\neggs' does not equal expected 'spam\neggs'"
+        self.assertEquals(expected, matcher.describe_negated("spam\neggs"))
+
+    def test_describe_should_not_append_diff_of_list_and_tuple_with_equal_elements(self):
+        matcher = EqualsMatcher(tuple([1] * 60))
+        self.assertEquals("Actual '%s' does not equal expected '%s'" % ([1] * 60, tuple([1] * 60)),
+                          matcher.describe([1] * 60))
+
+
+class DeeplyEqualsMatcherTest(unittest.TestCase):
+    def test_matches_should_return_true_when_structures_are_equal(self):
+        matcher = DeeplyEqualsMatcher({"items": [{"price": 1}, (2, 3)]})
+        self.assertTrue(matcher.matches({"items": [{"price": 1}, (2, 3)]}))
+
+    def test_matches_should_return_false_when_nested_value_differs(self):
+        self.assertFalse(DeeplyEqualsMatcher({"items": [{"price": 1}]}).matches({"items": [{"price": 2}]}))
+
+    def test_matches_should_return_false_when_sequence_types_differ(self):
+        self.assertFalse(DeeplyEqualsMatcher([1, 2]).matches((1, 2)))
+
+    def test_matches_should_terminate_on_cycles(self):
+        actual = {"name": "spam"}
+        actual["self"] = actual
+        expected = {"name": "spam"}
+        expected["self"] = expected
+
+        self.assertTrue(DeeplyEqualsMatcher(expected).matches(actual))
+
+    def test_matches_should_not_exhaust_stack_on_deeply_nested_values(self):
+        actual, expected = [], []
+        actual_leaf, expected_leaf = actual, expected
+        for _ in range(10000):
+            actual_leaf.append([])
+            expected_leaf.append([])
+            actual_leaf, expected_leaf = actual_leaf[0], expected_leaf[0]
+
+        self.assertTrue(DeeplyEqualsMatcher(expected).matches(actual))
+
+    def test_describe_should_report_path_of_first_difference(self):
+        matcher = DeeplyEqualsMatcher({"data": {"items": [{"price": 1}, {"price": 2}]}})
+        actual = {"data": {"items": [{"price": 1}, {"price": 3}]}}
+
+        self.assertFalse(matcher.matches(actual))
+        self.assertEquals("Actual '%s' does not deeply equal expected '%s':\n"
+                          "  data.items[1].price: '3' differs from expected '2'" % (actual, matcher._expected),
+                          matcher.describe(actual))
+
+
+class DeepDifferencesTest(unittest.TestCase):
+    def test_should_return_no_differences_for_equal_values(self):
+        self.assertEquals([], deep_differences({"spam": [1, 2]}, {"spam": [1, 2]}))
+
+    def test_should_stop_at_first_difference(self):
+        self.assertEquals(["[0]: '1' differs from expected '2'"],
+                          [difference.describe() for difference in deep_differences([1, 1], [2, 2])])
+
+    def test_should_collect_differences_up_to_maximum(self):
+        differences = deep_differences({"spam": [1, 2, 3], "eggs": 1, 7: None},
+                                       {"spam": [1, 3], "ham": 1, 7: None}, max_differences=10)
+
+        self.assertEquals(["ham: missing key with expected value '1'",
+                           "eggs: unexpected key with value '1'",
+                           "spam: length 3 differs from expected length 2",
+                           "spam[1]: '2' differs from expected '3'"],
+                          [difference.describe() for difference in differences])
+
+    def test_should_render_keys_that_are_no_identifiers_as_subscripts(self):
+        self.assertEquals(["[7]['spam eggs']: '1' differs from expected '2'"],
+                          [difference.describe() for difference in deep_differences({7: {"spam eggs": 1}},
+                                                                                     {7: {"spam eggs": 2}})])
+
+    def test_should_report_root_difference(self):
+        self.assertEquals(["<root>: 'spam' differs from expected 'eggs'"],
+                          [difference.describe() for difference in deep_differences("spam", "eggs")])
+
+    def test_should_compare_shared_substructures_once(self):
+        shared = [[1] * 1000] * 1000
+
+        self.assertEquals([], deep_differences(shared, [[1] * 1000] * 1000))
+
 
 class IsTypeMatcherTest(unittest.TestCase):
     def test_matches_should_return_true_when_value_is_of_expected_class(self):
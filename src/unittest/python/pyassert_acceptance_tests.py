@@ -45,6 +45,22 @@ class FrameworkAcceptanceTest(unittest.TestCase):
 
         self.assertRaises(InvalidUsageException, callback)
 
+    def test_check_that_should_return_falsy_result_instead_of_raising(self):
+        self.assertTrue(check_that("spam and eggs").contains("and").and_ends_with("eggs"))
+        self.assertFalse(check_that("spam and eggs").contains("ham").and_ends_with("eggs"))
+
+    def test_should_use_matchers_registered_within_registry_scope(self):
+        class IsSpamMatcher(Matcher):
+            def matches(self, actual):
+                return actual == "spam"
+
+        with registry_scope() as registry:
+            registry.register_matcher("is_spam", IsSpamMatcher)
+            assert_that("spam").is_spam()
+            assert_that("spam").contains("pa").and_is_spam()
+
+        self.assertRaises(NoSuchMatcherException, lambda: assert_that("spam").is_spam())
+
 
 class MatcherAccepanceTest(unittest.TestCase):
     def test_equals(self):
@@ -0,0 +1,155 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pyassert
+from pyassert import MatcherRegistry, load_builtin_matchers
+from pyassert.matcher_registry import BUILTIN_MATCHER_MODULES
+
+IMPORT_TIME_BUDGET_MICROSECONDS = 20000
+IMPORT_TIME_RUNS = 5
+
+
+def run_python(*arguments, **environment_overrides):
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(pyassert.__file__)))
+    for name, value in environment_overrides.items():
+        if value is None:
+            environment.pop(name, None)
+        else:
+            environment[name] = value
+    process = subprocess.Popen((sys.executable,) + arguments, env=environment,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    stdout, stderr = process.communicate()
+    return stdout, stderr
+
+
+class ImportTest(unittest.TestCase):
+    def test_should_not_import_matcher_modules_when_importing_pyassert(self):
+        stdout, _ = run_python("-c", "import sys, pyassert; print(' '.join(sorted(sys.modules)))")
+        modules = stdout.split()
+
+        self.assertEquals(["pyassert", "pyassert.assertionhandler", "pyassert.matcher_registry"],
+                          [module for module in modules if module.startswith("pyassert")])
+        self.assertFalse("six" in modules)
+
+    def test_should_import_matcher_modules_when_matcher_is_used(self):
+        stdout, _ = run_python("-c", "import sys, pyassert; pyassert.assert_that(7).is_less_than(8); "
+                                     "print(' '.join(sorted(sys.modules)))")
+
+        self.assertTrue("pyassert.number_matchers" in stdout.split())
+        self.assertFalse("pyassert.string_matchers" in stdout.split())
+
+    def test_should_import_matcher_module_when_exported_name_is_used(self):
+        stdout, _ = run_python("-c", "import sys, pyassert; pyassert.any_of; print(' '.join(sorted(sys.modules)))")
+
+        self.assertTrue("pyassert.list_matchers" in stdout.split())
+
+    def test_should_not_import_matcher_modules_when_star_importing_pyassert(self):
+        stdout, _ = run_python("-c", "import sys; from pyassert import *; any_of; soft_assertions; "
+                                     "print(' '.join(sorted(sys.modules)))")
+        modules = stdout.split()
+
+        for module_name in ("object_matchers", "number_matchers", "stream_matchers", "iterator_matchers",
+                            "filesystem_matchers", "array_matchers", "diff"):
+            self.assertFalse("pyassert." + module_name in modules, module_name)
+
+    def test_should_call_soft_assertions_after_star_import(self):
+        stdout, stderr = run_python("-c", "from pyassert import *\n"
+                                          "from pyassert import SoftAssertionError\n"
+                                          "with soft_assertions(max_failures=100):\n"
+                                          "    assert_that('spam').ends_with('am')\n"
+                                          "print('passed')")
+
+        self.assertEquals("passed", stdout.strip(), stderr)
+
+    def test_should_export_base_classes_of_string_matchers(self):
+        from pyassert import StringMatcher, StringMatcherWithArgument
+        from pyassert.string_matchers import ContainsMatcher
+
+        self.assertTrue(issubclass(ContainsMatcher, StringMatcherWithArgument))
+        self.assertTrue(issubclass(StringMatcherWithArgument, StringMatcher))
+
+    def test_should_not_import_numpy_when_comparing_numbers(self):
+        stdout, _ = run_python("-c", "import sys, pyassert; "
+                                     "pyassert.assert_that(7).is_equal_to(7).and_is_less_than(8); "
+                                     "print(' '.join(sorted(sys.modules)))")
+
+        self.assertTrue("pyassert.array_matchers" in stdout.split())
+        self.assertFalse("numpy" in stdout.split())
+
+    @unittest.skipIf(sys.version_info < (3, 8), "-X importtime and PYTHONPYCACHEPREFIX require Python 3.8")
+    def test_should_import_pyassert_within_budget(self):
+        # measure imports from cached bytecode even if writing bytecode is disabled in the environment
+        cache_directory = tempfile.mkdtemp(prefix="pyassert_import_tests")
+        try:
+            cache_environment = {"PYTHONDONTWRITEBYTECODE": None, "PYTHONPYCACHEPREFIX": cache_directory}
+            run_python("-c", "import pyassert", **cache_environment)
+            cumulative_times = []
+            for _ in range(IMPORT_TIME_RUNS):
+                _, stderr = run_python("-X", "importtime", "-c", "import pyassert", **cache_environment)
+                for line in stderr.splitlines():
+                    fields = [field.strip() for field in line.split("|")]
+                    if fields[-1] == "pyassert":
+                        cumulative_times.append(int(fields[1]))
+        finally:
+            shutil.rmtree(cache_directory)
+
+        self.assertTrue(min(cumulative_times) < IMPORT_TIME_BUDGET_MICROSECONDS,
+                        "import pyassert took %dus, budget is %dus" % (min(cumulative_times),
+                                                                     IMPORT_TIME_BUDGET_MICROSECONDS))
+
+
+class BuiltinMatcherManifestTest(unittest.TestCase):
+    def test_should_list_every_matcher_registered_by_builtin_modules(self):
+        load_builtin_matchers()
+
+        for module_name, matcher_names in BUILTIN_MATCHER_MODULES:
+            module = sys.modules["pyassert." + module_name]
+            registered = set()
+            for matcher_name in matcher_names:
+                for matcher_factory in MatcherRegistry.instance().resolve_matchers(matcher_name):
+                    matcher_class = getattr(matcher_factory, "matcher_class", matcher_factory)
+                    if matcher_class.__module__ == module.__name__:
+                        registered.add(matcher_name)
+
+            self.assertEquals(set(matcher_names), registered)
+
+    def test_should_try_builtin_matchers_in_order_of_manifest_regardless_of_import_order(self):
+        stdout, _ = run_python("-c", "import pyassert.iterator_matchers, pyassert.list_matchers, pyassert; "
+                                     "factories = pyassert.MatcherRegistry.instance().resolve_matchers('contains'); "
+                                     "print(' '.join(getattr(factory, 'matcher_class', factory).__module__ "
+                                     "for factory in factories))")
+
+        self.assertEquals(["pyassert.string_matchers", "pyassert.binary_matchers", "pyassert.list_matchers",
+                           "pyassert.stream_matchers", "pyassert.iterator_matchers"], stdout.split())
+
+    def test_should_not_miss_any_matcher_registered_by_builtin_modules(self):
+        load_builtin_matchers()
+        manifest = dict(("pyassert." + module_name, matcher_names)
+                        for module_name, matcher_names in BUILTIN_MATCHER_MODULES)
+
+        for matcher_name, matcher_factories in MatcherRegistry.instance()._snapshot.matchers.items():
+            for matcher_factory in matcher_factories:
+                module_name = getattr(matcher_factory, "matcher_class", matcher_factory).__module__
+                if module_name in manifest:
+                    self.assertTrue(matcher_name in manifest[module_name],
+                                    "%s is missing in the manifest of %s" % (matcher_name, module_name))
@@ -0,0 +1,91 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from pyassert import assert_that, check_that
+from pyassert.soft import SoftAssertionError, soft_assertions
+
+
+class SoftAssertionsTest(unittest.TestCase):
+    def test_should_not_raise_when_all_assertions_pass(self):
+        with soft_assertions():
+            assert_that("spam").contains("pa").and_ends_with("am")
+
+    def test_should_raise_single_error_describing_all_failures(self):
+        try:
+            with soft_assertions():
+                assert_that("spam").contains("eggs")
+                assert_that(7).is_less_than(2)
+            self.fail("SoftAssertionError expected")
+        except SoftAssertionError as error:
+            self.assertEquals(2, error.count)
+            self.assertEquals("2 assertion(s) failed:\n"
+                              "  1) Assertion failed: Actual 'spam' does not contain 'eggs'\n"
+                              "  2) Assertion failed: Actual '7' is not less than '2'", str(error))
+
+    def test_should_continue_chain_after_failure(self):
+        try:
+            with soft_assertions():
+                assert_that("spam").contains("eggs").and_ends_with("ham")
+            self.fail("SoftAssertionError expected")
+        except SoftAssertionError as error:
+            self.assertEquals(2, error.count)
+
+    def test_should_collect_unaccepted_actual_values(self):
+        try:
+            with soft_assertions():
+                assert_that(7).contains("spam")
+            self.fail("SoftAssertionError expected")
+        except SoftAssertionError as error:
+            self.assertTrue("No matcher named 'contains'" in str(error))
+
+    def test_should_keep_at_most_max_failures(self):
+        try:
+            with soft_assertions(max_failures=2):
+                for _ in range(5):
+                    assert_that("spam").contains("eggs")
+            self.fail("SoftAssertionError expected")
+        except SoftAssertionError as error:
+            self.assertEquals(5, error.count)
+            self.assertEquals(2, len(error.failures))
+            self.assertTrue(str(error).endswith("  ... and 3 more"))
+
+    def test_should_be_an_assertion_error(self):
+        def callback():
+            with soft_assertions():
+                assert_that("spam").contains("eggs")
+
+        self.assertRaises(AssertionError, callback)
+
+    def test_should_raise_again_outside_of_block(self):
+        with soft_assertions():
+            pass
+
+        self.assertRaises(AssertionError, lambda: assert_that("spam").contains("eggs"))
+
+    def test_should_propagate_other_exceptions(self):
+        def callback():
+            with soft_assertions():
+                assert_that("spam").contains("eggs")
+                raise ValueError()
+
+        self.assertRaises(ValueError, callback)
+
+    def test_should_not_collect_failed_checks(self):
+        with soft_assertions() as collector:
+            self.assertFalse(check_that("spam").contains("eggs"))
+
+        self.assertEquals(0, collector.count)
@@ -0,0 +1,268 @@
+#  pyassert
+#  Copyright 2012 The pyassert team.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from pyassert import assert_that, expect
+from pyassert import stream_matchers
+from pyassert.list_matchers import all, any_of
+from pyassert.stream_matchers import StreamContainsMatcher, StreamMatchesMatcher, StreamStartsWithMatcher, \
+    StreamEndsWithMatcher, LineCountMatcher
+
+LOG = "INFO starting\nWARN disk almost full\nINFO started in 12ms\nERROR 42 connection lost\n"
+
+
+class StreamMatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="pyassert_stream_matchers_tests")
+        self.path = pathlib.Path(self.directory) / "server.log"
+        with open(str(self.path), "w") as log_file:
+            log_file.write(LOG)
+        self.chunk_size = stream_matchers.CHUNK_SIZE
+        stream_matchers.CHUNK_SIZE = 8
+
+    def tearDown(self):
+        stream_matchers.CHUNK_SIZE = self.chunk_size
+        shutil.rmtree(self.directory)
+
+
+class CrlfStreamMatcherTestCase(StreamMatcherTestCase):
+    def setUp(self):
+        StreamMatcherTestCase.setUp(self)
+        self.crlf_path = pathlib.Path(self.directory) / "crlf.log"
+        with open(str(self.crlf_path), "wb") as log_file:
+            log_file.write(b"alpha 1\r\nbeta 12\r\ngamma\r\n")
+
+
+class StreamContainsMatcherTest(CrlfStreamMatcherTestCase):
+    def test_should_find_string_in_path(self):
+        self.assertTrue(StreamContainsMatcher("started in").matches(self.path))
+
+    def test_should_find_string_spanning_chunks(self):
+        for offset in range(len(LOG) - 5):
+            self.assertTrue(StreamContainsMatcher(LOG[offset:offset + 5]).matches(io.StringIO(LOG)))
+
+    def test_should_find_bytes_in_binary_file(self):
+        with open(str(self.path), "rb") as log_file:
+            self.assertTrue(StreamContainsMatcher(b"connection lost").matches(log_file))
+
+    def test_should_not_find_missing_string(self):
+        self.assertFalse(StreamContainsMatcher("FATAL").matches(self.path))
+
+    def test_should_stop_reading_at_first_occurrence(self):
+        stream = io.StringIO(LOG)
+
+        self.assertTrue(StreamContainsMatcher("WARN").matches(stream))
+        self.assertEquals(24, stream.tell())
+
+    def test_describe(self):
+        matcher = StreamContainsMatcher("FATAL")
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' does not contain 'FATAL' (82 characters read)" % self.path,
+                          matcher.describe(self.path))
+
+    def test_describe_negated_should_tell_offset(self):
+        matcher = StreamContainsMatcher("ERROR")
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' contains 'ERROR' at offset 57" % self.path,
+                          matcher.describe_negated(self.path))
+
+    def test_should_reset_offset_when_matcher_is_reused(self):
+        matcher = StreamContainsMatcher("ERROR")
+        matcher.matches(io.StringIO("spam\n" * 10 + "ERROR"))
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' contains 'ERROR' at offset 57" % self.path,
+                          matcher.describe_negated(self.path))
+
+    def test_should_read_line_ends_of_path_as_newlines(self):
+        self.assertTrue(StreamContainsMatcher("beta 12\n").matches(self.crlf_path))
+
+    def test_should_find_any_of_strings_spanning_chunks(self):
+        for offset in range(len(LOG) - 5):
+            self.assertTrue(StreamContainsMatcher(any_of("FATAL", LOG[offset:offset + 5])).matches(io.StringIO(LOG)))
+        self.assertFalse(StreamContainsMatcher(any_of("FATAL", "DEBUG")).matches(self.path))
+
+    def test_should_find_all_of_strings(self):
+        self.assertTrue(StreamContainsMatcher(all("connection lost", "WARN", "12ms")).matches(self.path))
+        self.assertFalse(StreamContainsMatcher(all("connection lost", "FATAL")).matches(self.path))
+
+    def test_should_find_any_of_bytes_in_binary_file(self):
+        with open(str(self.path), "rb") as log_file:
+            self.assertTrue(StreamContainsMatcher(any_of(b"FATAL", b"ERROR")).matches(log_file))
+
+    def test_describe_any_of(self):
+        matcher = StreamContainsMatcher(any_of("beta", "zeta"))
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' does not contain any of 'beta, zeta' (82 characters read)" % self.path,
+                          matcher.describe(self.path))
+
+    def test_describe_all_should_list_missing_strings(self):
+        matcher = StreamContainsMatcher(all("WARN", "FATAL", "ERROR", "DEBUG"))
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' does not contain all of 'WARN, FATAL, ERROR, DEBUG', missing "
+                          "'FATAL, DEBUG' (82 characters read)" % self.path, matcher.describe(self.path))
+
+    def test_describe_negated_any_of_should_tell_string_found_and_offset(self):
+        matcher = StreamContainsMatcher(any_of("FATAL", "ERROR", "WARN"))
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' contains 'WARN' at offset 14" % self.path,
+                          matcher.describe_negated(self.path))
+
+    def test_should_be_dispatched_for_any_of_and_all(self):
+        assert_that(self.path).contains(any_of("beta", "started")).and_does_not_contain(any_of("beta", "zeta"))
+        assert_that(self.path).contains(all("INFO", "ERROR")).and_does_not_contain(all("INFO", "FATAL"))
+
+    def test_should_be_dispatched_for_file_objects_and_paths(self):
+        assert_that(self.path).contains("disk almost full").and_does_not_contain("FATAL")
+        assert_that(io.StringIO(LOG)).contains("disk almost full")
+
+
+class StreamMatchesMatcherTest(CrlfStreamMatcherTestCase):
+    def test_should_match_start_of_any_line(self):
+        self.assertTrue(StreamMatchesMatcher(r"ERROR \d+").matches(self.path))
+
+    def test_should_match_anchored_expression_at_start_of_any_line(self):
+        self.assertTrue(StreamMatchesMatcher(r"^ERROR \d+ connection lost$").matches(self.path))
+
+    def test_should_match_line_spanning_chunks(self):
+        self.assertTrue(StreamMatchesMatcher(r"INFO started in \d+ms").matches(io.StringIO(LOG)))
+
+    def test_should_match_last_line_without_newline(self):
+        self.assertTrue(StreamMatchesMatcher(b"eggs").matches(io.BytesIO(b"spam\neggs")))
+
+    def test_should_match_start_of_line_longer_than_maximum_line_length(self):
+        max_line_length = stream_matchers.MAX_LINE_LENGTH
+        stream_matchers.MAX_LINE_LENGTH = 16
+        try:
+            self.assertTrue(StreamMatchesMatcher(r"spam").matches(io.StringIO("spam" + "x" * 100)))
+            self.assertFalse(StreamMatchesMatcher(r"x*eggs").matches(io.StringIO("x" * 100 + "eggs")))
+            self.assertTrue(StreamMatchesMatcher(r"eggs").matches(io.StringIO("x" * 100 + "eggs\neggs")))
+
+            matcher = StreamMatchesMatcher(r"eggs")
+            self.assertFalse(matcher.matches(io.StringIO("eggs".join(["x" * 20] * 10) + "\nspam")))
+            self.assertEquals(2, matcher._line_count)
+        finally:
+            stream_matchers.MAX_LINE_LENGTH = max_line_length
+
+    def test_should_match_end_of_line_of_path_with_carriage_returns(self):
+        self.assertTrue(StreamMatchesMatcher(r"beta \d+$").matches(self.crlf_path))
+
+    def test_should_not_match_inside_of_line(self):
+        self.assertFalse(StreamMatchesMatcher(r"\d+ms").matches(self.path))
+
+    def test_describe_should_tell_number_of_lines_read(self):
+        matcher = StreamMatchesMatcher(r"FATAL")
+        matcher.matches(self.path)
+
+        self.assertEquals("No line of actual file '%s' matches 'FATAL' (4 lines read)" % self.path,
+                          matcher.describe(self.path))
+
+    def test_should_reset_line_count_when_matcher_is_reused(self):
+        matcher = StreamMatchesMatcher(r"WARN")
+        matcher.matches(io.StringIO("spam\n" * 3))
+        matcher.matches(self.path)
+
+        self.assertEquals("Line 2 of actual file '%s' matches 'WARN': 'WARN disk almost full\n'" % self.path,
+                          matcher.describe_negated(self.path))
+
+    def test_describe_negated_should_tell_matching_line(self):
+        matcher = StreamMatchesMatcher(r"WARN")
+        matcher.matches(self.path)
+
+        self.assertEquals("Line 2 of actual file '%s' matches 'WARN': 'WARN disk almost full\n'" % self.path,
+                          matcher.describe_negated(self.path))
+
+
+class StreamStartsWithMatcherTest(StreamMatcherTestCase):
+    def test_should_match_start(self):
+        self.assertTrue(StreamStartsWithMatcher("INFO start").matches(self.path))
+        self.assertFalse(StreamStartsWithMatcher("WARN").matches(self.path))
+
+    def test_should_read_length_of_expected_string_only(self):
+        stream = io.StringIO(LOG)
+
+        StreamStartsWithMatcher("INFO").matches(stream)
+
+        self.assertEquals(4, stream.tell())
+
+
+class StreamEndsWithMatcherTest(CrlfStreamMatcherTestCase):
+    def test_should_match_end_of_path(self):
+        self.assertTrue(StreamEndsWithMatcher("connection lost\n").matches(self.path))
+        self.assertFalse(StreamEndsWithMatcher("connection lost").matches(self.path))
+
+    def test_should_match_end_of_path_with_carriage_returns(self):
+        self.assertTrue(StreamEndsWithMatcher("gamma\n").matches(self.crlf_path))
+        self.assertTrue(StreamEndsWithMatcher("beta 12\ngamma\n").matches(self.crlf_path))
+        self.assertFalse(StreamEndsWithMatcher("gamma\r\n").matches(self.crlf_path))
+
+    def test_should_match_end_of_text_file_object(self):
+        self.assertTrue(StreamEndsWithMatcher("connection lost\n").matches(io.StringIO(LOG)))
+
+    def test_should_read_tail_of_binary_file_only(self):
+        matcher = StreamEndsWithMatcher(b"lost\n")
+
+        self.assertTrue(matcher.matches(io.BytesIO(LOG.encode("ascii"))))
+        self.assertEquals(5, matcher._read_count)
+
+    def test_should_match_file_shorter_than_expected_string(self):
+        content = LOG.encode("ascii")
+
+        self.assertFalse(StreamEndsWithMatcher(b"spam" + content).matches(io.BytesIO(content)))
+
+    def test_describe(self):
+        matcher = StreamEndsWithMatcher("spam")
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' ends with 'ost\n' instead of 'spam'" % self.path,
+                          matcher.describe(self.path))
+
+
+class LineCountMatcherTest(StreamMatcherTestCase):
+    def test_should_count_lines(self):
+        self.assertTrue(LineCountMatcher(4).matches(self.path))
+        self.assertFalse(LineCountMatcher(5).matches(self.path))
+
+    def test_should_count_last_line_without_newline(self):
+        self.assertTrue(LineCountMatcher(2).matches(io.StringIO("spam\neggs")))
+
+    def test_should_stop_counting_when_more_lines_than_expected(self):
+        matcher = LineCountMatcher(1)
+
+        self.assertFalse(matcher.matches(io.StringIO(LOG)))
+        self.assertEquals("Actual file '%s' has more than 1 lines" % self.path, matcher.describe(self.path))
+        self.assertTrue(matcher._read_count < len(LOG))
+
+    def test_should_count_lines_again_when_expectation_is_reused(self):
+        has_four_lines = expect.has_line_count(4)
+
+        has_four_lines(self.path)
+        has_four_lines(self.path)
+
+    def test_describe(self):
+        matcher = LineCountMatcher(5)
+        matcher.matches(self.path)
+
+        self.assertEquals("Actual file '%s' has 4 lines but expected 5" % self.path, matcher.describe(self.path))
@@ -17,7 +17,13 @@ import unittest
 
 __author__ = 'Alexander Metzner'
 
-from pyassert.string_matchers import StringMatcher, ContainsMatcher, MatchesMatcher, StartsWithMatcher, EndsWithMatcher
+from pyassert.list_matchers import all, any_of
+import re
+
+from pyassert import assert_that
+from pyassert.string_matchers import StringMatcher, ContainsMatcher, MatchesMatcher, StartsWithMatcher, \
+    EndsWithMatcher, ContainsMatchMatcher, FullyMatchesMatcher, MatchCountMatcher, clear_pattern_cache, \
+    compile_pattern, get_pattern_cache_stats
 
 class StringMatcherTests(unittest.TestCase):
     def test_should_accept_string(self):
@@ -46,9 +52,46 @@ class ContainsMatcherTests(unittest.TestCase):
     def test_should_match_empty_string(self):
         self.assertTrue(ContainsMatcher('').matches('spam'))
 
+    def test_should_match_any_of_few_strings(self):
+        self.assertTrue(ContainsMatcher(any_of('eggs', 'pa')).matches('spam'))
+        self.assertFalse(ContainsMatcher(any_of('eggs', 'ham')).matches('spam'))
+
+    def test_should_match_any_of_many_strings(self):
+        self.assertTrue(ContainsMatcher(any_of('eggs', 'ham', 'bacon', 'pa')).matches('spam'))
+        self.assertFalse(ContainsMatcher(any_of('eggs', 'ham', 'bacon', 'beans')).matches('spam'))
+
+    def test_should_match_all_of_many_strings(self):
+        self.assertTrue(ContainsMatcher(all('s', 'sp', 'pa', 'am')).matches('spam'))
+        self.assertFalse(ContainsMatcher(all('s', 'sp', 'pa', 'ham')).matches('spam'))
+
+    def test_should_match_all_of_strings_starting_at_same_offset(self):
+        self.assertTrue(ContainsMatcher(all('spam', 'sp', 's')).matches('spam'))
+        self.assertFalse(ContainsMatcher(all('spam', 'sp', 'x')).matches('spam'))
+
+    def test_should_match_strings_containing_pattern_characters_literally(self):
+        self.assertTrue(ContainsMatcher(any_of('a.c', '(b')).matches('x(by'))
+        self.assertFalse(ContainsMatcher(any_of('a.c', '(b')).matches('abc'))
+
     def test_describe(self):
         self.assertEquals("Actual 'spam' does not contain 'eggs'", ContainsMatcher("eggs").describe("spam"))
 
+    def test_describe_any_of(self):
+        self.assertEquals("Actual 'spam' does not contain any of 'eggs, ham'",
+                          ContainsMatcher(any_of("eggs", "ham")).describe("spam"))
+
+    def test_describe_all_should_list_missing_strings(self):
+        self.assertEquals("Actual 'spam' does not contain all of 's, eggs, pa, ham', missing 'eggs, ham'",
+                          ContainsMatcher(all("s", "eggs", "pa", "ham")).describe("spam"))
+
+    def test_describe_negated_should_list_every_occurrence_with_offset(self):
+        self.assertEquals("Actual 'spam and ham' contains 'am' at 2, 'ham' at 9, 'am' at 10",
+                          ContainsMatcher(any_of("eggs", "ham", "am", "bacon")).describe_negated("spam and ham"))
+
+    def test_describe_negated_should_bound_number_of_occurrences(self):
+        self.assertEquals("Actual '%s' contains %s, and 90 more" % ("spam" * 100, ", ".join(
+            "'spam' at %d" % offset for offset in range(0, 40, 4))),
+            ContainsMatcher(any_of("spam")).describe_negated("spam" * 100))
+
 
 class StartsWithMatcherTests(unittest.TestCase):
     def test_should_match_full_string(self):
@@ -120,3 +163,91 @@ class MatchesMatcherTests(unittest.TestCase):
 
     def test_describe(self):
         self.assertEquals("Actual 'spam' does not match 'eggs'", MatchesMatcher("eggs").describe("spam"))
+
+
+class CompilePatternTests(unittest.TestCase):
+    def setUp(self):
+        clear_pattern_cache()
+
+    def test_should_compile_pattern_once(self):
+        self.assertTrue(compile_pattern(r'sp\w+') is compile_pattern(r'sp\w+'))
+
+        self.assertEquals({"hits": 1, "misses": 1, "size": 1, "max_size": 256}, get_pattern_cache_stats())
+
+    def test_should_compile_pattern_for_other_flags_separately(self):
+        self.assertFalse(compile_pattern('spam') is compile_pattern('spam', re.IGNORECASE))
+
+    def test_should_compile_string_and_bytes_patterns_separately(self):
+        self.assertEquals(b'spam', compile_pattern(b'spam').pattern)
+        self.assertEquals('spam', compile_pattern('spam').pattern)
+
+    def test_should_return_compiled_pattern_unchanged(self):
+        pattern = re.compile('spam')
+
+        self.assertTrue(pattern is compile_pattern(pattern))
+
+    def test_should_use_cache_when_asserting(self):
+        for line in ['spam 1', 'spam 2', 'spam 3']:
+            assert_that(line).matches(r'spam \d')
+
+        self.assertEquals(2, get_pattern_cache_stats()["hits"])
+
+
+class RegexMatcherTests(unittest.TestCase):
+    def test_should_accept_bytes_and_memoryview(self):
+        self.assertTrue(MatchesMatcher(b'spam').accepts(b'spam'))
+        self.assertTrue(MatchesMatcher(b'spam').accepts(bytearray(b'spam')))
+        self.assertTrue(MatchesMatcher(b'spam').accepts(memoryview(b'spam')))
+
+    def test_should_match_memoryview_slice(self):
+        data = memoryview(b'spam and eggs')
+
+        self.assertTrue(FullyMatchesMatcher(b'and').matches(data[5:8]))
+
+    def test_should_describe_memoryview(self):
+        self.assertEquals("Actual '%s' does not match '%s'" % (b'spam', b'eggs'),
+                          MatchesMatcher(b'eggs').describe(memoryview(b'spam')))
+
+
+class ContainsMatchMatcherTests(unittest.TestCase):
+    def test_should_match_anywhere(self):
+        self.assertTrue(ContainsMatchMatcher(r'a\w+').matches('spam and eggs'))
+
+    def test_should_not_match_when_pattern_does_not_occur(self):
+        self.assertFalse(ContainsMatchMatcher(r'\d').matches('spam and eggs'))
+
+    def test_describe(self):
+        self.assertEquals("Actual 'spam' does not contain a match of '\\d'",
+                          ContainsMatchMatcher(r'\d').describe('spam'))
+
+    def test_describe_negated(self):
+        self.assertEquals("Actual 'spam and eggs' contains a match of 'a\\w+' at 2: 'am'",
+                          ContainsMatchMatcher(r'a\w+').describe_negated('spam and eggs'))
+
+
+class FullyMatchesMatcherTests(unittest.TestCase):
+    def test_should_match_whole_string(self):
+        self.assertTrue(FullyMatchesMatcher(r's\w+').matches('spam'))
+
+    def test_should_not_match_prefix(self):
+        self.assertFalse(FullyMatchesMatcher(r'sp').matches('spam'))
+
+    def test_describe(self):
+        self.assertEquals("Actual 'spam' does not fully match 'sp'", FullyMatchesMatcher('sp').describe('spam'))
+
+
+class MatchCountMatcherTests(unittest.TestCase):
+    def test_should_match_expected_number_of_matches(self):
+        self.assertTrue(MatchCountMatcher(r'a', 2).matches('spam and eggs'))
+
+    def test_should_not_match_other_number_of_matches(self):
+        self.assertFalse(MatchCountMatcher(r'a', 1).matches('spam and eggs'))
+        self.assertFalse(MatchCountMatcher(r'a', 3).matches('spam and eggs'))
+
+    def test_describe_should_tell_number_of_matches_found(self):
+        self.assertEquals("Actual 'spam and eggs' has 2 matches of 'a' but expected 3",
+                          MatchCountMatcher('a', 3).describe('spam and eggs'))
+
+    def test_describe_should_not_count_beyond_one_more_than_expected(self):
+        self.assertEquals("Actual 'spam and eggs' has more than 1 matches of 'a' but expected 1",
+                          MatchCountMatcher('a', 1).describe('spam and eggs'))